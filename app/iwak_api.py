@@ -0,0 +1,217 @@
+# --- API Harga Iwak (HTTP Lokal) ---
+# Server kecil (stdlib aja, tanpa Streamlit) buat bot Discord / spreadsheet.
+# Baca katalog yang sama (iwak_data.json lewat iwak_storage), rumusnya sama
+# kayak tab "Hitung Iwak" dan "Target Harga".
+#
+#   POST /price         {"catches": [{"fish": "Narwhal", "mutation": "Astral",
+#                          "shiny": true, "sparkling": false, "weight": 2.5}, ...]}
+#   POST /ideal-weight  {"queries": [{"fish": "Narwhal", "mutation": null,
+#                          "shiny": false, "sparkling": false, "target_price": 1000000}, ...]}
+#   GET  /health
+#
+# Request yang datang barengan dikumpulin dulu sebentar (BATCH_WINDOW_SECONDS)
+# terus dihitung sekali jalan pakai mesin harga vectorized.
+#
+# Jalankan: python iwak_api.py --port 8502 [--data path/ke/iwak_data.json]
+import argparse
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from iwak_bulk import normalize_row, parse_number, price_catch_rows, resolve_multipliers
+from iwak_pricing import ideal_weight_with_multiplier
+from iwak_storage import load_shared_catalog, load_shared_lattice
+
+DEFAULT_DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "iwak_data.json")
+BATCH_WINDOW_SECONDS = 0.002
+MAX_BATCH_ROWS = 100_000
+MAX_BODY_BYTES = 32 * 1024 * 1024
+
+
+# --- Penggabung Request (Batcher) ---
+# Tiap thread request manggil submit(rows) dan nunggu hasilnya. Satu thread
+# worker ngumpulin semua rows yang masuk dalam satu jendela waktu, manggil
+# evaluate(semua_rows) SEKALI, terus bagi hasilnya balik ke masing-masing.
+# Input jelek sudah jadi catatan per baris waktu parsing (_catch_rows), jadi
+# evaluate harusnya nggak pernah gagal; kalau tetap gagal, tiap request
+# dihitung sendiri-sendiri biar error satu client nggak nular ke yang lain.
+class Batcher:
+    def __init__(self, evaluate, window=BATCH_WINDOW_SECONDS, max_rows=MAX_BATCH_ROWS):
+        self.evaluate = evaluate
+        self.window = window
+        self.max_rows = max_rows
+        self._pending = []
+        self._pending_rows = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, rows):
+        future = Future()
+        with self._lock:
+            self._pending.append((rows, future))
+            self._pending_rows += len(rows)
+        self._wakeup.set()
+        return future.result()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            # Tunggu sebentar biar request lain sempat ikut (kecuali sudah penuh)
+            if self._pending_rows < self.max_rows:
+                time.sleep(self.window)
+            with self._lock:
+                batch, self._pending, self._pending_rows = self._pending, [], 0
+                self._wakeup.clear()
+            if not batch:
+                continue
+
+            all_rows = [row for rows, _ in batch for row in rows]
+            try:
+                results = self.evaluate(all_rows)
+            except Exception:
+                for rows, future in batch:
+                    try:
+                        future.set_result(self.evaluate(rows))
+                    except Exception as error:
+                        future.set_exception(error)
+                continue
+
+            offset = 0
+            for rows, future in batch:
+                future.set_result(results[offset:offset + len(rows)])
+                offset += len(rows)
+
+
+# --- Evaluator (Dipanggil Sekali per Batch) ---
+def price_rows(data_file, rows):
+    lattice = load_shared_lattice(data_file)
+    results = []
+    for chunk, prices, notes in price_catch_rows(rows, lattice, chunk_size=max(len(rows), 1)):
+        results.extend({"price": price, "note": note} for price, note in zip(prices.tolist(), notes))
+    return results
+
+def ideal_weight_rows(data_file, rows):
+    multipliers, notes = resolve_multipliers(rows, load_shared_lattice(data_file))
+    targets = np.array([row["target_price"] for row in rows], dtype=float)
+    weights = ideal_weight_with_multiplier(targets, multipliers)
+    results = []
+    for weight, target, note in zip(weights.tolist(), targets.tolist(), notes):
+        if not note and not target > 0:
+            note = "Harga target tidak valid"
+        if not note and not math.isfinite(weight):
+            note = "Leverage tidak valid"
+        results.append({"ideal_weight": None if note else weight, "note": note})
+    return results
+
+
+# --- Parsing Body Request ---
+def _catch_rows(body, key):
+    items = body.get(key) if isinstance(body, dict) and key in body else body
+    if isinstance(items, dict):
+        items = [items]
+    if not isinstance(items, list):
+        raise ValueError(f"body harus berisi list '{key}'")
+    rows = []
+    for item in items:
+        if not isinstance(item, dict):
+            raise ValueError("tiap item harus berupa object JSON")
+        row = normalize_row(item)
+        # Target yang bukan angka jadi NaN -> catatan "Harga target tidak valid"
+        row["target_price"] = parse_number(item.get("target_price"))
+        rows.append(row)
+    return rows
+
+
+class IwakRequestHandler(BaseHTTPRequestHandler):
+    server_version = "IwakAPI/1.0"
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise ValueError("body kebesaran")
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        if self.path == "/health":
+            catalog = load_shared_catalog(self.server.data_file)
+            self._send_json(200, {"status": "ok", "version": catalog.version,
+                                  "fish": len(catalog.fish), "mutations": len(catalog.mutations)})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        try:
+            body = self._read_json()
+            if self.path == "/price":
+                rows = _catch_rows(body, "catches")
+                results = self.server.price_batcher.submit(rows)
+                total = sum(result["price"] for result in results)
+                self._send_json(200, {"results": results, "total": total})
+            elif self.path == "/ideal-weight":
+                rows = _catch_rows(body, "queries")
+                self._send_json(200, {"results": self.server.ideal_weight_batcher.submit(rows)})
+            else:
+                self._send_json(404, {"error": "not found"})
+        except (ValueError, json.JSONDecodeError) as error:
+            self._send_json(400, {"error": str(error)})
+        except Exception as error:
+            # Jangan sampai koneksinya putus tanpa jawaban
+            self._send_json(500, {"error": f"internal error: {error}"})
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class IwakHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Default socketserver cuma 5, kebanyakan koneksi barengan bakal ditolak
+    request_queue_size = 128
+
+
+def make_server(host="127.0.0.1", port=8502, data_file=DEFAULT_DATA_FILE,
+                batch_window=BATCH_WINDOW_SECONDS, verbose=False):
+    server = IwakHTTPServer((host, port), IwakRequestHandler)
+    server.data_file = data_file
+    server.verbose = verbose
+    server.price_batcher = Batcher(lambda rows: price_rows(data_file, rows), batch_window)
+    server.ideal_weight_batcher = Batcher(lambda rows: ideal_weight_rows(data_file, rows), batch_window)
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API harga iwak (HTTP lokal)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--data", default=DEFAULT_DATA_FILE, help="path iwak_data.json")
+    parser.add_argument("--batch-window-ms", type=float, default=BATCH_WINDOW_SECONDS * 1000)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.data, args.batch_window_ms / 1000, args.verbose)
+    print(f"🐟 Iwak API jalan di http://{args.host}:{server.server_port} (katalog: {args.data})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
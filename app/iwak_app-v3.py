@@ -1,7 +1,8 @@
 import streamlit as st # type: ignore
 import json
 import os
-import time
+
+from iwak_flash import push_flash, show_flash
 
 # --- Konfigurasi Halaman (Pastikan ini ada di paling atas file .py) ---
 st.set_page_config(
@@ -304,6 +305,7 @@ with tab_fish_mgmt:
     st.subheader("Tambah Ikan Baru")
     # Buat placeholder kosong di atas form
     message_placeholder_add_fish = st.empty() 
+    show_flash(message_placeholder_add_fish, st.session_state, 'add_fish', html=True)
 
     with st.form("add_fish_form"):
         new_fish_name = st.text_input("Nama Ikan Baru")
@@ -317,17 +319,9 @@ with tab_fish_mgmt:
         if add_fish_button:
             result_message = add_fish(new_fish_name, new_fish_leverage) # Tangkap hasil pesan dari fungsi
             
-            # Tampilkan pesan di placeholder (di bagian Tambah Ikan)
-            if result_message["type"] == "success":
-                message_placeholder_add_fish.markdown(f"<p style='color: #FFFFFF;'>{result_message['content']}</p>", unsafe_allow_html=True) 
-            elif result_message["type"] == "warning":
-                message_placeholder_add_fish.markdown(f"<p style='color: #FFFFFF;'>{result_message['content']}</p>", unsafe_allow_html=True)
-            elif result_message["type"] == "error":
-                message_placeholder_add_fish.markdown(f"<p style='color: #FFFFFF;'>{result_message['content']}</p>", unsafe_allow_html=True)
-
-            time.sleep(2) # <--- JEDA 2 DETIK DI SINI!
-
-            st.rerun() # <--- BARU RERUN SETELAH JEDA
+            # Pesan disimpan dulu, tampil di run berikutnya (tanpa jeda time.sleep)
+            push_flash(st.session_state, 'add_fish', result_message)
+            st.rerun()
 
     st.write("---")
 
@@ -335,6 +329,7 @@ with tab_fish_mgmt:
     st.subheader("Ubah Nama Ikan")
     # Buat placeholder kosong di atas form UPDATE
     message_placeholder_update_fish = st.empty()
+    show_flash(message_placeholder_update_fish, st.session_state, 'update_fish', html=True)
     fish_to_update_options = [f['name'] for f in st.session_state.data['fish_types']]
     # Pastikan ada pilihan untuk diupdate, kalau kosong kasih default None
     if not fish_to_update_options:
@@ -372,16 +367,8 @@ with tab_fish_mgmt:
             result_message = update_fish(fish_to_update, updated_fish_name, updated_fish_leverage)
             
 
-            # Tampilkan pesan di placeholder (di bagian Tambah Ikan)
-            if result_message["type"] == "success":
-                message_placeholder_update_fish.markdown(f"<p style='color: #FFFFFF;'>{result_message['content']}</p>", unsafe_allow_html=True) 
-            elif result_message["type"] == "warning":
-                message_placeholder_update_fish.markdown(f"<p style='color: #FFFFFF;'>{result_message['content']}</p>", unsafe_allow_html=True)
-            elif result_message["type"] == "error":
-                message_placeholder_update_fish.markdown(f"<p style='color: #FFFFFF;'>{result_message['content']}</p>", unsafe_allow_html=True)
-            
-            time.sleep(2) # <--- JEDA 2 DETIK DI SINI!
-            
+            # Pesan disimpan dulu, tampil di run berikutnya (tanpa jeda time.sleep)
+            push_flash(st.session_state, 'update_fish', result_message)
             st.rerun()
 
     st.write("---")
@@ -390,6 +377,7 @@ with tab_fish_mgmt:
     st.subheader("Hapus Ikan")
     # Buat placeholder kosong di atas button DELETE
     message_placeholder_delete_fish = st.empty()
+    show_flash(message_placeholder_delete_fish, st.session_state, 'delete_fish', html=True)
     fish_to_delete_options = [f['name'] for f in st.session_state.data['fish_types']]
     if not fish_to_delete_options:
         fish_to_delete_options = ["Belum ada ikan"]
@@ -404,15 +392,8 @@ with tab_fish_mgmt:
     if delete_fish_button:
         result_message = delete_fish(fish_to_delete)
         
-    # Tampilkan pesan di placeholder (di bagian Tambah Ikan)
-        if result_message["type"] == "success":
-            message_placeholder_delete_fish.markdown(f"<p style='color: #FFFFFF;'>{result_message['content']}</p>", unsafe_allow_html=True) 
-        elif result_message["type"] == "warning":
-            message_placeholder_delete_fish.markdown(f"<p style='color: #FFFFFF;'>{result_message['content']}</p>", unsafe_allow_html=True)
-        elif result_message["type"] == "error":
-            message_placeholder_delete_fish.markdown(f"<p style='color: #FFFFFF;'>{result_message['content']}</p>", unsafe_allow_html=True)
-            
-        time.sleep(2) # <--- JEDA 2 DETIK DI SINI!
+        # Pesan disimpan dulu, tampil di run berikutnya (tanpa jeda time.sleep)
+        push_flash(st.session_state, 'delete_fish', result_message)
         st.rerun()
 
 # --- Tab Manajemen Jenis Mutasi ---
@@ -432,6 +413,7 @@ with tab_mutation_mgmt:
     st.subheader("Tambah Jenis Mutasi Baru")
     # Buat placeholder kosong di atas form
     message_placeholder_add_mutation = st.empty()
+    show_flash(message_placeholder_add_mutation, st.session_state, 'add_mutation')
     with st.form("add_mutation_form"):
         new_mutation_name = st.text_input("Nama Mutasi Baru")
         new_mutation_leverage = st.number_input(
@@ -444,14 +426,8 @@ with tab_mutation_mgmt:
         if add_mutation_button:
             result_message = add_mutation(new_mutation_name, new_mutation_leverage)
             
-            if result_message["type"] == "success":
-                message_placeholder_add_mutation.success(result_message["content"])
-            elif result_message["type"] == "warning":
-                message_placeholder_add_mutation.warning(result_message["content"])
-            elif result_message["type"] == "error":
-                message_placeholder_add_mutation.error(result_message["content"])
-
-            time.sleep(2)
+            # Pesan disimpan dulu, tampil di run berikutnya (tanpa jeda time.sleep)
+            push_flash(st.session_state, 'add_mutation', result_message)
             st.rerun()
 
     st.write("---")
@@ -460,6 +436,7 @@ with tab_mutation_mgmt:
     st.subheader("Ubah Jenis Mutasi")
     # Buat placeholder kosong di atas form UPDATE
     message_placeholder_update_mutation = st.empty()
+    show_flash(message_placeholder_update_mutation, st.session_state, 'update_mutation')
     mutation_to_update_options = [m['name'] for m in st.session_state.data['mutation_types']]
     if not mutation_to_update_options:
         mutation_to_update_options = ["Belum ada mutasi"]
@@ -493,14 +470,8 @@ with tab_mutation_mgmt:
         if update_mutation_button:
             result_message = update_mutation(mutation_to_update, updated_mutation_name, updated_mutation_leverage)
             
-            if result_message["type"] == "success":
-                message_placeholder_update_mutation.success(result_message["content"])
-            elif result_message["type"] == "warning":
-                message_placeholder_update_mutation.warning(result_message["content"])
-            elif result_message["type"] == "error":
-                message_placeholder_update_mutation.error(result_message["content"])
-
-            time.sleep(2)
+            # Pesan disimpan dulu, tampil di run berikutnya (tanpa jeda time.sleep)
+            push_flash(st.session_state, 'update_mutation', result_message)
             st.rerun()
 
     st.write("---")
@@ -509,6 +480,7 @@ with tab_mutation_mgmt:
     st.subheader("Hapus Jenis Mutasi")
     # Buat placeholder kosong di atas button DELETE
     message_placeholder_delete_mutation = st.empty()
+    show_flash(message_placeholder_delete_mutation, st.session_state, 'delete_mutation')
     mutation_to_delete_options = [m['name'] for m in st.session_state.data['mutation_types']]
     if not mutation_to_delete_options:
         mutation_to_delete_options = ["Belum ada mutasi"]
@@ -523,12 +495,6 @@ with tab_mutation_mgmt:
     if delete_mutation_button:
         result_message = delete_mutation(mutation_to_delete)
         
-        if result_message["type"] == "success":
-            message_placeholder_delete_mutation.success(result_message["content"])
-        elif result_message["type"] == "warning":
-            message_placeholder_delete_mutation.warning(result_message["content"])
-        elif result_message["type"] == "error":
-            message_placeholder_delete_mutation.error(result_message["content"])
-            
-        time.sleep(2)
-        st.rerun()
\ No newline at end of file
+        # Pesan disimpan dulu, tampil di run berikutnya (tanpa jeda time.sleep)
+        push_flash(st.session_state, 'delete_mutation', result_message)
+        st.rerun()
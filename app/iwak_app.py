@@ -1,8 +1,18 @@
 import streamlit as st # type: ignore
-import json
-import os
+import codecs
 import time
 
+import numpy as np
+
+from iwak_bulk import guess_format, price_catch_rows, read_catch_rows
+from iwak_catalog import RevisionConflict
+from iwak_optimizer import best_value_for_capacity, best_value_for_slots, fewest_fish_for_quota, least_weight_for_quota
+from iwak_pricing import ideal_weight_with_multiplier, price_with_multiplier
+from iwak_profiler import PROFILE_ENABLED, process_stats, start_rerun
+from iwak_solver import solve_target
+from iwak_storage import edit_shared_catalog, load_shared_catalog, load_shared_lattice, load_shared_search
+from iwak_table import PAGE_SIZES, catalog_table
+
 # --- Konfigurasi Halaman (Pastikan ini ada di paling atas file .py) ---
 st.set_page_config(
     page_title="Iwak App | Fisch-RBL",
@@ -10,63 +20,60 @@ st.set_page_config(
     layout="centered"
 )
 
+# --- Profiler Per Rerun (Opsional: env IWAK_PROFILE=1 atau ?debug=1 di URL) ---
+profiler = start_rerun(st.session_state, PROFILE_ENABLED or st.query_params.get("debug") == "1")
+
 # --- Nama File Database (JSON) ---
 DATA_FILE = "D:/Iwak/app/iwak_data.json"
 
-# --- Fungsi untuk Memuat dan Menyimpan Data ---
-def load_data():
-    if not os.path.exists(DATA_FILE):
-        return {
-            "fish_types": [],
-            "mutation_types": []
-        }
-    with open(DATA_FILE, "r") as f:
-        return json.load(f)
-
-def save_data(data):
-    # Buat direktori jika belum ada (untuk memastikan path-nya aman)
-    os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
-    with open(DATA_FILE, "w") as f:
-        json.dump(data, f, indent=4)
-
-# --- Inisialisasi Data ke Session State ---
-if 'data' not in st.session_state:
-    st.session_state.data = load_data()
+# --- Katalog Bersama (Satu Snapshot per Proses Server) ---
+# Semua session baca snapshot read-only yang sama dari iwak_storage. Snapshot
+# baru dipasang otomatis kalau file berubah atau ada yang edit lewat CRUD.
+catalog = load_shared_catalog(DATA_FILE)
+# Tabel pengali (iwak x mutasi x shiny x sparkling) ikut snapshot katalog:
+# harga tinggal satu lookup + satu perkalian sama berat
+lattice = load_shared_lattice(DATA_FILE)
+# Index cari nama iwak/mutasi (typeahead di server, lihat iwak_search)
+search_index = load_shared_search(DATA_FILE)
+profiler.checkpoint("catalog_load")
 
 # --- Fungsi CRUD untuk Jenis Ikan (Tetap ada fungsinya, cuma formnya aja yang diilangin) ---
+# expected_revision = record['revision'] waktu datanya ditampilkan ke admin.
+# Kalau admin lain sudah ngubah record yang sama duluan, editnya ditolak
+# (bukan nimpa diam-diam); edit ke record lain tetap jalan barengan.
 def add_fish(name, leverage):
     if name and leverage is not None:
-        if not any(f['name'].lower() == name.lower() for f in st.session_state.data['fish_types']):
-            st.session_state.data['fish_types'].append({"name": name, "leverage": leverage})
-            save_data(st.session_state.data)
+        if edit_shared_catalog(DATA_FILE, lambda c: c.fish.add(name, leverage)):
             return {"type": "success", "content": f"Jenis ikan <span style='color: #FFD700;'>{name}</span> berhasil ditambahkan!"}
         else:
             return {"type": "warning", "content": f"Jenis ikan <span style='color: orange;'>{name}</span> sudah ada."}
     else:
         return {"type": "error", "content": "Nama ikan dan leverage tidak boleh kosong."}
 
-def update_fish(old_name, new_name, new_leverage):
+def update_fish(old_name, new_name, new_leverage, expected_revision=None):
     if old_name and new_name and new_leverage is not None:
-        if old_name != new_name and any(f['name'].lower() == new_name.lower() for f in st.session_state.data['fish_types']):
+        if old_name.casefold() != new_name.casefold() and new_name in load_shared_catalog(DATA_FILE).fish:
             return {"type": "error", "content": f"Nama ikan <span style='color: red;'>{new_name}</span> sudah ada. Pilih nama lain."}
 
-        found = False
-        for i, fish in enumerate(st.session_state.data['fish_types']):
-            if fish['name'] == old_name:
-                st.session_state.data['fish_types'][i] = {"name": new_name, "leverage": new_leverage}
-                save_data(st.session_state.data)
-                found = True
-                return {"type": "success", "content": f"Ikan <span style='color: #FFD700;'>{new_name}</span> berhasil diupdate"}
-        if not found:
+        try:
+            updated = edit_shared_catalog(DATA_FILE, lambda c: c.fish.update(old_name, new_name, new_leverage, expected_revision))
+        except RevisionConflict:
+            return {"type": "error", "content": f"Ikan <span style='color: red;'>{old_name}</span> barusan diubah admin lain. Cek data terbaru dulu, terus ulangi."}
+        except ValueError: # Admin lain barusan pakai nama yang sama (lolos cek di atas)
+            return {"type": "error", "content": f"Nama ikan <span style='color: red;'>{new_name}</span> sudah ada. Pilih nama lain."}
+        if updated:
+            return {"type": "success", "content": f"Ikan <span style='color: #FFD700;'>{new_name}</span> berhasil diupdate"}
+        else:
             return {"type": "error", "content": f"Jenis ikan <span style='color: red;'>{old_name}</span> tidak ditemukan."}
     else:
         return {"type": "error", "content": "Semua input untuk update ikan tidak boleh kosong."}
 
-def delete_fish(name):
-    initial_len = len(st.session_state.data['fish_types'])
-    st.session_state.data['fish_types'] = [f for f in st.session_state.data['fish_types'] if f['name'] != name]
-    if len(st.session_state.data['fish_types']) < initial_len:
-        save_data(st.session_state.data)
+def delete_fish(name, expected_revision=None):
+    try:
+        deleted = edit_shared_catalog(DATA_FILE, lambda c: c.fish.delete(name, expected_revision))
+    except RevisionConflict:
+        return {"type": "error", "content": f"Ikan <span style='color: red;'>{name}</span> barusan diubah admin lain. Cek data terbaru dulu, terus ulangi."}
+    if deleted:
         return {"type": "success", "content": f"Ikan <span style='color: #FFD700;'>{name}</span> berhasil dihapus!"}
     else:
         return {"type": "warning", "content": f"Ikan <span style='color: orange;'>{name}</span> ga ada lol :)"}
@@ -74,41 +81,99 @@ def delete_fish(name):
 # --- Fungsi CRUD untuk Jenis Mutasi (Tetap ada fungsinya, cuma formnya aja yang diilangin) ---
 def add_mutation(name, leverage):
     if name and leverage is not None:
-        if not any(m['name'].lower() == name.lower() for m in st.session_state.data['mutation_types']):
-            st.session_state.data['mutation_types'].append({"name": name, "leverage": leverage})
-            save_data(st.session_state.data)
+        if edit_shared_catalog(DATA_FILE, lambda c: c.mutations.add(name, leverage)):
             return {"type": "success", "content": f"Jenis mutasi **{name}** berhasil ditambahkan!"}
         else:
             return {"type": "warning", "content": f"Jenis mutasi **{name}** sudah ada."}
     else:
         return {"type": "error", "content": "Nama mutasi dan leverage tidak boleh kosong."}
 
-def update_mutation(old_name, new_name, new_leverage):
+def update_mutation(old_name, new_name, new_leverage, expected_revision=None):
     if old_name and new_name and new_leverage is not None:
-        if old_name != new_name and any(m['name'].lower() == new_name.lower() for m in st.session_state.data['mutation_types']):
+        if old_name.casefold() != new_name.casefold() and new_name in load_shared_catalog(DATA_FILE).mutations:
             return {"type": "error", "content": f"Nama mutasi **{new_name}** sudah ada. Pilih nama lain."}
 
-        found = False
-        for i, mut in enumerate(st.session_state.data['mutation_types']):
-            if mut['name'] == old_name:
-                st.session_state.data['mutation_types'][i] = {"name": new_name, "leverage": new_leverage}
-                save_data(st.session_state.data)
-                found = True
-                return {"type": "success", "content": f"Mutasi **{old_name}** berhasil diupdate menjadi ***{new_name}***."}
-        if not found:
+        try:
+            updated = edit_shared_catalog(DATA_FILE, lambda c: c.mutations.update(old_name, new_name, new_leverage, expected_revision))
+        except RevisionConflict:
+            return {"type": "error", "content": f"Mutasi **{old_name}** barusan diubah admin lain. Cek data terbaru dulu, terus ulangi."}
+        except ValueError: # Admin lain barusan pakai nama yang sama (lolos cek di atas)
+            return {"type": "error", "content": f"Nama mutasi **{new_name}** sudah ada. Pilih nama lain."}
+        if updated:
+            return {"type": "success", "content": f"Mutasi **{old_name}** berhasil diupdate menjadi ***{new_name}***."}
+        else:
             return {"type": "error", "content": f"Jenis mutasi **{old_name}** tidak ditemukan."}
     else:
         return {"type": "error", "content": "Semua input untuk update mutasi tidak boleh kosong."}
 
-def delete_mutation(name):
-    initial_len = len(st.session_state.data['mutation_types'])
-    st.session_state.data['mutation_types'] = [m for m in st.session_state.data['mutation_types'] if m['name'] != name]
-    if len(st.session_state.data['mutation_types']) < initial_len:
-        save_data(st.session_state.data)
+def delete_mutation(name, expected_revision=None):
+    try:
+        deleted = edit_shared_catalog(DATA_FILE, lambda c: c.mutations.delete(name, expected_revision))
+    except RevisionConflict:
+        return {"type": "error", "content": f"Mutasi **{name}** barusan diubah admin lain. Cek data terbaru dulu, terus ulangi."}
+    if deleted:
         return {"type": "success", "content": f"Mutasi **{name}** berhasil dihapus!"}
     else:
         return {"type": "warning", "content": f"Mutasi **{name}** ga ada lol :)"}
 
+# --- Opsi Selectbox Nama (Typeahead Kalau Katalognya Gede) ---
+# Katalog kecil: semua nama langsung jadi opsi selectbox kayak biasa.
+# Katalog gede (> TYPEAHEAD_LIMIT nama): muncul kotak cari di atasnya, dan
+# yang dikirim ke browser cuma TYPEAHEAD_LIMIT hasil teratas dari index di
+# server (plus pilihan yang lagi aktif, biar nggak ke-reset).
+TYPEAHEAD_LIMIT = 50
+
+def opsi_selectbox(section, cari, placeholder, key_cari, key_select):
+    if len(section) <= TYPEAHEAD_LIMIT:
+        return [placeholder] + section.sorted_names()
+    query = st.text_input(
+        "Cari",
+        placeholder="🔎 Ketik sebagian nama...",
+        label_visibility="collapsed",
+        key=key_cari
+    )
+    names = cari(query, TYPEAHEAD_LIMIT)
+    selected = st.session_state.get(key_select)
+    if selected in section and selected not in names:
+        names = [selected] + names
+    return [placeholder] + names
+
+# --- Tabel Katalog Per Halaman (Nama Iwak & Mutasi) ---
+# Tabelnya dibangun sekali per snapshot katalog (lihat iwak_table.py); cari,
+# urut, dan potong halaman di server, yang dikirim ke browser cuma satu halaman.
+URUTAN_TABEL = {
+    "Nama (A-Z)": "name_asc",
+    "Nama (Z-A)": "name_desc",
+    "Leverage (kecil-besar)": "leverage_asc",
+    "Leverage (besar-kecil)": "leverage_desc",
+}
+
+def tampilkan_tabel_katalog(section, key_prefix):
+    tabel = catalog_table(section)
+    col_cari, col_urut, col_ukuran = st.columns([3, 2, 1])
+    with col_cari:
+        query = st.text_input("Cari nama", placeholder="🔎 Ketik sebagian nama...", key=f"{key_prefix}query")
+    with col_urut:
+        urutan = st.selectbox("Urutkan", list(URUTAN_TABEL), key=f"{key_prefix}sort")
+    with col_ukuran:
+        ukuran = st.selectbox("Baris/halaman", PAGE_SIZES, key=f"{key_prefix}page_size")
+
+    total = len(tabel.rows(query, URUTAN_TABEL[urutan]))
+    jumlah_halaman = max(1, -(-total // ukuran))
+    # Filter / ukuran halaman berubah -> halaman lama bisa kelewat batas
+    key_halaman = f"{key_prefix}page"
+    if not 1 <= st.session_state.get(key_halaman, 1) <= jumlah_halaman:
+        st.session_state[key_halaman] = min(max(st.session_state.get(key_halaman, 1), 1), jumlah_halaman)
+    halaman = st.number_input(f"Halaman (dari {jumlah_halaman})", min_value=1, max_value=jumlah_halaman, step=1, key=key_halaman)
+
+    isi_halaman, total = tabel.page(query, URUTAN_TABEL[urutan], halaman, ukuran)
+    if total:
+        awal = (halaman - 1) * ukuran + 1
+        st.caption(f"Menampilkan {awal}–{awal + isi_halaman.num_rows - 1} dari {total}")
+        st.dataframe(isi_halaman, use_container_width=True, hide_index=True)
+    else:
+        st.info("Nggak ada yang cocok.")
+
 # --- Judul Aplikasi ---
 st.title("🐟 Timbang Iwak")
 st.markdown(
@@ -117,12 +182,37 @@ st.markdown(
     """
 )
 
-# --- Tabs (Pemisah Halaman) ---
-tab_calculator, tab_fish_mgmt, tab_mutation_mgmt, tab_target_price = st.tabs(
-    ["Hitung Iwak", "Nama Iwak", "Mutasi", "Target Harga"]
+# --- Navigasi Halaman (Cuma Halaman yang Aktif yang Dijalankan) ---
+# Dulu pakai st.tabs: isi keempat tab SELALU dijalankan tiap rerun (termasuk
+# sort + kirim dataframe katalog ke browser), walaupun yang kelihatan cuma
+# satu. Sekarang pilihan halamannya radio, dan cuma isi halaman yang
+# dipilih yang jalan; halaman lain nggak makan waktu sama sekali.
+HALAMAN = ["Hitung Iwak", "Nama Iwak", "Mutasi", "Target Harga"]
+
+halaman_aktif = st.radio(
+    "Halaman",
+    HALAMAN,
+    horizontal=True,
+    label_visibility="collapsed",
+    key='active_page' # Key unik
 )
 
-with tab_calculator:
+# State widget yang nggak dirender di satu rerun dibuang Streamlit, jadi
+# pilihan di halaman lain bakal ke-reset waktu pindah halaman. Biar tetap
+# keinget, state widget halaman yang LAGI NGGAK AKTIF di-set ulang di sini
+# (file uploader nggak bisa di-set, jadi nggak ikut).
+WIDGET_PAGES = {
+    "calculator_": "Hitung Iwak", "berat_iwak_input_": "Hitung Iwak", "target_price_": "Target Harga",
+    "fish_table_": "Nama Iwak", "mutation_table_": "Mutasi",
+}
+for widget_key in list(st.session_state.keys()):
+    for prefix, halaman in WIDGET_PAGES.items():
+        if widget_key.startswith(prefix) and halaman != halaman_aktif and widget_key != 'calculator_bulk_file':
+            st.session_state[widget_key] = st.session_state[widget_key]
+
+profiler.checkpoint("header_tabs")
+
+if halaman_aktif == "Hitung Iwak":
     st.header("⚙️ Yuk, Atur Spek Iwakmu!")
     st.markdown("""
         Pilih jenis ikan, masukkan berat, dan centang kalo ada mutasi atau atribut spesial.
@@ -138,11 +228,11 @@ with tab_calculator:
     with col_fish_type:
         st.markdown("##### 🐟 Pilih Jenis Iwakmu")
         
-        # Ambil semua nama ikan dari session_state dan urutkan
-        all_fish_names = [f['name'] for f in st.session_state.data['fish_types']]
-        all_fish_names.sort() # Mengurutkan secara abjad (A-Z)
-
-        fish_names_for_selectbox = ["Pilih Jenis Iwak..."] + all_fish_names
+        # Nama iwak urut A-Z dari katalog (atau hasil cari kalau katalognya gede)
+        fish_names_for_selectbox = opsi_selectbox(
+            catalog.fish, search_index.search_fish, "Pilih Jenis Iwak...",
+            'calculator_fish_search', 'calculator_main_fish_select'
+        )
         selected_fish_name = st.selectbox(
             "**Nama Iwak:**",
             fish_names_for_selectbox,
@@ -150,22 +240,16 @@ with tab_calculator:
             help="Wajib dipilih ya, Bos. Kalau belum ada, tambahin di tab 'Nama Iwak' dulu.",
             key='calculator_main_fish_select' # Key unik
         )
-        
-        leverage_ikan = 1.0
-        if selected_fish_name != "Pilih Jenis Iwak...":
-            for fish in st.session_state.data['fish_types']:
-                if fish['name'] == selected_fish_name:
-                    leverage_ikan = fish['leverage']
-                    break
+        profiler.checkpoint("calculator.fish_select")
 
     with col_mutation:
         st.markdown("##### 🧬 Pilih Mutasi")
         
-        # Ambil semua nama mutasi dari session_state dan urutkan
-        all_mutation_names = [m['name'] for m in st.session_state.data['mutation_types']]
-        all_mutation_names.sort() # Mengurutkan secara abjad (A-Z)
-
-        mutation_names = ["Ga ada mutasi"] + all_mutation_names
+        # Nama mutasi urut A-Z dari katalog (atau hasil cari kalau katalognya gede)
+        mutation_names = opsi_selectbox(
+            catalog.mutations, search_index.search_mutations, "Ga ada mutasi",
+            'calculator_mutation_search', 'calculator_main_mutation_select'
+        )
         selected_mutasi = st.selectbox(
             "**Jenis Mutasi:**",
             mutation_names,
@@ -173,13 +257,7 @@ with tab_calculator:
             help="Pilih **'Ga ada mutasi'** kalau iwakmu normal aja.",
             key='calculator_main_mutation_select' # Key unik
         )
-
-        leverage_mutasi = 1.0
-        if selected_mutasi != "Ga ada mutasi":
-            for mut in st.session_state.data['mutation_types']:
-                if mut['name'] == selected_mutasi:
-                    leverage_mutasi = mut['leverage']
-                    break
+        profiler.checkpoint("calculator.mutation_select")
 
     # Mengurangi spasi dengan custom HTML hr
     st.markdown("<hr style='margin: 0.5em 0;'>", unsafe_allow_html=True)
@@ -188,128 +266,269 @@ with tab_calculator:
     st.markdown("##### ✨ Atribut Spesial (Opsional)")
     col_shiny, col_sparkling = st.columns(2)
 
-    LEVERAGE_SHINY_FIXED = 1.85
-    LEVERAGE_SPARKLING_FIXED = 1.85
-
     with col_shiny:
         is_shiny = st.checkbox(
             f"**Shiny**",
             key='calculator_main_shiny_checkbox'
         )
-        leverage_shiny = LEVERAGE_SHINY_FIXED if is_shiny else 1.0
 
     with col_sparkling:
         is_sparkling = st.checkbox(
             f"**Sparkling**",
             key='calculator_main_sparkling_checkbox'
         )
-        leverage_sparkling = LEVERAGE_SPARKLING_FIXED if is_sparkling else 1.0
+
+    # Pengali total (semua faktor kecuali berat), diambil dari tabel pengali
+    pengali_harga = 0.0
+    if selected_fish_name != "Pilih Jenis Iwak...":
+        pengali_harga = lattice.multiplier(
+            selected_fish_name, selected_mutasi if selected_mutasi != "Ga ada mutasi" else None, is_shiny, is_sparkling
+        )
 
     # Mengurangi spasi dengan custom HTML hr
     st.markdown("<hr style='margin: 0.5em 0;'>", unsafe_allow_html=True)
 
-    # --- Bagian Input Berat Iwak Dinamis & Hasil Per Iwak ---
-    st.markdown("##### ⚖️ Masukkan Berat Iwak & Lihat Harga Per Item")
+    # --- Mode Input: Satu-satu (widget per baris) atau Bulk (tempel/upload) ---
+    mode_input = st.radio(
+        "**Mode Input Berat:**",
+        ["Satu-satu", "Bulk (Tempel / Upload)"],
+        horizontal=True,
+        key='calculator_input_mode' # Key unik
+    )
 
-    # Inisialisasi jumlah input berat
-    if 'num_berat_inputs' not in st.session_state:
-        st.session_state.num_berat_inputs = 1
+    if mode_input == "Satu-satu":
+        # --- Bagian Input Berat Iwak Dinamis & Hasil Per Iwak ---
+        st.markdown("##### ⚖️ Masukkan Berat Iwak & Lihat Harga Per Item")
+
+        # Batasan jumlah input
+        MAX_WEIGHT_INPUTS = 10
+
+        def ubah_jumlah_input_berat(delta):
+            st.session_state.num_berat_inputs += delta
+
+        # --- Grid Berat + Harga Per Item + TOTAL (Fragment) ---
+        # Ngetik satu berat / tambah-kurang input cuma ngerender ulang bagian
+        # ini, bukan seluruh app (tab Nama Iwak & Mutasi nggak ikut jalan).
+        # Ganti iwak/mutasi/shiny/sparkling di atas tetap rerun penuh, dan
+        # argumen terakhirnya dipakai lagi waktu fragment rerun sendirian.
+        @st.fragment
+        def grid_berat_iwak(selected_fish_name, pengali_harga):
+            # Rerun fragment doang: profiler rerun penuh sudah selesai, jadi
+            # waktunya dicatat terpisah sebagai "fragment_total"
+            run_profiler = profiler
+            if profiler.finished:
+                run_profiler = start_rerun(st.session_state, profiler.enabled, total_name="fragment_total")
+
+            # Inisialisasi jumlah input berat
+            if 'num_berat_inputs' not in st.session_state:
+                st.session_state.num_berat_inputs = 1
     
-    # Batasan jumlah input
-    MAX_WEIGHT_INPUTS = 10
-
-    # List untuk menyimpan semua berat ikan yang diinput
-    berat_iwak_list = []
-    # List untuk menyimpan harga per ikan untuk dihitung total nanti
-    prices_per_fish_for_total = []
-
-    # Loop untuk menampilkan input berat dan hasilnya
-    for i in range(st.session_state.num_berat_inputs):
-        # Buat kolom untuk input berat dan hasil per ikan
-        col_input_berat, col_hasil_berat = st.columns([0.6, 0.4]) # Rasio lebar kolom
-
-        with col_input_berat:
-            berat_input = st.number_input(
-                f"Berat Iwak #{i+1} (kg)",
-                min_value=0.0,
-                value=0.0,
-                step=0.1,
-                format="%.1f",
-                key=f"berat_iwak_input_{i}" # Key unik untuk setiap input
-            )
-            berat_iwak_list.append(float(berat_input) if berat_input is not None else 0.0)
-
-        with col_hasil_berat:
-            # Kalkulasi harga untuk input berat ini
-            if selected_fish_name != "Pilih Jenis Iwak..." and berat_iwak_list[i] > 0:
-                calc_leverage_ikan = leverage_ikan if leverage_ikan is not None else 1.0
-                calc_berat_ikan = berat_iwak_list[i] if berat_iwak_list[i] is not None else 1.0
-                calc_leverage_mutasi = leverage_mutasi if leverage_mutasi is not None else 1.0
-                calc_leverage_shiny = leverage_shiny if leverage_shiny is not None else 1.0
-                calc_leverage_sparkling = leverage_sparkling if leverage_sparkling is not None else 1.0
-
-                final_price_per_fish = (
-                    calc_leverage_shiny *
-                    calc_leverage_sparkling *
-                    calc_leverage_mutasi *
-                    calc_leverage_ikan *
-                    calc_berat_ikan
-                )
-                prices_per_fish_for_total.append(final_price_per_fish) # Simpan untuk total nanti
-
-                # Format harga per ikan dengan pemisah ribuan (titik)
-                st.markdown(f"<div style='background-color: #333333; padding: 10px; border-radius: 5px; margin-top: 28px; text-align: center;'>"
-                            f"<span style='color: #FFD700; font-weight: bold;'>{final_price_per_fish:,.0f} Coin</span></div>", 
-                            unsafe_allow_html=True)
+            # List untuk menyimpan semua berat ikan yang diinput
+            berat_iwak_list = []
+            # Kolom hasil per ikan, diisi setelah semua harga dihitung sekaligus
+            kolom_hasil_list = []
+
+            # Loop untuk menampilkan input berat (harganya belum dihitung di sini)
+            for i in range(st.session_state.num_berat_inputs):
+                # Buat kolom untuk input berat dan hasil per ikan
+                col_input_berat, col_hasil_berat = st.columns([0.6, 0.4]) # Rasio lebar kolom
+
+                with col_input_berat:
+                    berat_input = st.number_input(
+                        f"Berat Iwak #{i+1} (kg)",
+                        min_value=0.0,
+                        value=0.0,
+                        step=0.1,
+                        format="%.1f",
+                        key=f"berat_iwak_input_{i}" # Key unik untuk setiap input
+                    )
+                    berat_iwak_list.append(float(berat_input) if berat_input is not None else 0.0)
+                kolom_hasil_list.append(col_hasil_berat)
+            run_profiler.checkpoint("calculator.weight_inputs")
+
+            # Pengali NaN: iwaknya nggak ada di tabel pengali (barusan dihapus /
+            # diganti nama admin lain, tabel pengalinya sudah duluan diupdate)
+            pengali_valid = bool(np.isfinite(pengali_harga))
+
+            # Kalkulasi harga SEMUA baris sekaligus (vectorized, tanpa loop per baris)
+            if selected_fish_name != "Pilih Jenis Iwak..." and pengali_valid:
+                prices_per_fish_for_total = price_with_multiplier(berat_iwak_list, pengali_harga)
             else:
-                prices_per_fish_for_total.append(0.0) # Jika tidak dihitung, anggap 0
-                st.markdown(f"<div style='background-color: #333333; padding: 10px; border-radius: 5px; margin-top: 28px; text-align: center;'>"
-                            f"<span style='color: #AAAAAA; font-weight: bold;'>0 Coin</span></div>", 
-                            unsafe_allow_html=True) # Tampilan default jika belum valid/0
-
-    # Tombol Tambah/Kurang Input Berat
-    col_add_btn, col_remove_btn = st.columns(2)
-    with col_add_btn:
-        if st.button("➕ Tambah Input Berat", use_container_width=True, disabled=(st.session_state.num_berat_inputs >= MAX_WEIGHT_INPUTS)):
-            st.session_state.num_berat_inputs += 1
-            st.rerun() # Rerun agar input baru muncul
-
-    with col_remove_btn:
-        if st.button("➖ Kurangi Input Berat", use_container_width=True, disabled=(st.session_state.num_berat_inputs <= 1)):
-            st.session_state.num_berat_inputs -= 1
-            st.rerun() # Rerun agar input hilang
-
-    # Mengurangi spasi dengan custom HTML hr
-    st.markdown("<hr style='margin: 0.5em 0;'>", unsafe_allow_html=True)
-
-    # --- Kalkulasi TOTAL Harga (SEKARANG BENERAN DI BAWAH) ---
-    st.header("💰 Estimasi Total Harga Iwakmu!")
-
-    # Cek kondisi minimal untuk menampilkan TOTAL harga: nama ikan sudah dipilih dan minimal ada 1 berat > 0
-    if selected_fish_name != "Pilih Jenis Iwak..." and any(b > 0 for b in berat_iwak_list):
-        total_final_price = sum(prices_per_fish_for_total) # Jumlahkan semua harga per ikan yang sudah dihitung
+                prices_per_fish_for_total = [0.0] * len(berat_iwak_list) # Jika tidak dihitung, anggap 0
+            run_profiler.checkpoint("calculator.pricing")
+
+            for col_hasil_berat, final_price_per_fish in zip(kolom_hasil_list, prices_per_fish_for_total):
+                with col_hasil_berat:
+                    if final_price_per_fish > 0:
+                        # Format harga per ikan dengan pemisah ribuan (titik)
+                        st.markdown(f"<div style='background-color: #333333; padding: 10px; border-radius: 5px; margin-top: 28px; text-align: center;'>"
+                                    f"<span style='color: #FFD700; font-weight: bold;'>{final_price_per_fish:,.0f} Coin</span></div>", 
+                                    unsafe_allow_html=True)
+                    else:
+                        st.markdown(f"<div style='background-color: #333333; padding: 10px; border-radius: 5px; margin-top: 28px; text-align: center;'>"
+                                    f"<span style='color: #AAAAAA; font-weight: bold;'>0 Coin</span></div>", 
+                                    unsafe_allow_html=True) # Tampilan default jika belum valid/0
+
+            run_profiler.checkpoint("calculator.price_cells")
+
+            # Tombol Tambah/Kurang Input Berat: jumlahnya diubah di callback (jalan
+            # sebelum fragment dirender ulang), jadi nggak perlu st.rerun() penuh
+            col_add_btn, col_remove_btn = st.columns(2)
+            with col_add_btn:
+                st.button("➕ Tambah Input Berat", use_container_width=True,
+                          disabled=(st.session_state.num_berat_inputs >= MAX_WEIGHT_INPUTS),
+                          on_click=ubah_jumlah_input_berat, args=(1,))
+
+            with col_remove_btn:
+                st.button("➖ Kurangi Input Berat", use_container_width=True,
+                          disabled=(st.session_state.num_berat_inputs <= 1),
+                          on_click=ubah_jumlah_input_berat, args=(-1,))
+
+            # Mengurangi spasi dengan custom HTML hr
+            st.markdown("<hr style='margin: 0.5em 0;'>", unsafe_allow_html=True)
+
+            # --- Kalkulasi TOTAL Harga (SEKARANG BENERAN DI BAWAH) ---
+            st.header("💰 Estimasi Total Harga Iwakmu!")
+
+            # Cek kondisi minimal untuk menampilkan TOTAL harga: nama ikan sudah dipilih dan minimal ada 1 berat > 0
+            if selected_fish_name != "Pilih Jenis Iwak..." and pengali_valid and any(b > 0 for b in berat_iwak_list):
+                total_final_price = float(sum(prices_per_fish_for_total)) # Jumlahkan semua harga per ikan yang sudah dihitung
+
+                if total_final_price == 0: # Jika semua berat 0 setelah filter
+                     st.warning("⚠️ Belum ada iwak yang dihitung. Masukkan berat iwak yang valid ya!")
+                else:
+                    # Format total harga dengan pemisah ribuan (titik)
+                    st.success(f"### 🎉 TOTAL HARGA SEMUA IWAK: **{total_final_price:,.0f} Coin** $")
+            else:
+                # Tampilkan pesan kalau belum memenuhi syarat untuk kalkulasi TOTAL
+                if selected_fish_name == "Pilih Jenis Iwak...":
+                    st.info("Pilih **Jenis Iwak** dulu ya, Bos, biar totalnya bisa dihitung.")
+                elif not pengali_valid:
+                    st.warning(f"⚠️ Iwak **{selected_fish_name}** barusan diubah atau dihapus admin lain. Pilih ulang jenis iwaknya ya, Bos.")
+                elif all(b <= 0 for b in berat_iwak_list):
+                    st.info("Masukin minimal **satu Berat Iwak** yang valid dulu ya, Bos, biar totalnya bisa dihitung.")
+            run_profiler.checkpoint("calculator.total")
+
+            if run_profiler is not profiler:
+                run_profiler.finish()
+
+        grid_berat_iwak(selected_fish_name, pengali_harga)
+    else:
+        # --- Bagian Input Bulk (Ribuan Iwak, Tanpa Widget Per Baris) ---
+        st.markdown("##### 📋 Tempel atau Upload Banyak Iwak Sekaligus")
+        st.markdown("""
+            Satu iwak per baris: `berat` aja, atau `berat, iwak, mutasi`.
+            File CSV/JSON/JSONL boleh punya kolom `weight`/`berat`, `fish`/`iwak`, `mutation`/`mutasi`, `shiny`, `sparkling`.
+            Kolom yang kosong pakai pilihan di atas.
+        """)
+
+        bulk_text = st.text_area(
+            "Tempel berat iwak di sini",
+            height=150,
+            key='calculator_bulk_text' # Key unik
+        )
+        bulk_file = st.file_uploader(
+            "...atau upload file CSV / JSON / JSONL",
+            type=["csv", "jsonl", "ndjson", "json", "txt"],
+            key='calculator_bulk_file' # Key unik
+        )
 
-        if total_final_price == 0: # Jika semua berat 0 setelah filter
-             st.warning("⚠️ Belum ada iwak yang dihitung. Masukkan berat iwak yang valid ya!")
+        if bulk_file is not None:
+            bulk_file.seek(0)
+            # Dibaca baris demi baris, bukan dimuat semua jadi satu string
+            bulk_rows = read_catch_rows(codecs.iterdecode(bulk_file, "utf-8-sig"), guess_format(bulk_file.name))
         else:
-            # Format total harga dengan pemisah ribuan (titik)
-            st.success(f"### 🎉 TOTAL HARGA SEMUA IWAK: **{total_final_price:,.0f} Coin** $")
-    else:
-        # Tampilkan pesan kalau belum memenuhi syarat untuk kalkulasi TOTAL
-        if selected_fish_name == "Pilih Jenis Iwak...":
-            st.info("Pilih **Jenis Iwak** dulu ya, Bos, biar totalnya bisa dihitung.")
-        elif all(b <= 0 for b in berat_iwak_list):
-            st.info("Masukin minimal **satu Berat Iwak** yang valid dulu ya, Bos, biar totalnya bisa dihitung.")
+            bulk_rows = read_catch_rows(bulk_text.splitlines(), "text")
+
+        default_fish = selected_fish_name if selected_fish_name != "Pilih Jenis Iwak..." else None
+        default_mutation = selected_mutasi if selected_mutasi != "Ga ada mutasi" else None
+
+        hasil_bulk = {"Berat (kg)": [], "Iwak": [], "Mutasi": [], "Harga (Coin)": [], "Catatan": []}
+        total_bulk_price = 0.0
+        for chunk, prices, notes in price_catch_rows(
+            bulk_rows, lattice,
+            default_fish, default_mutation, is_shiny, is_sparkling
+        ):
+            total_bulk_price += float(prices.sum())
+            hasil_bulk["Berat (kg)"].extend(row['weight'] for row in chunk)
+            hasil_bulk["Iwak"].extend(row['fish'] or default_fish for row in chunk)
+            hasil_bulk["Mutasi"].extend(row['mutation'] or default_mutation for row in chunk)
+            hasil_bulk["Harga (Coin)"].extend(prices.tolist())
+            hasil_bulk["Catatan"].extend(notes)
+
+        profiler.checkpoint("calculator.bulk_pricing")
+
+        if hasil_bulk["Harga (Coin)"]:
+            st.dataframe(hasil_bulk, use_container_width=True)
+        profiler.checkpoint("calculator.bulk_table")
+
+        # Mengurangi spasi dengan custom HTML hr
+        st.markdown("<hr style='margin: 0.5em 0;'>", unsafe_allow_html=True)
+
+        st.header("💰 Estimasi Total Harga Iwakmu!")
+        if total_bulk_price > 0:
+            jumlah_iwak = len(hasil_bulk["Harga (Coin)"])
+            st.success(f"### 🎉 TOTAL HARGA {jumlah_iwak:,} IWAK: **{total_bulk_price:,.0f} Coin** $")
+        elif hasil_bulk["Harga (Coin)"]:
+            st.warning("⚠️ Belum ada iwak yang dihitung. Cek kolom **Catatan** di tabel ya!")
+        else:
+            st.info("Tempel atau upload data berat iwak dulu ya, Bos, biar totalnya bisa dihitung.")
+        profiler.checkpoint("calculator.total")
+
+        # --- Optimasi Jual: Pilih Iwak Mana yang Dijual ---
+        if total_bulk_price > 0:
+            with st.expander("🎯 Optimasi Jual (Kuota Coin / Kapasitas Tas)"):
+                mode_optimasi = st.radio(
+                    "**Tujuan:**",
+                    ["Kuota: iwak paling sedikit", "Kuota: berat paling ringan", "Tas: muat berapa kg", "Tas: muat berapa slot"],
+                    key='calculator_optimizer_mode' # Key unik
+                )
+                berat_bulk = hasil_bulk["Berat (kg)"]
+                harga_bulk = hasil_bulk["Harga (Coin)"]
+
+                if mode_optimasi.startswith("Kuota"):
+                    kuota_input = st.number_input(
+                        "**Kuota Coin:** (M)", min_value=0.0, value=1.0, step=0.5, format="%.1f",
+                        key='calculator_optimizer_quota' # Key unik
+                    )
+                    optimize = fewest_fish_for_quota if mode_optimasi == "Kuota: iwak paling sedikit" else least_weight_for_quota
+                    rencana_jual = optimize(berat_bulk, harga_bulk, kuota_input * 1_000_000)
+                elif mode_optimasi == "Tas: muat berapa kg":
+                    kapasitas_input = st.number_input(
+                        "**Kapasitas Tas (kg):**", min_value=0.0, value=100.0, step=10.0, format="%.1f",
+                        key='calculator_optimizer_capacity' # Key unik
+                    )
+                    rencana_jual = best_value_for_capacity(berat_bulk, harga_bulk, kapasitas_input)
+                else:
+                    slot_input = st.number_input(
+                        "**Jumlah Slot:**", min_value=0, value=10, step=1,
+                        key='calculator_optimizer_slots' # Key unik
+                    )
+                    rencana_jual = best_value_for_slots(berat_bulk, harga_bulk, slot_input)
+
+                if rencana_jual is None:
+                    st.warning("⚠️ Semua iwakmu dijual pun belum nyampe kuota itu, Bos.")
+                else:
+                    st.success(f"Jual **{rencana_jual['count']:,} iwak** "
+                               f"({rencana_jual['total_weight']:,.1f} kg): **{rencana_jual['total_price']:,.0f} Coin**")
+                    if rencana_jual['weight_step'] and rencana_jual['weight_step'] > 0.1:
+                        st.caption(f"Data banyak: berat dihitung per {rencana_jual['weight_step']:,.2f} kg biar tetap cepat, hasilnya bisa sedikit dari optimal.")
+                    if rencana_jual['indices']:
+                        st.dataframe(
+                            {kolom: [nilai[i] for i in rencana_jual['indices']] for kolom, nilai in hasil_bulk.items() if kolom != "Catatan"},
+                            use_container_width=True
+                        )
+            profiler.checkpoint("calculator.optimizer")
 
 # --- Tab Manajemen Jenis Ikan ---
-with tab_fish_mgmt:
+elif halaman_aktif == "Nama Iwak":
     st.header("Manajemen Jenis Ikan")
     st.write("Tambah, ubah, atau hapus jenis ikan dan nilai leveragenya.")
 
    # Tampilkan Data Saat Ini
     st.subheader("Daftar Jenis Ikan Saat Ini:")
-    sorted_fish_types = sorted(st.session_state.data['fish_types'], key=lambda x: x['name'].lower())
-    st.dataframe(sorted_fish_types, use_container_width=True)
+    tampilkan_tabel_katalog(catalog.fish, 'fish_table_')
+    profiler.checkpoint("fish_tab.table")
 
     # --- Hapus semua bagian Tambah, Update, Hapus ---
     # GemiKan v2 sengaja biarkan bagian ini kosong, agar tidak ada form CUD
@@ -324,14 +543,14 @@ with tab_fish_mgmt:
     # ... (form hapus ikan) ...
 
 # --- Tab Manajemen Jenis Mutasi ---
-with tab_mutation_mgmt:
+elif halaman_aktif == "Mutasi":
     st.header("Manajemen Mutasi")
     st.write("Tambah, ubah, atau hapus jenis mutasi dan nilai leveragenya.")
 
     # Tampilkan Data Saat Ini
     st.subheader("Daftar Jenis Mutasi Saat Ini:")
-    sorted_mutation_types = sorted(st.session_state.data['mutation_types'], key=lambda x: x['name'].lower())
-    st.dataframe(sorted_mutation_types, use_container_width=True)
+    tampilkan_tabel_katalog(catalog.mutations, 'mutation_table_')
+    profiler.checkpoint("mutation_tab.table")
 
     # --- Hapus semua bagian Tambah, Update, Hapus ---
     # GemiKan v2 sengaja biarkan bagian ini kosong, agar tidak ada form CUD
@@ -346,11 +565,12 @@ with tab_mutation_mgmt:
     # ... (form hapus mutasi) ...
 
 # --- Tab Target Harga (NEW) ---
-with tab_target_price:
+elif halaman_aktif == "Target Harga":
     st.header("🎯 Cari Berat Iwak Idealmu Berdasarkan Harga Target!")
     st.markdown("""
         Punya target harga koin tertentu? Masukkan targetmu di sini (dalam satuan M, misal `2.5` = `2.500.000`),
         pilih jenis ikan, mutasi, dan atribut spesial. Berat ideal iwak akan langsung muncul!
+        Atau pilih mode **Cari semua kombinasi** buat lihat semua iwak/mutasi yang bisa nyampe target di rentang berat tertentu.
     """)
 
     # Mengurangi spasi dengan custom HTML hr
@@ -363,7 +583,8 @@ with tab_target_price:
         value=1.0, # Default 1.0 berarti 1.000.000
         step=0.5,  # Step 0.1 berarti 100.000
         format="%.1f",
-        help="Contoh: `2.5` = `2.500.000` Coin."
+        help="Contoh: `2.5` = `2.500.000` Coin.",
+        key='target_price_input' # Key unik untuk tab ini
     )
     # Mengalikan input dengan 1.000.000
     target_price = target_price_input * 1_000_000 
@@ -371,103 +592,143 @@ with tab_target_price:
     # Mengurangi spasi dengan custom HTML hr
     st.markdown("<hr style='margin: 0.5em 0;'>", unsafe_allow_html=True)
 
-    # Kolom untuk Nama Iwak (Kiri Atas) dan Mutasi (Kanan Atas) - Sama seperti tab Hitung Iwak
-    col_fish_type_target, col_mutation_target = st.columns(2)
+    # --- Mode: Satu Kombinasi atau Cari Semua Kombinasi ---
+    mode_target = st.radio(
+        "**Mode:**",
+        ["Satu kombinasi", "Cari semua kombinasi"],
+        horizontal=True,
+        key='target_price_mode' # Key unik untuk tab ini
+    )
 
-    with col_fish_type_target:
-        st.markdown("##### 🐟 Pilih Jenis Iwakmu")
-        
-        # Ambil semua nama ikan dari session_state dan urutkan untuk tab Target Harga
-        all_fish_names_target = [f['name'] for f in st.session_state.data['fish_types']]
-        all_fish_names_target.sort() # Mengurutkan secara abjad (A-Z)
+    if mode_target == "Satu kombinasi":
+        # Kolom untuk Nama Iwak (Kiri Atas) dan Mutasi (Kanan Atas) - Sama seperti tab Hitung Iwak
+        col_fish_type_target, col_mutation_target = st.columns(2)
 
-        fish_names_for_selectbox_target = ["Pilih Jenis Iwak..."] + all_fish_names_target
-        selected_fish_name_target = st.selectbox(
-            "**Nama Iwak:**",
-            fish_names_for_selectbox_target,
-            index=0,
-            help="Wajib dipilih ya, Bos. Kalau belum ada, tambahin di tab 'Nama Iwak' dulu.",
-            key='target_price_fish_select' # Key unik untuk tab ini
-        )
+        with col_fish_type_target:
+            st.markdown("##### 🐟 Pilih Jenis Iwakmu")
         
-        leverage_ikan_target = 1.0
-        if selected_fish_name_target != "Pilih Jenis Iwak...":
-            for fish in st.session_state.data['fish_types']:
-                if fish['name'] == selected_fish_name_target:
-                    leverage_ikan_target = fish['leverage']
-                    break
-
-    with col_mutation_target:
-        st.markdown("##### 🧬 Pilih Mutasi")
-        
-        # Ambil semua nama mutasi dari session_state dan urutkan untuk tab Target Harga
-        all_mutation_names_target = [m['name'] for m in st.session_state.data['mutation_types']]
-        all_mutation_names_target.sort() # Mengurutkan secara abjad (A-Z)
-
-        mutation_names_target = ["Ga ada mutasi"] + all_mutation_names_target
-        selected_mutasi_target = st.selectbox(
-            "**Jenis Mutasi:**",
-            mutation_names_target,
-            index=0,
-            help="Pilih **'Ga ada mutasi'** kalau iwakmu normal aja.",
-            key='target_price_mutation_select' # Key unik untuk tab ini
-        )
-
-        leverage_mutasi_target = 1.0
-        if selected_mutasi_target != "Ga ada mutasi":
-            for mut in st.session_state.data['mutation_types']:
-                if mut['name'] == selected_mutasi_target:
-                    leverage_mutasi_target = mut['leverage']
-                    break
+            # Nama iwak urut A-Z dari katalog (atau hasil cari kalau katalognya gede)
+            fish_names_for_selectbox_target = opsi_selectbox(
+                catalog.fish, search_index.search_fish, "Pilih Jenis Iwak...",
+                'target_price_fish_search', 'target_price_fish_select'
+            )
+            selected_fish_name_target = st.selectbox(
+                "**Nama Iwak:**",
+                fish_names_for_selectbox_target,
+                index=0,
+                help="Wajib dipilih ya, Bos. Kalau belum ada, tambahin di tab 'Nama Iwak' dulu.",
+                key='target_price_fish_select' # Key unik untuk tab ini
+            )
+            profiler.checkpoint("target.fish_select")
 
-    # Mengurangi spasi dengan custom HTML hr
-    st.markdown("<hr style='margin: 0.5em 0;'>", unsafe_allow_html=True)
+        with col_mutation_target:
+            st.markdown("##### 🧬 Pilih Mutasi")
+        
+            # Nama mutasi urut A-Z dari katalog (atau hasil cari kalau katalognya gede)
+            mutation_names_target = opsi_selectbox(
+                catalog.mutations, search_index.search_mutations, "Ga ada mutasi",
+                'target_price_mutation_search', 'target_price_mutation_select'
+            )
+            selected_mutasi_target = st.selectbox(
+                "**Jenis Mutasi:**",
+                mutation_names_target,
+                index=0,
+                help="Pilih **'Ga ada mutasi'** kalau iwakmu normal aja.",
+                key='target_price_mutation_select' # Key unik untuk tab ini
+            )
+            profiler.checkpoint("target.mutation_select")
 
-    # Bagian Atribut Shiny & Sparkling (Opsional) - Sama seperti tab Hitung Iwak
-    st.markdown("##### ✨ Atribut Spesial (Opsional)")
-    col_shiny_target, col_sparkling_target = st.columns(2)
+        # Mengurangi spasi dengan custom HTML hr
+        st.markdown("<hr style='margin: 0.5em 0;'>", unsafe_allow_html=True)
 
-    LEVERAGE_SHINY_FIXED = 1.85 # Tetap pakai konstanta yang sama
-    LEVERAGE_SPARKLING_FIXED = 1.85 # Tetap pakai konstanta yang sama
+        # Bagian Atribut Shiny & Sparkling (Opsional) - Sama seperti tab Hitung Iwak
+        st.markdown("##### ✨ Atribut Spesial (Opsional)")
+        col_shiny_target, col_sparkling_target = st.columns(2)
 
-    with col_shiny_target:
-        is_shiny_target = st.checkbox(
-            f"**Shiny**",
-            key='target_price_shiny_checkbox' # Key unik untuk tab ini
-        )
-        leverage_shiny_target = LEVERAGE_SHINY_FIXED if is_shiny_target else 1.0
+        with col_shiny_target:
+            is_shiny_target = st.checkbox(
+                f"**Shiny**",
+                key='target_price_shiny_checkbox' # Key unik untuk tab ini
+            )
 
-    with col_sparkling_target:
-        is_sparkling_target = st.checkbox(
-            f"**Sparkling**",
-            key='target_price_sparkling_checkbox' # Key unik untuk tab ini
-        )
-        leverage_sparkling_target = LEVERAGE_SPARKLING_FIXED if is_sparkling_target else 1.0
+        with col_sparkling_target:
+            is_sparkling_target = st.checkbox(
+                f"**Sparkling**",
+                key='target_price_sparkling_checkbox' # Key unik untuk tab ini
+            )
 
-    # Mengurangi spasi dengan custom HTML hr
-    st.markdown("<hr style='margin: 0.5em 0;'>", unsafe_allow_html=True)
+        # Mengurangi spasi dengan custom HTML hr
+        st.markdown("<hr style='margin: 0.5em 0;'>", unsafe_allow_html=True)
 
-    st.header("⚖️ Berat Iwak Idealmu:")
+        st.header("⚖️ Berat Iwak Idealmu:")
 
-    # Logika Kalkulasi Berat Ideal
-    if selected_fish_name_target != "Pilih Jenis Iwak..." and target_price > 0:
-        # Hitung total leverage dari semua faktor
-        total_leverage = (
-            leverage_ikan_target *
-            leverage_mutasi_target *
-            leverage_shiny_target *
-            leverage_sparkling_target
-        )
+        # Logika Kalkulasi Berat Ideal
+        if selected_fish_name_target != "Pilih Jenis Iwak..." and target_price > 0:
+            # Hitung berat ideal pakai mesin harga (NaN kalau total leverage <= 0)
+            pengali_target = lattice.multiplier(
+                selected_fish_name_target,
+                selected_mutasi_target if selected_mutasi_target != "Ga ada mutasi" else None,
+                is_shiny_target, is_sparkling_target
+            )
+            berat_ideal = float(ideal_weight_with_multiplier(target_price, pengali_target))
 
-        if total_leverage > 0: # Hindari pembagian dengan nol
-            ideal_weight = target_price / total_leverage
-            # Format berat ideal dengan pemisah ribuan (titik)
-            st.success(f"### ✨ Berat Iwak Idealmu: **{ideal_weight:,.2f} kg**")
-            st.info("Ini adalah berat **per satu ekor** iwak untuk mencapai harga target.")
+            if berat_ideal > 0: # NaN berarti leverage tidak valid
+                # Format berat ideal dengan pemisah ribuan (titik)
+                st.success(f"### ✨ Berat Iwak Idealmu: **{berat_ideal:,.2f} kg**")
+                st.info("Ini adalah berat **per satu ekor** iwak untuk mencapai harga target.")
+            else:
+                st.warning("⚠️ Kombinasi pilihanmu tidak menghasilkan leverage yang valid (mungkin leverage ikan 0 atau masalah data).")
         else:
-            st.warning("⚠️ Kombinasi pilihanmu tidak menghasilkan leverage yang valid (mungkin leverage ikan 0 atau masalah data).")
+            if selected_fish_name_target == "Pilih Jenis Iwak...":
+                st.info("Pilih **Jenis Iwak** dulu ya, Bos, biar berat idealnya bisa dihitung.")
+            elif target_price <= 0:
+                st.info("Masukkan **Harga Target** yang valid (lebih dari 0) ya, Bos.")
     else:
-        if selected_fish_name_target == "Pilih Jenis Iwak...":
-            st.info("Pilih **Jenis Iwak** dulu ya, Bos, biar berat idealnya bisa dihitung.")
-        elif target_price <= 0:
+        # --- Cari Semua Kombinasi yang Nyampe Target Dalam Rentang Berat ---
+        # Batasan jumlah baris hasil (diurut dari berat paling ringan)
+        MAX_TARGET_RESULTS = 200
+
+        st.markdown("##### ⚖️ Rentang Berat yang Masuk Akal (kg)")
+        col_berat_min, col_berat_max = st.columns(2)
+        with col_berat_min:
+            berat_min_target = st.number_input(
+                "**Berat Minimal:**", min_value=0.0, value=0.0, step=1.0, format="%.1f",
+                key='target_price_min_weight' # Key unik untuk tab ini
+            )
+        with col_berat_max:
+            berat_max_target = st.number_input(
+                "**Berat Maksimal:**", min_value=0.0, value=1000.0, step=10.0, format="%.1f",
+                key='target_price_max_weight' # Key unik untuk tab ini
+            )
+
+        st.header("🔎 Kombinasi yang Nyampe Target:")
+        if target_price <= 0:
             st.info("Masukkan **Harga Target** yang valid (lebih dari 0) ya, Bos.")
+        elif berat_max_target <= 0 or berat_min_target > berat_max_target:
+            st.info("Atur **rentang berat** dulu ya, Bos (maksimal harus lebih dari 0 dan nggak lebih kecil dari minimal).")
+        else:
+            kombinasi = solve_target(lattice, target_price, berat_min_target, berat_max_target, MAX_TARGET_RESULTS)
+            if kombinasi:
+                if len(kombinasi) >= MAX_TARGET_RESULTS:
+                    st.caption(f"Ditampilkan {MAX_TARGET_RESULTS} kombinasi teringan. Persempit rentang beratnya buat lihat yang lain.")
+                st.dataframe({
+                    "Iwak": [k['fish'] for k in kombinasi],
+                    "Mutasi": [k['mutation'] or "Ga ada mutasi" for k in kombinasi],
+                    "Shiny": [k['shiny'] for k in kombinasi],
+                    "Sparkling": [k['sparkling'] for k in kombinasi],
+                    "Berat Ideal (kg)": [round(k['weight'], 2) for k in kombinasi],
+                }, use_container_width=True)
+            else:
+                st.warning("⚠️ Nggak ada kombinasi yang nyampe target di rentang berat ini.")
+        profiler.checkpoint("target.search")
+
+# --- Panel Debug (Tersembunyi, Cuma Muncul Kalau Profiler Nyala) ---
+if profiler.enabled:
+    with st.expander("🛠️ Debug: Waktu Per Bagian (p50/p95)"):
+        st.caption(f"Rerun terakhir: **{sum(profiler.durations.values()) * 1000:,.1f} ms** sampai panel ini. Statistik dari rerun-rerun sebelumnya.")
+        st.markdown("**Session ini**")
+        st.dataframe(profiler.session_stats.summary(), use_container_width=True)
+        st.markdown("**Semua session di proses ini**")
+        st.dataframe(process_stats.summary(), use_container_width=True)
+
+profiler.finish()
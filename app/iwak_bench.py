@@ -0,0 +1,613 @@
+# --- Benchmark Iwak ---
+# Ngukur jalur-jalur yang berat dengan katalog sintetis (1k/10k/100k iwak
+# dan mutasi): load/save storage, CRUD add/update/delete, build/copy katalog,
+# memori per session, cari nama, tabel katalog per halaman, rerun penuh vs
+# rerun fragment, pricing satuan & batch, dan solve berat ideal. Hasilnya
+# JSONL (satu baris per hasil), jadi
+# bisa dibandingin antar versi / antar commit buat nangkep regresi.
+#
+#   python iwak_bench.py --sizes 1000 10000 --label sekarang > hasil.jsonl
+#   python iwak_bench.py --only crud --app iwak_app-v2.py --label v2
+#   python iwak_bench.py --only crud --app iwak_app-v3.py --label v3
+#   python iwak_bench.py --only crud --backends json --write-behind 60
+#   python iwak_bench.py --only concurrency --sizes 1000 --threads 4 --processes 4
+#   python iwak_bench.py --only concurrency --sizes 1000 --backends json journal --write-behind 0.05
+#   python iwak_bench.py --only optimizer --sizes 1000 5000 10000
+#   python iwak_bench.py --only rerun --sizes 1000 10000 --repeat 30
+#
+# Seed random tetap (--seed), jadi katalog & data tangkapannya sama tiap jalan.
+import argparse
+import ast
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import numpy as np
+
+import iwak_storage
+from iwak_bulk import price_catch_rows
+from iwak_catalog import Catalog, RevisionConflict
+from iwak_lattice import MultiplierLattice
+from iwak_optimizer import best_value_for_capacity, best_value_for_slots, fewest_fish_for_quota, least_weight_for_quota
+from iwak_pricing import ideal_weight, price_catches, price_with_multiplier
+from iwak_search import CatalogSearch
+from iwak_solver import ReverseIndex, solve_target
+from iwak_table import CatalogTable
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "iwak_app.py")
+CRUD_FUNCTIONS = ("load_data", "save_data", "add_fish", "update_fish", "delete_fish",
+                  "add_mutation", "update_mutation", "delete_mutation")
+
+
+# --- Data Sintetis ---
+def make_catalog_data(size, seed=0):
+    rng = random.Random(seed)
+    return {
+        "version": 0,
+        "fish_types": [{"name": f"Iwak Sintetis {i:06d}", "leverage": round(rng.lognormvariate(0, 1.5), 3)} for i in range(size)],
+        "mutation_types": [{"name": f"Mutasi Sintetis {i:06d}", "leverage": round(rng.uniform(1, 15), 2)} for i in range(size)],
+    }
+
+def make_catch_rows(data, count, seed=0):
+    rng = random.Random(seed)
+    fish_names = [f['name'] for f in data['fish_types']]
+    mutation_names = [m['name'] for m in data['mutation_types']]
+    return [
+        {
+            "weight": rng.uniform(0.1, 500),
+            "fish": rng.choice(fish_names),
+            "mutation": rng.choice(mutation_names) if rng.random() < 0.3 else None,
+            "shiny": rng.random() < 0.1,
+            "sparkling": rng.random() < 0.1,
+        }
+        for _ in range(count)
+    ]
+
+
+# --- Helper Timing ---
+def measure(fn, repeat, items_per_call=1):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples_ms = np.array(samples) * 1000
+    total = float(np.sum(samples))
+    return {
+        "repeat": repeat,
+        "items": repeat * items_per_call,
+        "total_s": round(total, 6),
+        "mean_ms": round(float(samples_ms.mean()), 4),
+        "p50_ms": round(float(np.percentile(samples_ms, 50)), 4),
+        "p95_ms": round(float(np.percentile(samples_ms, 95)), 4),
+        "items_per_s": round(repeat * items_per_call / total, 1) if total > 0 else None,
+    }
+
+
+# --- Ambil Fungsi CRUD dari Script App (Tanpa Jalanin Streamlit) ---
+# Script app itu script Streamlit utuh, jadi yang diambil cuma import (selain
+# streamlit) + definisi fungsi CRUD-nya, dijalankan dengan st.session_state
+# palsu. Ini yang bikin v1/v2/v3/sekarang bisa dibandingin apple-to-apple.
+def load_app_crud(script_path, data_file):
+    with open(script_path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=script_path)
+
+    nodes = []
+    for node in tree.body:
+        if isinstance(node, ast.Import) and all(alias.name != "streamlit" for alias in node.names):
+            nodes.append(node)
+        elif isinstance(node, ast.ImportFrom) and node.module != "streamlit":
+            nodes.append(node)
+        elif isinstance(node, ast.FunctionDef) and node.name in CRUD_FUNCTIONS:
+            nodes.append(node)
+
+    namespace = {
+        "__name__": "iwak_bench_app",
+        "st": SimpleNamespace(session_state=SimpleNamespace()),
+        "DATA_FILE": data_file,
+    }
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script_path)))
+    try:
+        exec(compile(ast.Module(body=nodes, type_ignores=[]), script_path, "exec"), namespace)
+    finally:
+        sys.path.pop(0)
+
+    # Versi lama nyimpen katalog di st.session_state.data
+    if "load_data" in namespace:
+        namespace["st"].session_state.data = namespace["load_data"]()
+    return namespace
+
+
+# --- Skenario Benchmark ---
+# Tiap skenario: fungsi(size, args) -> list hasil (dict)
+def bench_storage(size, args):
+    results = []
+    data = make_catalog_data(size, args.seed)
+    for backend in args.backends:
+        workdir = tempfile.mkdtemp(prefix="iwak_bench_")
+        try:
+            path = os.path.join(workdir, "iwak_data.json")
+            iwak_storage.save_data(path, data)
+            if backend == "sqlite":
+                storage = iwak_storage.SqliteStorage(os.path.join(workdir, "iwak_data.sqlite3"), json_path=path)
+            else:
+                storage = iwak_storage.STORAGE_BACKENDS[backend](path)
+
+            results.append({"benchmark": "storage_load", "backend": backend,
+                            **measure(storage.load, args.repeat)})
+            if backend != "sqlite":
+                results.append({"benchmark": "storage_save_full", "backend": backend,
+                                **measure(lambda: iwak_storage.save_data(path, data), args.repeat)})
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+def bench_crud(size, args):
+    results = []
+    app_crud_uses_storage = "edit_shared_catalog" in open(args.app, encoding="utf-8").read()
+    backends = args.backends if app_crud_uses_storage else ["legacy"]
+    data = make_catalog_data(size, args.seed)
+
+    for backend in backends:
+        workdir = tempfile.mkdtemp(prefix="iwak_bench_")
+        old_mode = iwak_storage.STORAGE_MODE
+        old_delay = iwak_storage.WRITE_BEHIND_DELAY
+        write_behind = args.write_behind if backend in ("json", "journal") else 0
+        try:
+            path = os.path.join(workdir, "iwak_data.json")
+            iwak_storage.save_data(path, data)
+            if backend != "legacy":
+                iwak_storage.STORAGE_MODE = backend
+                iwak_storage.WRITE_BEHIND_DELAY = write_behind
+            app = load_app_crud(args.app, path)
+            if backend != "legacy":
+                iwak_storage.load_shared_catalog(path) # Warm-up: parse awal nggak ikut dihitung
+
+            counter = iter(range(10**9))
+            names = {}
+            def add():
+                i = next(counter)
+                names["add"] = f"Bench Iwak {i}"
+                app["add_fish"](names["add"], 1.5)
+            def update():
+                names["update"] = names["add"] + " v2"
+                app["update_fish"](names["add"], names["update"], 2.5)
+            def delete():
+                app["delete_fish"](names["update"])
+
+            samples = {"add_fish": [], "update_fish": [], "delete_fish": []}
+            for _ in range(args.crud_ops):
+                for op, fn in (("add_fish", add), ("update_fish", update), ("delete_fish", delete)):
+                    start = time.perf_counter()
+                    fn()
+                    samples[op].append(time.perf_counter() - start)
+
+            if write_behind:
+                # Edit yang masih ngantre ditulis sekali di sini (ikut diukur)
+                start = time.perf_counter()
+                iwak_storage.flush_storages()
+                samples["flush"] = [time.perf_counter() - start]
+
+            for op, values in samples.items():
+                values_ms = np.array(values) * 1000
+                results.append({
+                    "benchmark": f"crud_{op}", "backend": backend, "app": os.path.basename(args.app),
+                    "write_behind": write_behind,
+                    "repeat": len(values),
+                    "mean_ms": round(float(values_ms.mean()), 4),
+                    "p50_ms": round(float(np.percentile(values_ms, 50)), 4),
+                    "p95_ms": round(float(np.percentile(values_ms, 95)), 4),
+                })
+        finally:
+            iwak_storage.STORAGE_MODE = old_mode
+            iwak_storage.WRITE_BEHIND_DELAY = old_delay
+            iwak_storage._storages.clear()
+            iwak_storage._shared_catalogs.clear()
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+# --- Stress Test Edit Barengan (Thread + Proses) ---
+# Tiap worker ngulang: baca record "panas" (sedikit, biar sering bentrok),
+# naikin leverage-nya +1 pakai compare-and-swap (ulang kalau bentrok), plus
+# nambah satu record miliknya sendiri (nggak pernah bentrok, harus kegabung).
+# Di akhir dicek: total kenaikan leverage = jumlah update yang sukses, dan
+# semua record tambahan ada. Kalau ada yang hilang = ada edit yang ketimpa.
+STRESS_HOT_RECORDS = 4
+
+def _stress_worker(path, worker, ops, seed):
+    rng = random.Random(seed * 1000 + worker)
+    hot = [f"Iwak Sintetis {i:06d}" for i in range(STRESS_HOT_RECORDS)]
+    applied = conflicts = 0
+    for i in range(ops):
+        name = hot[rng.randrange(len(hot))]
+        while True:
+            record = iwak_storage.load_shared_catalog(path).fish.get(name)
+            try:
+                if iwak_storage.edit_shared_catalog(path, lambda c: c.fish.update(name, name, record.leverage + 1, record.revision)):
+                    applied += 1
+                    break
+            except RevisionConflict:
+                pass
+            conflicts += 1
+        while not iwak_storage.edit_shared_catalog(path, lambda c: c.fish.add(f"Stress {worker} {i}", 1.0)):
+            conflicts += 1
+    return applied, conflicts
+
+# Satu proses: `threads` worker barengan. Return (hasil per worker, edit
+# yang dibuang write-behind waktu flush karena bentrok sama proses lain).
+def _stress_threads(path, backend, write_behind, first_worker, threads, ops, seed):
+    if (iwak_storage.STORAGE_MODE, iwak_storage.WRITE_BEHIND_DELAY) != (backend, write_behind):
+        iwak_storage.STORAGE_MODE = backend
+        iwak_storage.WRITE_BEHIND_DELAY = write_behind
+        iwak_storage._storages.clear()
+        iwak_storage._shared_catalogs.clear()
+    results = [None] * threads
+    def run(k):
+        results[k] = _stress_worker(path, first_worker + k, ops, seed)
+    workers = [threading.Thread(target=run, args=(k,)) for k in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    iwak_storage.flush_storages()
+    storage = iwak_storage.get_storage(path)
+    return results, list(getattr(storage, "rejected", ()))
+
+def bench_concurrency(size, args):
+    results = []
+    data = make_catalog_data(max(size, STRESS_HOT_RECORDS), args.seed)
+    hot = data["fish_types"][:STRESS_HOT_RECORDS]
+    # Leverage awal dibulatkan biar penjumlahan +1 berkali-kali tetap pas
+    for record in hot:
+        record["leverage"] = float(round(record["leverage"]))
+    start_sum = sum(record["leverage"] for record in hot)
+    ops = args.crud_ops
+
+    for backend in args.backends:
+        workdir = tempfile.mkdtemp(prefix="iwak_bench_")
+        old_mode = iwak_storage.STORAGE_MODE
+        old_delay = iwak_storage.WRITE_BEHIND_DELAY
+        write_behind = args.write_behind if backend in ("json", "journal") else 0
+        try:
+            path = os.path.join(workdir, "iwak_data.json")
+            iwak_storage.save_data(path, data)
+            iwak_storage.STORAGE_MODE = backend
+            iwak_storage.WRITE_BEHIND_DELAY = 0
+            iwak_storage._storages.clear()
+            iwak_storage._shared_catalogs.clear()
+            iwak_storage.load_shared_catalog(path) # Bikin database / cache dulu
+
+            start = time.perf_counter()
+            # Proses "spawn" (bukan fork): proses baru bersih, tanpa lock/thread warisan
+            context = multiprocessing.get_context("spawn")
+            with context.Pool(args.processes) as pool:
+                pending = [
+                    pool.apply_async(_stress_threads, (path, backend, write_behind, (p + 1) * args.threads, args.threads, ops, args.seed))
+                    for p in range(args.processes)
+                ]
+                outcomes, rejected = _stress_threads(path, backend, write_behind, 0, args.threads, ops, args.seed)
+                for result in pending:
+                    more_outcomes, more_rejected = result.get()
+                    outcomes.extend(more_outcomes)
+                    rejected.extend(more_rejected)
+            elapsed = time.perf_counter() - start
+
+            workers = len(outcomes)
+            applied = sum(outcome[0] for outcome in outcomes)
+            conflicts = sum(outcome[1] for outcome in outcomes)
+            # Semua edit yang sudah dibilang sukses harus ada di hasil akhir,
+            # termasuk write-behind: yang dibuang waktu flush tetap dihitung hilang
+            iwak_storage.STORAGE_MODE = backend
+            iwak_storage.WRITE_BEHIND_DELAY = 0
+            iwak_storage._storages.clear()
+            iwak_storage._shared_catalogs.clear()
+            final = iwak_storage.get_storage(path).load() # Baca ulang langsung dari storage
+            hot_sum = sum(final.fish.get(record["name"]).leverage for record in hot)
+            missing = sum(
+                f"Stress {worker} {i}" not in final.fish for worker in range(workers) for i in range(ops)
+            )
+            results.append({
+                "benchmark": "concurrency_stress", "backend": backend, "write_behind": write_behind,
+                "threads": args.threads, "processes": args.processes + 1, "workers": workers,
+                "ops_per_worker": ops, "updates_applied": applied, "conflicts_retried": conflicts,
+                "rejected_on_flush": len(rejected),
+                "lost_updates": int(round(start_sum + applied - hot_sum)),
+                "lost_inserts": missing,
+                "ok": hot_sum == start_sum + applied and missing == 0,
+                "total_s": round(elapsed, 6),
+                "edits_per_s": round(2 * workers * ops / elapsed, 1),
+            })
+        finally:
+            iwak_storage.STORAGE_MODE = old_mode
+            iwak_storage.WRITE_BEHIND_DELAY = old_delay
+            iwak_storage._storages.clear()
+            iwak_storage._shared_catalogs.clear()
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+def bench_catalog(size, args):
+    data = make_catalog_data(size, args.seed)
+    snapshot = Catalog(data).freeze()
+    tracemalloc.start()
+    kept = Catalog(data)
+    catalog_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+
+    def scale():
+        snapshot.copy().fish.scale_leverages(1.1)
+
+    return [
+        {"benchmark": "catalog_build", "catalog_bytes": catalog_bytes, **measure(lambda: Catalog(data), args.repeat)},
+        {"benchmark": "catalog_copy", **measure(snapshot.copy, args.repeat)},
+        {"benchmark": "catalog_scale_leverages", **measure(scale, args.repeat)},
+    ]
+
+# --- Memori per Session ---
+# "session" di sini tiruan st.session_state: state widget + katalog yang
+# dipegang selama rerun. Dibandingin dua cara:
+#   shared    : semua session megang snapshot bersama (cara sekarang)
+#   deep_copy : tiap session punya salinan katalog sendiri (cara lama,
+#               st.session_state.data = load_data()); dilewati kalau totalnya
+#               lebih dari DEEP_COPY_LIMIT record, biar nggak makan RAM gila-gilaan
+# Plus berapa byte yang dialokasikan satu edit selama session lama masih
+# megang snapshot lama (copy-on-write: bagian yang nggak diubah dipakai bareng).
+SESSION_COUNTS = (1, 100, 1000)
+DEEP_COPY_LIMIT = 2_000_000
+
+def _session_state(catalog, fish_name, i):
+    return {
+        "catalog": catalog,
+        "active_page": "Hitung Iwak",
+        "calculator_main_fish_select": fish_name,
+        "calculator_shiny": bool(i % 2),
+        "num_berat_inputs": 1,
+        "berat_iwak_input_0": 1.5,
+    }
+
+def _traced(fn):
+    tracemalloc.start()
+    try:
+        kept = fn()
+        return tracemalloc.get_traced_memory()[0], kept
+    finally:
+        tracemalloc.stop()
+
+def bench_sessions(size, args):
+    results = []
+    data = make_catalog_data(size, args.seed)
+    workdir = tempfile.mkdtemp(prefix="iwak_bench_")
+    old_mode = iwak_storage.STORAGE_MODE
+    try:
+        path = os.path.join(workdir, "iwak_data.json")
+        iwak_storage.save_data(path, data)
+        raw = open(path, encoding="utf-8").read()
+        iwak_storage.STORAGE_MODE = "json"
+        iwak_storage._storages.clear()
+        iwak_storage._shared_catalogs.clear()
+        snapshot = iwak_storage.load_shared_catalog(path)
+        snapshot_bytes, _ = _traced(lambda: Catalog(data).freeze())
+        fish_names = snapshot.fish.names()
+
+        for count in SESSION_COUNTS:
+            total, sessions = _traced(lambda: [_session_state(iwak_storage.load_shared_catalog(path), fish_names[i % size], i) for i in range(count)])
+            results.append({"benchmark": "sessions_shared", "sessions": count, "total_bytes": total,
+                            "per_session_bytes": round(total / count), "snapshot_bytes": snapshot_bytes})
+            del sessions
+            if size * count <= DEEP_COPY_LIMIT:
+                total, sessions = _traced(lambda: [{**_session_state(snapshot, fish_names[i % size], i), "catalog": json.loads(raw)} for i in range(count)])
+                results.append({"benchmark": "sessions_deep_copy", "sessions": count, "total_bytes": total,
+                                "per_session_bytes": round(total / count), "snapshot_bytes": snapshot_bytes})
+                del sessions
+
+        # Satu edit selagi session lama masih megang snapshot lama
+        edits = {
+            "snapshot_edit_leverage": lambda c: c.fish.update("Iwak Sintetis 000000", "Iwak Sintetis 000000", 2.0),
+            "snapshot_edit_add": lambda c: c.fish.add("Iwak Baru", 1.0),
+            "snapshot_edit_delete": lambda c: c.mutations.delete("Mutasi Sintetis 000000"),
+        }
+        for name, edit in edits.items():
+            sessions = [_session_state(iwak_storage.load_shared_catalog(path), fish_names[i % size], i) for i in range(SESSION_COUNTS[-1])]
+            added, _ = _traced(lambda: (iwak_storage.edit_shared_catalog(path, edit), iwak_storage.load_shared_catalog(path))[1])
+            results.append({"benchmark": name, "sessions": len(sessions), "edit_bytes": added, "snapshot_bytes": snapshot_bytes,
+                            "shared_fraction": round(1 - added / snapshot_bytes, 4)})
+            # Rerun berikutnya: tiap session pindah ke snapshot baru, yang lama dilepas
+            for session in sessions:
+                session["catalog"] = iwak_storage.load_shared_catalog(path)
+            del sessions
+    finally:
+        iwak_storage.STORAGE_MODE = old_mode
+        iwak_storage._storages.clear()
+        iwak_storage._shared_catalogs.clear()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+def bench_search(size, args):
+    catalog = Catalog(make_catalog_data(size, args.seed)).freeze()
+    search = CatalogSearch(catalog)
+
+    def build():
+        CatalogSearch(catalog).search_fish("zz")
+
+    return [
+        {"benchmark": "search_build", **measure(build, args.repeat)},
+        {"benchmark": "search_prefix", **measure(lambda: search.search_fish("iwak sintetis 00"), args.repeat * 100)},
+        {"benchmark": "search_substring", **measure(lambda: search.search_fish("tetis 0042"), args.repeat * 100)},
+        {"benchmark": "search_typo", **measure(lambda: search.search_fish("sintetsi 00421"), args.repeat)},
+    ]
+
+def bench_table(size, args):
+    catalog = Catalog(make_catalog_data(size, args.seed)).freeze()
+    table = CatalogTable(catalog.fish)
+
+    def page(query, sort):
+        table._rows.clear() # Ukur filter + urut dari nol, bukan hasil cache
+        table._orders.clear()
+        table.page(query, sort, 3, 50)
+
+    return [
+        {"benchmark": "table_build", **measure(lambda: CatalogTable(catalog.fish), args.repeat)},
+        {"benchmark": "table_page_cached", **measure(lambda: table.page("", "name_asc", 3, 50), args.repeat * 100)},
+        {"benchmark": "table_page_sorted", **measure(lambda: page("", "leverage_desc"), args.repeat)},
+        {"benchmark": "table_page_filtered", **measure(lambda: page("tetis 004", "name_asc"), args.repeat)},
+    ]
+
+# --- Rerun Penuh vs Rerun Fragment (Grid Berat) ---
+# Ngisi satu berat di tab Hitung Iwak. Tanpa fragment seluruh script jalan
+# ulang; dengan fragment (grid_berat_iwak) cuma grid + TOTAL-nya. AppTest
+# selalu rerun penuh, jadi buat rerun fragment RerunData-nya diselipin
+# fragment_id_queue (sama kayak yang dikirim browser). script_* = waktu
+# script dari profiler app (?debug=1: "total" vs "fragment_total"); mean/
+# p50/p95 = wall per rerun, ikut overhead AppTest yang sama di dua-duanya.
+def bench_rerun(size, args):
+    from streamlit.testing.v1 import AppTest, local_script_runner
+
+    import iwak_profiler
+    from iwak_loadtest import prepare_app
+
+    workdir = tempfile.mkdtemp(prefix="iwak_bench_")
+    rerun_data = local_script_runner.RerunData
+    try:
+        script, _ = prepare_app(args.app, workdir, size, args.seed)
+        at = AppTest.from_file(script, default_timeout=60)
+        at.query_params["debug"] = "1"
+        at.run()
+        fish = at.selectbox(key="calculator_main_fish_select")
+        fish.set_value(fish.options[1]).run()
+        fragment_ids = list(at._fragment_storage._fragments)
+        if len(fragment_ids) != 1:
+            return [] # App versi lama (belum pakai fragment)
+
+        weights = iter(range(1, 10**9))
+        def rerun():
+            at.number_input(key="berat_iwak_input_0").set_value(float(next(weights) % 500)).run()
+        def fragment_rerun():
+            local_script_runner.RerunData = lambda **kwargs: rerun_data(fragment_id_queue=fragment_ids, **kwargs)
+            try:
+                rerun()
+            finally:
+                local_script_runner.RerunData = rerun_data
+
+        results = []
+        for benchmark, fn, total_name in (("rerun_full", rerun, "total"),
+                                          ("rerun_fragment", fragment_rerun, "fragment_total")):
+            iwak_profiler.process_stats._samples.clear()
+            result = {"benchmark": benchmark, "app": os.path.basename(args.app), **measure(fn, args.repeat)}
+            script_stats = next(row for row in iwak_profiler.process_stats.summary() if row["section"] == total_name)
+            result["script_p50_ms"] = script_stats["p50_ms"]
+            result["script_p95_ms"] = script_stats["p95_ms"]
+            results.append(result)
+        return results
+    finally:
+        local_script_runner.RerunData = rerun_data
+        iwak_storage._storages.clear()
+        iwak_storage._shared_catalogs.clear()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def bench_pricing(size, args):
+    data = make_catalog_data(size, args.seed)
+    catalog = Catalog(data)
+    lattice = MultiplierLattice(catalog)
+    rows = make_catch_rows(data, args.rows, args.seed)
+    rng = np.random.default_rng(args.seed)
+    weights = rng.uniform(0.1, 500, args.rows)
+    fish_lev = rng.lognormal(0, 1.5, args.rows)
+    mutation_lev = rng.uniform(1, 15, args.rows)
+    shiny = rng.random(args.rows) < 0.1
+    sparkling = rng.random(args.rows) < 0.1
+
+    def bulk():
+        for _ in price_catch_rows(rows, lattice):
+            pass
+
+    return [
+        {"benchmark": "price_single", **measure(lambda: price_catches(2.5, 150.0, 8.0, True, False), args.repeat * 100)},
+        {"benchmark": "price_batch_arrays", **measure(lambda: price_catches(weights, fish_lev, mutation_lev, shiny, sparkling), args.repeat, args.rows)},
+        {"benchmark": "price_batch_named_rows", **measure(bulk, args.repeat, args.rows)},
+        {"benchmark": "price_single_lattice", **measure(lambda: price_with_multiplier(2.5, lattice.multiplier(rows[0]["fish"], rows[0]["mutation"], True, False)), args.repeat * 100)},
+        {"benchmark": "lattice_build", "materialized": lattice.materialized, **measure(lambda: MultiplierLattice(catalog), args.repeat)},
+    ]
+
+def bench_ideal_weight(size, args):
+    lattice = MultiplierLattice(Catalog(make_catalog_data(size, args.seed)))
+    rng = np.random.default_rng(args.seed)
+    targets = rng.uniform(1e5, 1e7, args.rows)
+    fish_lev = rng.lognormal(0, 1.5, args.rows)
+    mutation_lev = rng.uniform(1, 15, args.rows)
+    return [
+        {"benchmark": "ideal_weight_single", **measure(lambda: ideal_weight(1e6, 150.0, 8.0, True, False), args.repeat * 100)},
+        {"benchmark": "ideal_weight_batch", **measure(lambda: ideal_weight(targets, fish_lev, mutation_lev, True, False), args.repeat, args.rows)},
+        {"benchmark": "target_search_index_build", **measure(lambda: ReverseIndex(lattice), args.repeat)},
+        {"benchmark": "target_search", **measure(lambda: solve_target(lattice, 1e6, 1.0, 1000.0), args.repeat)},
+    ]
+
+# Di sini `size` = jumlah iwak di inventory (bukan ukuran katalog)
+def bench_optimizer(size, args):
+    rng = np.random.default_rng(args.seed)
+    weights = np.round(rng.uniform(0.1, 50, size), 1)
+    prices = weights * rng.lognormal(3, 1, size)
+    quota = float(prices.sum()) * 0.1
+    return [
+        {"benchmark": "optimizer_fewest_fish", **measure(lambda: fewest_fish_for_quota(weights, prices, quota), args.repeat)},
+        {"benchmark": "optimizer_least_weight", **measure(lambda: least_weight_for_quota(weights, prices, quota), args.repeat)},
+        {"benchmark": "optimizer_capacity_500kg", **measure(lambda: best_value_for_capacity(weights, prices, 500.0), args.repeat)},
+        {"benchmark": "optimizer_slots_40", **measure(lambda: best_value_for_slots(weights, prices, 40), args.repeat)},
+    ]
+
+BENCHMARKS = {
+    "storage": bench_storage,
+    "crud": bench_crud,
+    "catalog": bench_catalog,
+    "sessions": bench_sessions,
+    "search": bench_search,
+    "table": bench_table,
+    "concurrency": bench_concurrency,
+    "rerun": bench_rerun,
+    "pricing": bench_pricing,
+    "ideal_weight": bench_ideal_weight,
+    "optimizer": bench_optimizer,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark iwak (output JSONL)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="jumlah iwak & mutasi di katalog sintetis")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="jalankan skenario tertentu saja")
+    parser.add_argument("--backends", nargs="+", default=["json", "journal", "sqlite"], choices=sorted(iwak_storage.STORAGE_BACKENDS))
+    parser.add_argument("--app", default=DEFAULT_APP, help="script app yang fungsi CRUD-nya dibenchmark")
+    parser.add_argument("--label", default="", help="label bebas buat membedakan hasil (misal nama versi / commit)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--crud-ops", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=4, help="thread per proses buat stress test concurrency")
+    parser.add_argument("--processes", type=int, default=2, help="proses tambahan buat stress test concurrency")
+    parser.add_argument("--write-behind", type=float, default=0, help="jeda write-behind (detik) buat backend json/journal di benchmark crud & concurrency")
+    parser.add_argument("--rows", type=int, default=100_000, help="jumlah tangkapan buat benchmark pricing")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="file JSONL output (default: stdout)")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for name in args.only or list(BENCHMARKS):
+            for size in args.sizes:
+                for result in BENCHMARKS[name](size, args):
+                    record = {"label": args.label, "size": size, **result,
+                              "python": sys.version.split()[0], "timestamp": time.time()}
+                    out.write(json.dumps(record) + "\n")
+                    out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
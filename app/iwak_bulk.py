@@ -0,0 +1,234 @@
+# --- Input Banyak Sekaligus (Bulk) ---
+# Baca ribuan tangkapan dari teks tempelan, CSV, JSON/JSONL, terus hitung
+# harganya per potongan (chunk) pakai mesin harga yang vectorized.
+# Semua fungsinya generator, jadi datanya ngalir baris demi baris dan
+# nggak perlu dimuat semua ke memori (dipakai juga buat CLI/API nanti).
+import csv
+import json
+import math
+import re
+from itertools import chain, islice
+
+import numpy as np
+
+from iwak_pricing import price_with_multiplier
+
+CHUNK_SIZE = 10_000
+
+# Nama kolom yang diterima (Inggris atau Indonesia)
+COLUMN_ALIASES = {
+    "weight": "weight", "berat": "weight", "kg": "weight",
+    "fish": "fish", "iwak": "fish", "ikan": "fish", "nama": "fish",
+    "mutation": "mutation", "mutasi": "mutation",
+    "shiny": "shiny",
+    "sparkling": "sparkling",
+}
+
+TRUE_VALUES = {"1", "true", "yes", "y", "ya", "x"}
+
+
+# --- Helper: Normalisasi Satu Baris ---
+# Angka yang nggak valid (termasuk "inf" / "nan") jadi NaN, nanti dapet catatan
+def parse_number(value):
+    if value is None or value == "":
+        return float("nan")
+    try:
+        number = float(value)
+    except (TypeError, ValueError, OverflowError):
+        return float("nan")
+    return number if math.isfinite(number) else float("nan")
+
+
+def _to_flag(value):
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def _to_name(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def normalize_row(raw):
+    row = {}
+    for key, value in raw.items():
+        # Jalur cepat: nama kolom sudah persis (kasus paling umum di file besar)
+        column = COLUMN_ALIASES.get(key) or COLUMN_ALIASES.get(str(key).strip().lower())
+        if column:
+            row[column] = value
+    return {
+        "weight": parse_number(row.get("weight")),
+        "fish": _to_name(row.get("fish")),
+        "mutation": _to_name(row.get("mutation")),
+        "shiny": _to_flag(row.get("shiny")),
+        "sparkling": _to_flag(row.get("sparkling")),
+    }
+
+
+# --- Pembaca Per Format ---
+# Teks tempelan: satu iwak per baris, "berat" atau "berat, iwak, mutasi".
+# Pemisahnya satu jenis per baris: tab, kalau nggak ada ";" , kalau nggak
+# ada juga baru ",". Jadi "1,5;Nama Ikan" = 1.5 kg (koma desimal), bukan
+# berat 1 iwak "5". Baris yang isinya cuma "1,5" juga dibaca 1.5 kg.
+DECIMAL_COMMA = re.compile(r"[+-]?\d+,\d+")
+
+def _split_text_line(line):
+    for separator in ("\t", ";"):
+        if separator in line:
+            return line.split(separator)
+    if DECIMAL_COMMA.fullmatch(line):
+        return [line]
+    return line.split(",")
+
+def read_text_rows(lines):
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = [p.strip() for p in _split_text_line(line)]
+        parts += [None] * (3 - len(parts))
+        weight = parts[0].replace(",", ".") if DECIMAL_COMMA.fullmatch(parts[0]) else parts[0]
+        yield normalize_row({"weight": weight, "fish": parts[1], "mutation": parts[2]})
+
+
+def read_csv_rows(lines):
+    for raw in csv.DictReader(lines):
+        yield normalize_row(raw)
+
+
+def read_jsonl_rows(lines):
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            raw = json.loads(line)
+        except json.JSONDecodeError:
+            raw = {}
+        if not isinstance(raw, dict):
+            raw = {"weight": raw}
+        yield normalize_row(raw)
+
+
+# File .json: array JSON biasa ([{...}, {...}], boleh pretty-print) dibaca
+# utuh; kalau karakter pertamanya bukan "[" berarti isinya JSONL.
+def read_json_rows(lines):
+    lines = iter(lines)
+    head = []
+    for line in lines:
+        head.append(line)
+        if line.strip():
+            break
+    if not "".join(head).lstrip().startswith("["):
+        yield from read_jsonl_rows(chain(head, lines))
+        return
+    try:
+        data = json.loads("".join(chain(head, lines)))
+    except json.JSONDecodeError:
+        data = [{}] # File-nya rusak: satu baris nggak valid (dapet catatan)
+    for raw in data:
+        if not isinstance(raw, dict):
+            raw = {"weight": raw}
+        yield normalize_row(raw)
+
+
+READERS = {
+    "text": read_text_rows,
+    "csv": read_csv_rows,
+    "jsonl": read_jsonl_rows,
+    "json": read_json_rows,
+}
+
+
+def guess_format(filename):
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if name.endswith(".json"):
+        return "json"
+    return "text"
+
+
+def read_catch_rows(lines, fmt="text"):
+    return READERS[fmt](lines)
+
+
+# --- Cari Pengali Per Baris ---
+# lattice: MultiplierLattice (iwak_lattice), lookup nama casefold O(1) terus
+# ambil pengalinya sekaligus dari tabel. Baris tanpa iwak/mutasi pakai
+# default dari pilihan di UI. Return array pengali (NaN buat baris yang
+# nggak valid) plus catatan per baris ("" = valid).
+def resolve_multipliers(rows, lattice, default_fish=None, default_mutation=None,
+                        is_shiny=False, is_sparkling=False):
+    # Diisi pakai list Python dulu (assign per elemen ke array NumPy lambat),
+    # baru diubah jadi array sekali di akhir
+    fish_rows = []
+    mutation_cols = []
+    shiny = []
+    sparkling = []
+    notes = []
+
+    with lattice.lock:
+        for row in rows:
+            fish_name = row["fish"] or default_fish
+            mutation_name = row["mutation"] or default_mutation
+            fish_row = lattice.fish_row(fish_name)
+            mutation_col = lattice.mutation_col(mutation_name)
+            fish_rows.append(fish_row)
+            mutation_cols.append(mutation_col)
+            shiny.append(is_shiny if row["shiny"] is None else row["shiny"])
+            sparkling.append(is_sparkling if row["sparkling"] is None else row["sparkling"])
+
+            if not fish_name:
+                notes.append("Iwak belum dipilih")
+            elif fish_row < 0:
+                notes.append(f"Iwak '{fish_name}' tidak ditemukan")
+            elif mutation_col < 0:
+                notes.append(f"Mutasi '{mutation_name}' tidak ditemukan")
+            else:
+                notes.append("")
+
+        valid = np.array([note == "" for note in notes], dtype=bool)
+        multipliers = np.full(len(notes), np.nan)
+        multipliers[valid] = lattice.multipliers(
+            np.array(fish_rows, dtype=np.intp)[valid],
+            np.array(mutation_cols, dtype=np.intp)[valid],
+            np.array(shiny, dtype=bool)[valid],
+            np.array(sparkling, dtype=bool)[valid],
+        )
+    return multipliers, notes
+
+
+# --- Hitung Harga Per Chunk ---
+# Baris yang iwaknya nggak dikenal atau beratnya nggak valid dapet harga 0 + catatan.
+def price_catch_rows(rows, lattice, default_fish=None, default_mutation=None,
+                     is_shiny=False, is_sparkling=False, chunk_size=CHUNK_SIZE):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+
+        multipliers, notes = resolve_multipliers(
+            chunk, lattice, default_fish, default_mutation, is_shiny, is_sparkling
+        )
+        weights = np.array([row["weight"] for row in chunk], dtype=float)
+        for i in np.flatnonzero(~((weights > 0) & np.isfinite(weights))):
+            if not notes[i]:
+                notes[i] = "Berat tidak valid"
+
+        with np.errstate(over="ignore", invalid="ignore"):
+            prices = price_with_multiplier(weights, multipliers)
+        # Berat kegedean bisa bikin harganya tembus inf: catat, jangan dikirim
+        for i in np.flatnonzero(~np.isfinite(prices)):
+            if not notes[i]:
+                notes[i] = "Harga di luar jangkauan"
+        valid = np.array([note == "" for note in notes], dtype=bool)
+        yield chunk, np.where(valid, prices, 0.0), notes
@@ -0,0 +1,425 @@
+# --- Katalog Iwak & Mutasi ---
+# Bungkus list {"name": ..., "leverage": ...} dari iwak_data.json jadi objek
+# yang punya index nama (casefold) -> posisi. Cek duplikat dan cari leverage
+# jadi O(1), nggak perlu any(...) / loop for ke seluruh list tiap rerun.
+# Index-nya selalu ikut diupdate di add/update/delete, jadi nggak bakal basi.
+#
+# Isinya disimpan per kolom (bukan list dict): nama di satu list, leverage
+# di satu array float NumPy yang nyambung. Jauh lebih hemat memori daripada
+# satu dict per record, array leverage-nya bisa langsung dikasih ke mesin
+# harga tanpa disalin (section.leverages), dan hitungan satu kolom (misal
+# scale_leverages) cukup satu operasi NumPy. Yang butuh objek per record
+# dapet CatalogRecord (pakai __slots__, bisa record['name'] kayak dict).
+#
+# Katalog bisa di-freeze jadi snapshot read-only yang dipakai bareng semua
+# session (lihat iwak_storage). Mau ngedit? copy() dulu, edit, terus simpan.
+# copy() itu copy-on-write: salinannya awalnya pakai bareng kolom, index, dan
+# urutan A-Z snapshot-nya; struktur baru disalin waktu pertama kali diubah,
+# dan cuma yang memang diubah. Edit satu iwak nggak nyalin section mutasi
+# sama sekali, ganti leverage doang nggak nyalin nama/index/urutan A-Z.
+# Tiap edit juga dicatat di catalog.changes, jadi penyimpanan bisa nulis
+# perubahannya aja (journal) tanpa nulis ulang seluruh katalog.
+#
+# Tiap record punya nomor revisi (naik tiap update, mulai dari 1), dan
+# update/delete bisa dikasih expected_revision: kalau record-nya sudah
+# diubah orang lain duluan, editnya ditolak (RevisionConflict), bukan
+# nimpa diam-diam. Revisi asal tiap edit ikut dicatat di catalog.changes
+# ("base_revision"), jadi storage bisa nge-merge edit dari proses lain per
+# record (record beda = digabung, record sama = ditolak).
+#
+# Tiap section juga nyimpen urutan nama A-Z (case-insensitive) yang
+# di-maintain pakai bisect tiap add/update/delete, jadi selectbox & tabel
+# tinggal baca sorted_names() / sorted_records() tanpa sort tiap rerun.
+from bisect import bisect_left, insort
+
+import numpy as np
+
+
+def _sort_key(name):
+    # Urut huruf kecil dulu, nama asli buat pemecah seri (biar urutannya pasti)
+    return (name.lower(), name)
+
+def _to_leverage(value):
+    return np.nan if value is None else float(value)
+
+
+class RevisionConflict(Exception):
+    # Record-nya sudah diubah/dihapus duluan sejak dibaca (compare-and-swap gagal)
+    def __init__(self, section, name, expected, actual):
+        super().__init__(f"{name}: expected revision {expected}, found {actual}")
+        self.section = section
+        self.name = name
+        self.expected = expected
+        self.actual = actual
+
+
+# --- View Satu Record (Tanpa Dict per Record) ---
+# Baca langsung dari kolom section-nya. Cuma valid selama section-nya
+# nggak diedit (snapshot yang di-freeze aman dipegang selamanya).
+class CatalogRecord:
+    __slots__ = ("_section", "_position")
+
+    def __init__(self, section, position):
+        self._section = section
+        self._position = position
+
+    @property
+    def name(self):
+        return self._section._names[self._position]
+
+    @property
+    def leverage(self):
+        value = float(self._section._leverages[self._position])
+        return None if value != value else value
+
+    @property
+    def revision(self):
+        return int(self._section._revisions[self._position])
+
+    # Biar kode lama yang pakai record['name'] / record['leverage'] tetap jalan
+    def __getitem__(self, field):
+        if field == "name":
+            return self.name
+        if field == "leverage":
+            return self.leverage
+        if field == "revision":
+            return self.revision
+        raise KeyError(field)
+
+    def to_dict(self):
+        return {"name": self.name, "leverage": self.leverage, "revision": self.revision}
+
+    def __repr__(self):
+        return f"CatalogRecord(name={self.name!r}, leverage={self.leverage!r}, revision={self.revision!r})"
+
+
+class CatalogSection:
+    def __init__(self, records=(), key=None, changes=None):
+        self.key = key
+        self.frozen = False
+        self._changes = changes
+        # Kolom: _names[i] (None = slot sudah dihapus), _leverages[i] dan
+        # _revisions[i] (kapasitasnya bisa lebih dari _size). Urutan slot =
+        # urutan insert.
+        self._names = []
+        self._leverages = np.empty(0)
+        self._revisions = np.empty(0, dtype=np.int64)
+        self._size = 0
+        self._dead = 0
+        # Dict casefold-name -> posisi slot
+        self._index = {}
+        # Nama atribut struktur yang masih dipakai bareng section lain
+        # (hasil copy()); wajib _own() dulu sebelum diubah
+        self._borrowed = set()
+        names = []
+        leverages = []
+        revisions = []
+        for record in records:
+            key_name = record['name'].casefold()
+            if key_name in self._index:
+                continue
+            self._index[key_name] = len(names)
+            names.append(record['name'])
+            leverages.append(_to_leverage(record['leverage']))
+            revisions.append(record.get('revision') or 1)
+        self._names = names
+        self._leverages = np.array(leverages, dtype=float)
+        self._revisions = np.array(revisions, dtype=np.int64)
+        self._size = len(names)
+        # List _sort_key(nama) yang selalu urut (disisipkan pakai bisect)
+        self._sorted = sorted(_sort_key(name) for name in names)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __iter__(self):
+        for position, name in enumerate(self._names[:self._size]):
+            if name is not None:
+                yield CatalogRecord(self, position)
+
+    def __contains__(self, name):
+        return bool(name) and name.casefold() in self._index
+
+    def get(self, name):
+        if not name:
+            return None
+        position = self._index.get(name.casefold())
+        return CatalogRecord(self, position) if position is not None else None
+
+    def leverage_of(self, name, default=1.0):
+        record = self.get(name)
+        return record['leverage'] if record is not None else default
+
+    def names(self):
+        return [name for name in self._names[:self._size] if name is not None]
+
+    # --- Akses Kolom (Tanpa Salin) ---
+    # Array leverage per slot, read-only. Slot yang sudah dihapus isinya NaN
+    # dan namanya None; snapshot hasil freeze() nggak punya slot kosong,
+    # jadi urutannya sama persis kayak names().
+    @property
+    def leverages(self):
+        view = self._leverages[:self._size]
+        view.flags.writeable = False
+        return view
+
+    # Posisi slot buat nama-nama ini (-1 kalau nggak ada), buat ambil
+    # leverage-nya sekaligus: section.leverages[posisi]
+    def positions(self, names):
+        return np.array([self._index.get(name.casefold(), -1) if name else -1 for name in names], dtype=np.intp)
+
+    # Nama / record urut A-Z (case-insensitive), tanpa sort ulang
+    def sorted_names(self):
+        return [name for _, name in self._sorted]
+
+    # Nama yang diawali `prefix` (case-insensitive), urut A-Z, maksimal
+    # `limit`: binary search ke urutan A-Z, jadi nggak nyapu semua nama
+    def prefixed_names(self, prefix, limit=None):
+        prefix = prefix.lower()
+        names = []
+        for i in range(bisect_left(self._sorted, (prefix,)), len(self._sorted)):
+            lower, name = self._sorted[i]
+            if not lower.startswith(prefix) or (limit is not None and len(names) >= limit):
+                break
+            names.append(name)
+        return names
+
+    def sorted_records(self):
+        return [CatalogRecord(self, self._index[name.casefold()]) for _, name in self._sorted]
+
+    # Posisi slot tiap nama dalam urutan A-Z (buat ambil kolom mana pun urut A-Z)
+    def sorted_positions(self):
+        return np.array([self._index[name.casefold()] for _, name in self._sorted], dtype=np.intp)
+
+    # Format kolom buat st.dataframe: {"name": [...], "leverage": [...]} urut A-Z
+    def sorted_columns(self):
+        return {"name": self.sorted_names(), "leverage": self._leverages[self.sorted_positions()]}
+
+    def _unsort(self, name):
+        del self._sorted[bisect_left(self._sorted, _sort_key(name))]
+
+    def _check_writable(self):
+        if self.frozen:
+            raise TypeError("catalog snapshot is read-only, copy() it first")
+
+    # Salin struktur yang mau diubah kalau masih dipakai bareng (copy-on-write)
+    def _own(self, *fields):
+        for field in fields:
+            if field in self._borrowed:
+                value = getattr(self, field)
+                setattr(self, field, value.copy())
+                self._borrowed.discard(field)
+
+    def _log(self, change):
+        if self._changes is not None:
+            self._changes.append({"section": self.key, **change})
+
+    def _append(self, name, leverage, revision=1):
+        if self._size == len(self._leverages):
+            capacity = max(16, self._size * 2)
+            leverages = np.empty(capacity)
+            leverages[:self._size] = self._leverages[:self._size]
+            self._leverages = leverages
+            revisions = np.empty(capacity, dtype=np.int64)
+            revisions[:self._size] = self._revisions[:self._size]
+            self._revisions = revisions
+        position = self._size
+        if position < len(self._names):
+            self._names[position] = name
+        else:
+            self._names.append(name)
+        self._leverages[position] = _to_leverage(leverage)
+        self._revisions[position] = revision
+        self._size += 1
+        return position
+
+    def _kill(self, position):
+        self._names[position] = None
+        self._leverages[position] = np.nan
+        self._dead += 1
+
+    def _check_revision(self, name, position, expected_revision):
+        actual = int(self._revisions[position]) if position is not None else None
+        if expected_revision is not None and expected_revision != actual:
+            raise RevisionConflict(self.key, name, expected_revision, actual)
+        return actual
+
+    # --- CRUD (return True/False, pesan buat UI diurus pemanggil) ---
+    # expected_revision (opsional) = revisi record waktu dibaca; kalau sudah
+    # beda (atau record-nya sudah hilang) -> RevisionConflict
+    def add(self, name, leverage):
+        self._check_writable()
+        key = name.casefold()
+        if key in self._index:
+            return False
+        self._own("_names", "_leverages", "_revisions", "_index", "_sorted")
+        self._index[key] = self._append(name, leverage)
+        insort(self._sorted, _sort_key(name))
+        self._log({"op": "add", "name": name, "leverage": leverage})
+        return True
+
+    def update(self, old_name, new_name, new_leverage, expected_revision=None):
+        self._check_writable()
+        old_key = old_name.casefold()
+        position = self._index.get(old_key)
+        revision = self._check_revision(old_name, position, expected_revision)
+        if position is None:
+            return False
+        new_key = new_name.casefold()
+        if new_key != old_key and new_key in self._index:
+            raise ValueError(f"duplicate name: {new_name}")
+        if new_key != old_key:
+            # Ganti nama = pindah ke paling belakang (kayak hapus + tambah)
+            self._own("_names", "_leverages", "_revisions", "_index", "_sorted")
+            self._unsort(self._names[position])
+            del self._index[old_key]
+            self._kill(position)
+            self._index[new_key] = self._append(new_name, new_leverage, revision + 1)
+            insort(self._sorted, _sort_key(new_name))
+        else:
+            self._own("_leverages", "_revisions")
+            if self._names[position] != new_name:
+                # Cuma beda huruf besar/kecil: posisi A-Z-nya bisa geser dikit
+                self._own("_names", "_sorted")
+                self._unsort(self._names[position])
+                self._names[position] = new_name
+                insort(self._sorted, _sort_key(new_name))
+            self._leverages[position] = _to_leverage(new_leverage)
+            self._revisions[position] = revision + 1
+        self._log({"op": "update", "old_name": old_name, "name": new_name, "leverage": new_leverage,
+                   "base_revision": revision})
+        return True
+
+    def delete(self, name, expected_revision=None):
+        self._check_writable()
+        position = self._index.get(name.casefold())
+        revision = self._check_revision(name, position, expected_revision)
+        if position is None:
+            return False
+        self._own("_names", "_leverages", "_index", "_sorted")
+        del self._index[name.casefold()]
+        self._unsort(self._names[position])
+        self._kill(position)
+        self._log({"op": "delete", "name": name, "base_revision": revision})
+        return True
+
+    # Kalikan SEMUA leverage sekaligus (satu operasi NumPy), revisi semua record ikut naik
+    def scale_leverages(self, factor):
+        self._check_writable()
+        self._own("_leverages", "_revisions")
+        self._leverages[:self._size] *= factor
+        self._revisions[:self._size] += 1
+        self._log({"op": "scale", "factor": factor})
+        return True
+
+    def to_list(self):
+        return [record.to_dict() for record in self]
+
+    # Posisi slot yang masih hidup (urutan insert)
+    def _live(self):
+        if not self._dead:
+            return slice(0, self._size)
+        return [position for position, name in enumerate(self._names[:self._size]) if name is not None]
+
+    # Kolom rapat tanpa slot kosong: {"name": [...], "leverage": array, "revision": array}
+    # (leverage None jadi NaN). Snapshot beku: leverage-nya view, bukan salinan.
+    def columns(self):
+        live = self._live()
+        if isinstance(live, slice):
+            return {"name": self._names[live], "leverage": self.leverages, "revision": self._revisions[live]}
+        return {"name": [self._names[position] for position in live], "leverage": self._leverages[live],
+                "revision": self._revisions[live]}
+
+    # Buang slot yang sudah dihapus (urutan tetap), posisi di index ikut disusun ulang
+    def _compact(self):
+        if not self._dead:
+            return
+        columns = self.columns()
+        self._names = columns["name"]
+        self._leverages = columns["leverage"]
+        self._revisions = columns["revision"]
+        self._size = len(self._names)
+        self._dead = 0
+        self._index = {name.casefold(): position for position, name in enumerate(self._names)}
+        self._borrowed.clear() # Semua struktur di atas baru
+
+    def freeze(self):
+        self._compact()
+        self.frozen = True
+        return self
+
+    # Salinan yang bisa diedit (copy-on-write): kolom, index & urutan A-Z
+    # dipakai bareng, baru disalin waktu diubah (lihat _own). Slot kosong
+    # dibuang; kalau ada slot kosong, kolomnya memang harus dirakit ulang.
+    def copy(self, changes=None):
+        section = CatalogSection(key=self.key, changes=changes)
+        if self._dead:
+            columns = self.columns()
+            section._names = list(columns["name"])
+            section._leverages = np.array(columns["leverage"], dtype=float)
+            section._revisions = np.array(columns["revision"], dtype=np.int64)
+            section._index = {name.casefold(): position for position, name in enumerate(section._names)}
+            section._sorted = list(self._sorted)
+        else:
+            shared = ("_names", "_leverages", "_revisions", "_index", "_sorted")
+            for field in shared:
+                setattr(section, field, getattr(self, field))
+            # Dua-duanya nggak boleh ngubah di tempat lagi (aslinya juga,
+            # kalau aslinya bukan snapshot beku)
+            section._borrowed.update(shared)
+            self._borrowed.update(shared)
+        section._size = len(self) if self._dead else self._size
+        return section
+
+
+class Catalog:
+    def __init__(self, data=None):
+        data = data or {}
+        # Counter versi, naik tiap kali katalog disimpan
+        self.version = data.get('version', 0)
+        # Daftar perubahan sejak katalog ini dibuat/di-copy
+        self.changes = []
+        self.fish = CatalogSection(data.get('fish_types', []), 'fish_types', self.changes)
+        self.mutations = CatalogSection(data.get('mutation_types', []), 'mutation_types', self.changes)
+
+    @property
+    def frozen(self):
+        return self.fish.frozen
+
+    def freeze(self):
+        self.fish.freeze()
+        self.mutations.freeze()
+        return self
+
+    def section(self, key):
+        return self.fish if key == 'fish_types' else self.mutations
+
+    # Jalankan ulang satu perubahan dari catalog.changes (buat replay journal
+    # / merge edit proses lain). Revisi asalnya dicek: RevisionConflict kalau
+    # record-nya sudah diubah sejak edit itu dibuat.
+    def apply_change(self, change):
+        section = self.section(change['section'])
+        if change['op'] == "add":
+            return section.add(change['name'], change['leverage'])
+        if change['op'] == "update":
+            return section.update(change['old_name'], change['name'], change['leverage'], change.get('base_revision'))
+        if change['op'] == "delete":
+            return section.delete(change['name'], change.get('base_revision'))
+        if change['op'] == "scale":
+            return section.scale_leverages(change['factor'])
+        raise ValueError(f"unknown catalog change: {change['op']}")
+
+    # Salinan yang bisa diedit (snapshot aslinya tetap utuh)
+    def copy(self):
+        copied = Catalog({"version": self.version})
+        copied.fish = self.fish.copy(copied.changes)
+        copied.mutations = self.mutations.copy(copied.changes)
+        return copied
+
+    # Format yang sama persis dengan iwak_data.json (plus counter versi & revisi per record)
+    def to_dict(self):
+        return {
+            "version": self.version,
+            "fish_types": self.fish.to_list(),
+            "mutation_types": self.mutations.to_list(),
+        }
@@ -0,0 +1,219 @@
+# --- Import / Export Katalog Sekaligus ---
+# Habis patch game biasanya ada ratusan iwak & mutasi baru / berubah. Dulu
+# harus add_fish / update_fish satu-satu, dan TIAP panggilan nulis ulang
+# seluruh katalog. Di sini semua baris divalidasi dulu, terus di-upsert
+# (tambah kalau belum ada, update kalau sudah ada) dalam SATU edit katalog:
+# satu kali commit ke storage (satu tulis file / satu baris journal / satu
+# transaksi SQLite), satu snapshot baru.
+#
+#   report = import_catalog(DATA_FILE, read_catalog_rows(f, "csv"))
+#   report -> {"committed", "version", "inserted", "updated", "unchanged", "rejected"}
+#
+# Format input (lihat read_catalog_rows):
+#   csv   : kolom section,name,leverage (section: fish/iwak/ikan atau mutation/mutasi)
+#   jsonl : satu object {"section": ..., "name": ..., "leverage": ...} per baris
+#   json  : format iwak_data.json ({"fish_types": [...], "mutation_types": [...]})
+#
+# Export-nya kebalikannya, ditulis per baris (generator), jadi katalog
+# segede apa pun nggak perlu dirakit jadi satu string besar dulu.
+import csv
+import io
+import json
+import math
+
+from iwak_storage import edit_shared_catalog, load_shared_catalog
+
+EXPORT_FORMATS = ("jsonl", "csv", "json")
+
+# Nama kolom & nama section yang diterima (Inggris atau Indonesia)
+COLUMN_ALIASES = {
+    "section": "section", "type": "section", "jenis": "section",
+    "name": "name", "nama": "name",
+    "leverage": "leverage", "lev": "leverage",
+}
+
+SECTION_ALIASES = {
+    "fish": "fish_types", "fish_types": "fish_types", "iwak": "fish_types", "ikan": "fish_types",
+    "mutation": "mutation_types", "mutation_types": "mutation_types", "mutasi": "mutation_types",
+}
+
+SECTION_LABELS = {"fish_types": "fish", "mutation_types": "mutation"}
+
+
+# --- Normalisasi Satu Baris ---
+# Return {"line", "section", "name", "leverage", "error"}; error "" = valid.
+def normalize_catalog_row(raw, line=None, default_section=None):
+    row = {}
+    for key, value in raw.items():
+        column = COLUMN_ALIASES.get(str(key).strip().lower())
+        if column:
+            row[column] = value
+
+    section_value = row.get("section") or default_section
+    section = SECTION_ALIASES.get(str(section_value).strip().lower()) if section_value else None
+    name = str(row["name"]).strip() if row.get("name") is not None else ""
+    try:
+        leverage = float(row.get("leverage"))
+    except (TypeError, ValueError):
+        leverage = None
+
+    error = ""
+    if section is None:
+        error = f"Section '{section_value}' tidak dikenal" if section_value else "Section kosong"
+    elif not name:
+        error = "Nama kosong"
+    elif leverage is None or not math.isfinite(leverage):
+        error = "Leverage tidak valid"
+    elif leverage < 0:
+        error = "Leverage tidak boleh negatif"
+    return {"line": line, "section": section, "name": name, "leverage": leverage, "error": error}
+
+
+# --- Pembaca Per Format ---
+def read_csv_catalog_rows(lines):
+    # Baris 1 = header, jadi data mulai dari baris 2
+    for line, raw in enumerate(csv.DictReader(lines), start=2):
+        yield normalize_catalog_row(raw, line)
+
+
+def read_jsonl_catalog_rows(lines):
+    for line, text in enumerate(lines, start=1):
+        text = text.strip()
+        if not text:
+            continue
+        try:
+            raw = json.loads(text)
+        except json.JSONDecodeError:
+            raw = None
+        if not isinstance(raw, dict):
+            yield {"line": line, "section": None, "name": "", "leverage": None, "error": "Bukan object JSON"}
+            continue
+        yield normalize_catalog_row(raw, line)
+
+
+def read_json_catalog_rows(lines):
+    data = json.loads("".join(lines))
+    if not isinstance(data, dict):
+        raise ValueError("file JSON harus berformat iwak_data.json")
+    line = 0
+    for section in ("fish_types", "mutation_types"):
+        for raw in data.get(section, []):
+            line += 1 # Untuk JSON: nomor urut record, bukan nomor baris file
+            if not isinstance(raw, dict):
+                yield {"line": line, "section": section, "name": "", "leverage": None, "error": "Bukan object JSON"}
+                continue
+            yield normalize_catalog_row(raw, line, section)
+
+
+READERS = {
+    "csv": read_csv_catalog_rows,
+    "jsonl": read_jsonl_catalog_rows,
+    "json": read_json_catalog_rows,
+}
+
+
+def guess_catalog_format(filename):
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return "json"
+
+
+def read_catalog_rows(lines, fmt="csv"):
+    return READERS[fmt](lines)
+
+
+# --- Upsert ke Katalog (Salinan yang Bisa Diedit) ---
+def _entry(row, **extra):
+    return {"line": row["line"], "section": SECTION_LABELS.get(row["section"], row["section"]), "name": row["name"], **extra}
+
+def upsert_catalog_rows(catalog, rows):
+    report = {"inserted": [], "updated": [], "unchanged": [], "rejected": []}
+    seen = set()
+    for row in rows:
+        if row["error"]:
+            report["rejected"].append(_entry(row, reason=row["error"]))
+            continue
+        key = (row["section"], row["name"].casefold())
+        if key in seen:
+            # Nama yang sama dua kali di satu file: ambil yang pertama, sisanya ditolak
+            report["rejected"].append(_entry(row, reason="Nama dobel di file import"))
+            continue
+        seen.add(key)
+
+        section = catalog.section(row["section"])
+        record = section.get(row["name"])
+        if record is None:
+            section.add(row["name"], row["leverage"])
+            report["inserted"].append(_entry(row, leverage=row["leverage"]))
+        elif record.name == row["name"] and record.leverage == row["leverage"]:
+            report["unchanged"].append(_entry(row, leverage=row["leverage"]))
+        else:
+            old_name, old_leverage = record.name, record.leverage
+            section.update(old_name, row["name"], row["leverage"])
+            report["updated"].append(_entry(row, leverage=row["leverage"], old_name=old_name, old_leverage=old_leverage))
+    return report
+
+
+# --- Import Lewat Storage Bersama (Satu Commit) ---
+# all_or_nothing=True: kalau ada satu baris saja yang ditolak, nggak ada
+# yang disimpan. dry_run=True: cuma validasi + laporan, nggak disimpan.
+def import_catalog(path, rows, all_or_nothing=False, dry_run=False):
+    rows = list(rows) # Parsing & validasi di luar lock storage
+    result = {}
+
+    def edit(catalog):
+        result.update(upsert_catalog_rows(catalog, rows))
+        if dry_run or (all_or_nothing and result["rejected"]):
+            return False
+        return bool(catalog.changes)
+
+    changed = edit_shared_catalog(path, edit)
+    has_changes = bool(result["inserted"] or result["updated"])
+    would_commit = has_changes and not dry_run and not (all_or_nothing and result["rejected"])
+    # edit_shared_catalog juga return False kalau storage nolak commit-nya
+    # (bentrok sama proses lain)
+    result["committed"] = bool(changed) if would_commit else False
+    result["version"] = load_shared_catalog(path).version
+    return result
+
+
+# --- Export (Streaming, Per Baris) ---
+def iter_catalog_export(catalog, fmt="jsonl"):
+    sections = (("fish_types", catalog.fish), ("mutation_types", catalog.mutations))
+    if fmt == "jsonl":
+        for key, section in sections:
+            for record in section:
+                yield json.dumps({"section": SECTION_LABELS[key], "name": record.name, "leverage": record.leverage}, ensure_ascii=False) + "\n"
+    elif fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(["section", "name", "leverage"])
+        for key, section in sections:
+            for record in section:
+                writer.writerow([SECTION_LABELS[key], record.name, "" if record.leverage is None else record.leverage])
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    elif fmt == "json":
+        # Format iwak_data.json, tapi ditulis per record
+        yield "{\n" + f'    "version": {catalog.version}'
+        for key, section in sections:
+            yield f',\n    "{key}": ['
+            for i, record in enumerate(section):
+                yield ("," if i else "") + "\n        " + json.dumps(record.to_dict(), ensure_ascii=False)
+            yield "\n    ]"
+        yield "\n}\n"
+    else:
+        raise ValueError(f"unknown export format: {fmt}")
+
+
+def export_catalog(path, out, fmt="jsonl"):
+    # Pakai snapshot beku: edit di tengah export nggak ikut kebawa
+    catalog = load_shared_catalog(path)
+    for chunk in iter_catalog_export(catalog, fmt):
+        out.write(chunk)
+    return catalog.version
@@ -0,0 +1,178 @@
+# --- CLI Harga Iwak (Batch, Streaming) ---
+# Buat ngitung ulang log tangkapan yang isinya jutaan baris (misal habis
+# patch game), tanpa lewat UI. Rumus & katalognya sama kayak tab "Hitung Iwak".
+#
+#   python iwak_cli.py price catches.jsonl > priced.jsonl
+#   cat catches.csv | python iwak_cli.py price --format csv --workers 4
+#   python iwak_cli.py import patch.csv [--dry-run] [--all-or-nothing]
+#   python iwak_cli.py export --format csv > katalog.csv
+#
+# Input dibaca per chunk dan hasilnya langsung ditulis ke stdout, jadi
+# memori tetap konstan berapa pun besar filenya. --workers N bagi chunk ke
+# process pool (urutan output tetap sama kayak input).
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+
+from iwak_bulk import CHUNK_SIZE, guess_format, normalize_row, price_catch_rows, read_catch_rows
+from iwak_catalog_io import EXPORT_FORMATS, export_catalog, guess_catalog_format, import_catalog, read_catalog_rows
+from iwak_storage import load_shared_lattice
+
+DEFAULT_DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "iwak_data.json")
+
+
+# --- Baca Input Per Chunk ---
+# Yang dikirim ke worker masih bentuk mentah (baris teks / baris CSV), biar
+# parsing-nya juga ikut kebagi ke process pool.
+def read_chunks(stream, fmt, chunk_size=CHUNK_SIZE):
+    if fmt == "csv":
+        reader = csv.reader(stream)
+        header = next(reader, None)
+        if header is None:
+            return
+        while True:
+            chunk = list(islice(reader, chunk_size))
+            if not chunk:
+                return
+            yield (fmt, header, chunk)
+    elif fmt == "json":
+        # Array JSON nggak bisa dipotong per baris: di-parse utuh di sini,
+        # worker dapet baris yang sudah dinormalisasi
+        rows = read_catch_rows(stream, fmt)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield ("rows", None, chunk)
+    else:
+        while True:
+            chunk = list(islice(stream, chunk_size))
+            if not chunk:
+                return
+            yield (fmt, None, chunk)
+
+
+# --- Worker: Hitung Harga Satu Chunk, Return Teks JSONL ---
+_worker_state = {}
+
+def init_worker(data_file, defaults):
+    _worker_state["data_file"] = data_file
+    _worker_state["defaults"] = defaults
+
+def price_chunk(payload):
+    fmt, header, lines = payload
+    if fmt == "csv":
+        rows = [normalize_row(dict(zip(header, values))) for values in lines]
+    elif fmt == "rows":
+        rows = lines
+    else:
+        rows = list(read_catch_rows(lines, fmt))
+
+    lattice = load_shared_lattice(_worker_state["data_file"])
+    defaults = _worker_state["defaults"]
+    output = []
+    for chunk, prices, notes in price_catch_rows(
+        rows, lattice,
+        defaults["fish"], defaults["mutation"], defaults["shiny"], defaults["sparkling"],
+        chunk_size=max(len(rows), 1)
+    ):
+        for row, price, note in zip(chunk, prices.tolist(), notes):
+            record = dict(row)
+            if record["weight"] != record["weight"]: # NaN bukan JSON valid
+                record["weight"] = None
+            record["price"] = price
+            record["note"] = note
+            output.append(json.dumps(record, ensure_ascii=False))
+    return "\n".join(output) + "\n" if output else ""
+
+
+# --- Jalankan Pricing Dari Stream ke Stream ---
+def price_stream(stream, out, data_file=DEFAULT_DATA_FILE, fmt="jsonl",
+                 chunk_size=CHUNK_SIZE, workers=1, defaults=None):
+    defaults = {"fish": None, "mutation": None, "shiny": False, "sparkling": False, **(defaults or {})}
+    chunks = read_chunks(stream, fmt, chunk_size)
+
+    if workers <= 1:
+        init_worker(data_file, defaults)
+        for payload in chunks:
+            out.write(price_chunk(payload))
+        return
+
+    # Maksimal workers*2 chunk yang lagi diproses, biar memori nggak numpuk
+    # (Pool.imap bakal nyedot seluruh input duluan)
+    with Pool(workers, initializer=init_worker, initargs=(data_file, defaults)) as pool:
+        in_flight = deque()
+        for payload in chunks:
+            in_flight.append(pool.apply_async(price_chunk, (payload,)))
+            if len(in_flight) >= workers * 2:
+                out.write(in_flight.popleft().get())
+        while in_flight:
+            out.write(in_flight.popleft().get())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CLI harga iwak (batch, streaming)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    price_parser = subparsers.add_parser("price", help="Hitung harga tangkapan, output JSONL ke stdout")
+    price_parser.add_argument("input", nargs="?", default="-", help="file input (default: stdin)")
+    price_parser.add_argument("--format", choices=["jsonl", "json", "csv", "text"], help="format input (default: tebak dari nama file, stdin = jsonl)")
+    price_parser.add_argument("--data", default=DEFAULT_DATA_FILE, help="path iwak_data.json")
+    price_parser.add_argument("--workers", type=int, default=1, help="jumlah proses worker")
+    price_parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    price_parser.add_argument("--fish", help="iwak default buat baris tanpa kolom fish")
+    price_parser.add_argument("--mutation", help="mutasi default buat baris tanpa kolom mutation")
+    price_parser.add_argument("--shiny", action="store_true", help="anggap semua baris shiny (kecuali diisi)")
+    price_parser.add_argument("--sparkling", action="store_true", help="anggap semua baris sparkling (kecuali diisi)")
+
+    import_parser = subparsers.add_parser("import", help="Upsert banyak iwak & mutasi sekaligus (satu kali simpan), laporan JSON ke stdout")
+    import_parser.add_argument("input", nargs="?", default="-", help="file input (default: stdin)")
+    import_parser.add_argument("--format", choices=["csv", "jsonl", "json"], help="format input (default: tebak dari nama file, stdin = jsonl)")
+    import_parser.add_argument("--data", default=DEFAULT_DATA_FILE, help="path iwak_data.json")
+    import_parser.add_argument("--dry-run", action="store_true", help="cuma validasi, nggak disimpan")
+    import_parser.add_argument("--all-or-nothing", action="store_true", help="batal semua kalau ada baris yang ditolak")
+
+    export_parser = subparsers.add_parser("export", help="Tulis seluruh katalog ke stdout")
+    export_parser.add_argument("--format", choices=EXPORT_FORMATS, default="jsonl")
+    export_parser.add_argument("--data", default=DEFAULT_DATA_FILE, help="path iwak_data.json")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "price":
+        fmt = args.format
+        if fmt is None:
+            fmt = "jsonl" if args.input == "-" else guess_format(args.input)
+        defaults = {"fish": args.fish, "mutation": args.mutation, "shiny": args.shiny, "sparkling": args.sparkling}
+        stream = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8-sig", newline="")
+        try:
+            price_stream(stream, sys.stdout, args.data, fmt, args.chunk_size, args.workers, defaults)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+    elif args.command == "import":
+        fmt = args.format
+        if fmt is None:
+            fmt = "jsonl" if args.input == "-" else guess_catalog_format(args.input)
+        stream = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8-sig", newline="")
+        try:
+            report = import_catalog(args.data, read_catalog_rows(stream, fmt), args.all_or_nothing, args.dry_run)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+        if report["rejected"]:
+            sys.exit(1)
+
+    elif args.command == "export":
+        export_catalog(args.data, sys.stdout, args.format)
+
+
+if __name__ == "__main__":
+    main()
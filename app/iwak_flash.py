@@ -0,0 +1,43 @@
+# --- Pesan Flash (Non-Blocking) ---
+# Pengganti pola "tampilkan pesan -> time.sleep(2) -> st.rerun()" di form CRUD.
+# Handler cukup push_flash(...) lalu langsung st.rerun(); pesannya disimpan
+# di session state, ditampilkan di run berikutnya, dan hilang sendiri
+# setelah FLASH_TTL_SECONDS. Thread script nggak pernah ketahan nunggu.
+import time
+
+FLASH_TTL_SECONDS = 4.0
+FLASH_STATE_KEY = "_flash_messages"
+
+
+def push_flash(session_state, slot, message, ttl=FLASH_TTL_SECONDS, now=None):
+    now = time.monotonic() if now is None else now
+    queue = session_state.setdefault(FLASH_STATE_KEY, [])
+    queue.append({"slot": slot, "type": message["type"], "content": message["content"], "expires_at": now + ttl})
+
+
+# Ambil pesan terbaru buat satu slot (None kalau nggak ada). Pesan yang
+# sudah kadaluarsa sekalian dibuang dari antrian.
+def peek_flash(session_state, slot, now=None):
+    now = time.monotonic() if now is None else now
+    queue = [m for m in session_state.get(FLASH_STATE_KEY, []) if m["expires_at"] > now]
+    session_state[FLASH_STATE_KEY] = queue
+    for message in reversed(queue):
+        if message["slot"] == slot:
+            return message
+    return None
+
+
+# Tampilkan pesan flash di placeholder (st.empty()).
+# html=True: gaya lama form ikan (<p> putih), selain itu st.success/warning/error.
+def show_flash(placeholder, session_state, slot, html=False):
+    message = peek_flash(session_state, slot)
+    if message is None:
+        return
+    if html:
+        placeholder.markdown(f"<p style='color: #FFFFFF;'>{message['content']}</p>", unsafe_allow_html=True)
+    elif message["type"] == "success":
+        placeholder.success(message["content"])
+    elif message["type"] == "warning":
+        placeholder.warning(message["content"])
+    else:
+        placeholder.error(message["content"])
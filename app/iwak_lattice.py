@@ -0,0 +1,216 @@
+# --- Tabel Pengali Iwak (Lattice) ---
+# Tiap kombinasi iwak x mutasi x shiny x sparkling cuma punya satu angka
+# pengali (semua faktor kecuali berat). Daripada ngalikan empat faktor +
+# lookup nama satu-satu tiap rerun / tiap request, pengalinya dihitung
+# sekali di sini:
+#     table[baris_iwak, kolom_mutasi, shiny, sparkling]
+# Kolom mutasi 0 = "Ga ada mutasi". Harga = table[...] x berat.
+#
+# Urutan perkaliannya sama persis kayak combined_leverage()
+# ((shiny x sparkling) x mutasi) x iwak, jadi hasilnya identik sampai bit
+# terakhir dengan price_catches().
+#
+# Kalau satu iwak/mutasi diedit, yang dihitung ulang cuma satu baris/kolom
+# (apply_changes), nggak perlu bangun ulang seluruh tabel. Katalog yang
+# kegedean (iwak x mutasi > MAX_TABLE_CELLS) nggak dibikin tabel penuhnya:
+# pengalinya dihitung dari dua faktor (mutasi+flag, iwak) pas lookup,
+# hasilnya tetap sama persis.
+import threading
+
+import numpy as np
+
+from iwak_pricing import LEVERAGE_SHINY_FIXED, LEVERAGE_SPARKLING_FIXED
+
+MAX_TABLE_CELLS = 4_000_000 # ~32 MB float64
+NO_MUTATION = 0
+
+# FLAG_FACTORS[shiny, sparkling] = faktor shiny x faktor sparkling
+FLAG_FACTORS = np.array([
+    [1.0 * 1.0, 1.0 * LEVERAGE_SPARKLING_FIXED],
+    [LEVERAGE_SHINY_FIXED * 1.0, LEVERAGE_SHINY_FIXED * LEVERAGE_SPARKLING_FIXED],
+])
+
+
+def _leverage_value(leverage):
+    # Sama kayak _leverage_array di iwak_pricing: None/NaN dianggap 1.0
+    if leverage is None:
+        return 1.0
+    leverage = float(leverage)
+    return 1.0 if leverage != leverage else leverage
+
+
+class _Axis:
+    # Satu sumbu tabel (iwak atau mutasi): nama casefold -> posisi, plus
+    # nilai leverage per posisi. Hapus pakai "swap-remove" (posisi terakhir
+    # dipindah ke lubangnya), jadi posisi lain nggak perlu digeser.
+    # Dibangun langsung dari kolom katalog (satu operasi NumPy, tanpa loop
+    # per record buat leverage-nya).
+    def __init__(self, section, reserved=0):
+        columns = section.columns()
+        self.names = [None] * reserved + list(columns["name"])
+        self.index = {name.casefold(): position for position, name in enumerate(self.names) if name is not None}
+        self.size = len(self.names)
+        self.values = np.ones(self.size, dtype=float)
+        # Sama kayak _leverage_array di iwak_pricing: None/NaN dianggap 1.0
+        leverages = columns["leverage"]
+        self.values[reserved:] = np.where(np.isnan(leverages), 1.0, leverages)
+
+    def find(self, name):
+        return self.index.get(name.casefold(), -1) if name else -1
+
+    def grow(self):
+        capacity = max(16, len(self.values) * 2)
+        values = np.empty(capacity, dtype=float)
+        values[:self.size] = self.values[:self.size]
+        self.values = values
+        return capacity
+
+
+class MultiplierLattice:
+    def __init__(self, catalog, max_cells=MAX_TABLE_CELLS):
+        self.catalog = catalog
+        self.max_cells = max_cells
+        # Naik tiap apply_changes, buat cache turunan (lihat iwak_solver)
+        self.revision = 0
+        # Pegang lock ini kalau posisi dari fish_row()/mutation_col() mau
+        # dipakai buat multipliers(): edit bisa mindahin posisi (swap-remove)
+        self.lock = threading.RLock()
+        self._build(catalog)
+
+    def _build(self, catalog):
+        self._fish = _Axis(catalog.fish)
+        self._mutations = _Axis(catalog.mutations, reserved=1) # Kolom 0 = tanpa mutasi
+        # _flag_mutation[kolom, shiny, sparkling] = (shiny x sparkling) x mutasi
+        self._flag_mutation = FLAG_FACTORS[None, :, :] * self._mutations.values[:, None, None]
+        self._table = None
+        if self._fish.size * self._mutations.size * 4 <= self.max_cells:
+            self._table = self._flag_mutation[None, :, :, :] * self._fish.values[:, None, None, None]
+
+    @property
+    def materialized(self):
+        return self._table is not None
+
+    # --- Update Inkremental (Satu Baris / Kolom) ---
+    def _set_fish(self, row, leverage):
+        self._fish.values[row] = leverage
+        if self._table is not None:
+            self._table[row, :self._mutations.size] = self._flag_mutation[:self._mutations.size] * leverage
+
+    def _set_mutation(self, col, leverage):
+        self._mutations.values[col] = leverage
+        self._flag_mutation[col] = FLAG_FACTORS * leverage
+        if self._table is not None:
+            self._table[:self._fish.size, col] = self._flag_mutation[col][None, :, :] * self._fish.values[:self._fish.size, None, None]
+
+    def _grow_table(self, fish_capacity, mutation_capacity):
+        if self._table is None:
+            return
+        if fish_capacity * mutation_capacity * 4 > self.max_cells:
+            self._table = None # Kegedean: lanjut mode dua faktor
+            return
+        table = np.empty((fish_capacity, mutation_capacity, 2, 2), dtype=float)
+        table[:self._fish.size, :self._mutations.size] = self._table[:self._fish.size, :self._mutations.size]
+        self._table = table
+
+    def _add(self, axis, name):
+        if axis.size == len(axis.values):
+            capacity = axis.grow()
+            if axis is self._mutations:
+                flag_mutation = np.empty((capacity, 2, 2), dtype=float)
+                flag_mutation[:axis.size] = self._flag_mutation[:axis.size]
+                self._flag_mutation = flag_mutation
+                self._grow_table(len(self._fish.values), capacity)
+            else:
+                self._grow_table(capacity, len(self._mutations.values))
+        position = axis.size
+        axis.index[name.casefold()] = position
+        if position < len(axis.names):
+            axis.names[position] = name
+        else:
+            axis.names.append(name)
+        axis.size += 1
+        return position
+
+    def _remove(self, axis, name):
+        position = axis.index.pop(name.casefold())
+        last = axis.size - 1
+        if position != last:
+            moved = axis.names[last]
+            axis.names[position] = moved
+            axis.index[moved.casefold()] = position
+            axis.values[position] = axis.values[last]
+            if axis is self._mutations:
+                self._flag_mutation[position] = self._flag_mutation[last]
+                if self._table is not None:
+                    self._table[:self._fish.size, position] = self._table[:self._fish.size, last]
+            elif self._table is not None:
+                self._table[position, :self._mutations.size] = self._table[last, :self._mutations.size]
+        axis.names[last] = None
+        axis.size -= 1
+
+    def apply_change(self, change):
+        is_fish = change['section'] == "fish_types"
+        axis = self._fish if is_fish else self._mutations
+        setter = self._set_fish if is_fish else self._set_mutation
+        if change['op'] == "add":
+            setter(self._add(axis, change['name']), _leverage_value(change['leverage']))
+        elif change['op'] == "update":
+            position = axis.index.pop(change['old_name'].casefold())
+            axis.index[change['name'].casefold()] = position
+            axis.names[position] = change['name']
+            setter(position, _leverage_value(change['leverage']))
+        elif change['op'] == "delete":
+            self._remove(axis, change['name'])
+
+    # Pindahin lattice ini ke snapshot katalog baru (hasil edit snapshot
+    # lama), cukup replay catalog.changes-nya
+    def apply_changes(self, changes, catalog):
+        with self.lock:
+            if any(change['op'] == "scale" for change in changes):
+                # Satu kolom penuh berubah: bangun ulang dari kolom katalog
+                # (tetap vectorized, dan leverage kosong tetap dianggap 1.0)
+                self._build(catalog)
+            else:
+                for change in changes:
+                    self.apply_change(change)
+            self.catalog = catalog
+            self.revision += 1
+        return self
+
+    # --- Lookup ---
+    def fish_row(self, name):
+        return self._fish.find(name)
+
+    def mutation_col(self, name):
+        return self._mutations.find(name) if name else NO_MUTATION
+
+    # Salinan dua faktor pembentuk tabel: (nama iwak, leverage iwak,
+    # nama mutasi [kolom 0 = None], pengali flag x mutasi [kolom, shiny, sparkling])
+    def factors(self):
+        with self.lock:
+            return (
+                self._fish.names[:self._fish.size],
+                self._fish.values[:self._fish.size].copy(),
+                self._mutations.names[:self._mutations.size],
+                self._flag_mutation[:self._mutations.size].copy(),
+            )
+
+    # rows/cols: posisi dari fish_row()/mutation_col() (harus >= 0)
+    def multipliers(self, rows, cols, is_shiny=False, is_sparkling=False):
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+        shiny = np.asarray(is_shiny, dtype=np.intp)
+        sparkling = np.asarray(is_sparkling, dtype=np.intp)
+        with self.lock:
+            if self._table is not None:
+                return self._table[rows, cols, shiny, sparkling]
+            return self._flag_mutation[cols, shiny, sparkling] * self._fish.values[rows]
+
+    # Pengali satu kombinasi nama (NaN kalau iwak/mutasinya nggak ada)
+    def multiplier(self, fish_name, mutation_name=None, is_shiny=False, is_sparkling=False):
+        with self.lock:
+            row = self.fish_row(fish_name)
+            col = self.mutation_col(mutation_name)
+            if row < 0 or col < 0:
+                return np.nan
+            return float(self.multipliers(row, col, is_shiny, is_sparkling))
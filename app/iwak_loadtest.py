@@ -0,0 +1,304 @@
+# --- Load Test Banyak Session (Streamlit AppTest) ---
+# Satu proses server Streamlit kuat nampung berapa user sebelum harus
+# scale out? Modul ini ngejalanin iwak_app.py headless pakai AppTest dan
+# nyimulasiin N user sekaligus, masing-masing dengan session sendiri:
+#   - hitung : pilih iwak & mutasi, isi berat, centang Shiny / Sparkling
+#   - target : buka Target Harga, isi target coin, pilih iwak & mutasi
+#   - lihat  : buka tab Nama Iwak, cari nama, pindah halaman
+#   - sesekali CRUD (update leverage / tambah / hapus iwak) lewat fungsi
+#     CRUD app-nya, jadi snapshot bersama ikut ganti di tengah jalan
+# Tiap langkah = satu rerun, di antaranya user "mikir" dulu (jeda acak,
+# rata-rata --think detik).
+#
+# Catatan penting: AppTest bikin Runtime palsu global per run, jadi dua
+# run nggak bisa jalan barengan di satu proses. Rerun-nya diantre (satu
+# lock); latency yang dilaporkan = antre + jalan, persis kayak request yang
+# nunggu CPU di server yang sibuk (Python juga kepentok GIL). Begitu
+# "utilization" (waktu jalan / waktu total) mendekati 1, antreannya
+# meledak: di situ batas user per proses.
+#
+# Output JSONL (kayak iwak_bench): satu baris ringkasan per jumlah user
+# (latency p50/p95/p99, throughput rerun/detik, peak RSS) plus satu baris
+# per jenis langkah.
+#
+#   python iwak_loadtest.py --users 1 10 25 50 --duration 30
+#   python iwak_loadtest.py --users 20 --size 10000 --think 0.5 --crud-rate 0.05
+#   python iwak_loadtest.py --users 10 --app iwak_app-v3.py --label v3
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+try:
+    import resource # Nggak ada di Windows
+except ImportError:
+    resource = None
+
+from streamlit.testing.v1 import AppTest
+
+import iwak_storage
+from iwak_bench import DEFAULT_APP, load_app_crud, make_catalog_data
+
+DEFAULT_USERS = (1, 5, 10, 25)
+DEFAULT_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "iwak_data.json")
+FLOWS = ("hitung", "target", "lihat")
+FLOW_WEIGHTS = (0.6, 0.3, 0.1)
+
+# Satu rerun AppTest dalam satu waktu (lihat catatan di atas)
+_run_lock = threading.Lock()
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: kilobyte, macOS: byte
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def percentiles(samples_ms):
+    if not samples_ms:
+        return {"count": 0}
+    samples = np.array(samples_ms)
+    return {
+        "count": len(samples_ms),
+        "p50_ms": round(float(np.percentile(samples, 50)), 2),
+        "p95_ms": round(float(np.percentile(samples, 95)), 2),
+        "p99_ms": round(float(np.percentile(samples, 99)), 2),
+        "max_ms": round(float(samples.max()), 2),
+    }
+
+
+# --- Siapin Script App + Data di Folder Sementara ---
+# DATA_FILE di script di-hardcode, jadi script-nya disalin dengan DATA_FILE
+# diarahkan ke salinan data (data asli nggak kesentuh CRUD load test).
+def prepare_app(app_path, workdir, size, seed):
+    data_file = os.path.join(workdir, "iwak_data.json")
+    if size:
+        iwak_storage.save_data(data_file, make_catalog_data(size, seed))
+    else:
+        shutil.copy(DEFAULT_DATA, data_file)
+    with open(app_path, "r", encoding="utf-8") as f:
+        source = f.read()
+    source = re.sub(r'^DATA_FILE = .*$', lambda _: f"DATA_FILE = {data_file!r}", source, count=1, flags=re.M)
+    script = os.path.join(workdir, os.path.basename(app_path))
+    with open(script, "w", encoding="utf-8") as f:
+        f.write(source)
+    # Modul iwak_* di-import dari folder app aslinya
+    app_dir = os.path.dirname(os.path.abspath(app_path))
+    if app_dir not in sys.path:
+        sys.path.insert(0, app_dir)
+    return script, data_file
+
+
+def _widget(finder, key):
+    try:
+        return finder(key=key)
+    except KeyError:
+        return None # Widget-nya nggak ada di halaman / versi app ini
+
+
+# --- Satu User Simulasi ---
+class SimulatedUser:
+    def __init__(self, number, script, crud, args, stats):
+        self.number = number
+        self.crud = crud
+        self.args = args
+        self.stats = stats
+        self.rng = random.Random(args.seed * 10_007 + number)
+        self.at = AppTest.from_file(script, default_timeout=args.timeout)
+        self.added = []
+
+    def _rerun(self, action, change=None):
+        queued = time.perf_counter()
+        with _run_lock:
+            started = time.perf_counter()
+            try:
+                if change is not None:
+                    change()
+                self.at.run()
+                error = bool(self.at.exception)
+            except Exception:
+                error = True
+            finished = time.perf_counter()
+        self.stats.record(action, (finished - queued) * 1000, (finished - started) * 1000, error)
+
+    def _page(self, name):
+        page = _widget(self.at.radio, "active_page")
+        if page is not None and page.value != name:
+            self._rerun("ganti_halaman", lambda: page.set_value(name))
+        return page is None or page.value == name
+
+    def _pick(self, search_key, select_key, action):
+        # Katalog gede: ketik sebagian nama dulu (typeahead), baru pilih
+        search = _widget(self.at.text_input, search_key)
+        if search is not None:
+            query = self.rng.choice(("Iwak", "Sintetis 0", "Mutasi", "a", "sh"))
+            self._rerun(f"{action}_cari", lambda: search.input(query))
+        select = _widget(self.at.selectbox, select_key)
+        if select is not None and len(select.options) > 1:
+            choice = self.rng.choice(select.options[1:])
+            self._rerun(action, lambda: select.set_value(choice))
+
+    def _toggle(self, key, action):
+        checkbox = _widget(self.at.checkbox, key)
+        if checkbox is not None:
+            self._rerun(action, lambda: checkbox.set_value(not checkbox.value))
+
+    def _number(self, key, value, action):
+        field = _widget(self.at.number_input, key)
+        if field is not None:
+            self._rerun(action, lambda: field.set_value(value))
+
+    def flow_hitung(self):
+        if not self._page("Hitung Iwak"):
+            return
+        self._pick("calculator_fish_search", "calculator_main_fish_select", "pilih_iwak")
+        if self.rng.random() < 0.5:
+            self._pick("calculator_mutation_search", "calculator_main_mutation_select", "pilih_mutasi")
+        self._number("berat_iwak_input_0", round(self.rng.uniform(0.5, 300), 1), "isi_berat")
+        if self.rng.random() < 0.3:
+            self._toggle("calculator_main_shiny_checkbox", "shiny")
+        if self.rng.random() < 0.3:
+            self._toggle("calculator_main_sparkling_checkbox", "sparkling")
+
+    def flow_target(self):
+        if not self._page("Target Harga"):
+            return
+        self._number("target_price_input", round(self.rng.uniform(0.5, 20), 1), "isi_target")
+        self._pick("target_price_fish_search", "target_price_fish_select", "target_pilih_iwak")
+        if self.rng.random() < 0.5:
+            self._pick("target_price_mutation_search", "target_price_mutation_select", "target_pilih_mutasi")
+
+    def flow_lihat(self):
+        if not self._page("Nama Iwak"):
+            return
+        query = _widget(self.at.text_input, "fish_table_query")
+        if query is not None:
+            self._rerun("tabel_cari", lambda: query.input(self.rng.choice(("", "iwak", "0", "sh"))))
+        self._number("fish_table_page", 2, "tabel_halaman")
+
+    # CRUD langsung lewat fungsi app (form CRUD-nya memang nggak ditampilkan)
+    def flow_crud(self):
+        catalog = iwak_storage.load_shared_catalog(self.crud["DATA_FILE"])
+        roll = self.rng.random()
+        start = time.perf_counter()
+        if self.added and roll < 0.3:
+            result = self.crud["delete_fish"](self.added.pop())
+            action = "crud_hapus"
+        elif roll < 0.6:
+            name = f"Loadtest {self.number} {self.rng.randrange(1_000_000)}"
+            result = self.crud["add_fish"](name, round(self.rng.uniform(0.1, 10), 2))
+            self.added.append(name)
+            action = "crud_tambah"
+        else:
+            name = self.rng.choice(catalog.fish.names())
+            result = self.crud["update_fish"](name, name, round(self.rng.uniform(0.1, 10), 2))
+            action = "crud_update"
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stats.record(action, elapsed, elapsed, result.get("type") == "error")
+
+    def think(self, deadline):
+        pause = self.rng.expovariate(1 / self.args.think) if self.args.think > 0 else 0
+        time.sleep(max(0.0, min(pause, deadline - time.monotonic())))
+
+    def run(self, deadline):
+        self._rerun("buka_app")
+        while time.monotonic() < deadline:
+            flow = self.rng.choices(FLOWS, FLOW_WEIGHTS)[0]
+            getattr(self, f"flow_{flow}")()
+            if self.args.crud_rate and self.rng.random() < self.args.crud_rate:
+                self.flow_crud()
+            self.think(deadline)
+
+
+# --- Kumpulan Hasil (Dipakai Bareng Semua Thread User) ---
+class LoadStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = {}   # langkah -> [ms] (antre + jalan)
+        self.service = []   # ms jalan doang (tanpa antre), semua rerun
+        self.errors = 0
+
+    def record(self, action, latency_ms, service_ms, error):
+        with self.lock:
+            self.latency.setdefault(action, []).append(latency_ms)
+            if not action.startswith("crud_"):
+                self.service.append(service_ms)
+            self.errors += int(error)
+
+
+def run_level(users, script, crud, args):
+    stats = LoadStats()
+    simulated = [SimulatedUser(number, script, crud, args, stats) for number in range(users)]
+    start = time.monotonic()
+    deadline = start + args.duration
+    threads = [threading.Thread(target=user.run, args=(deadline,), name=f"iwak-user-{user.number}") for user in simulated]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+
+    reruns = [ms for action, samples in stats.latency.items() if not action.startswith("crud_") for ms in samples]
+    results = [{
+        "benchmark": "loadtest", "users": users, "duration_s": round(elapsed, 2),
+        "think_s": args.think, "crud_rate": args.crud_rate,
+        "reruns": len(reruns), "throughput_rps": round(len(reruns) / elapsed, 2),
+        **{key: value for key, value in percentiles(reruns).items() if key != "count"},
+        "service_p50_ms": percentiles(stats.service).get("p50_ms"),
+        "service_p95_ms": percentiles(stats.service).get("p95_ms"),
+        # Porsi waktu proses sibuk ngejalanin rerun; ~1 = sudah jenuh
+        "utilization": round(sum(stats.service) / 1000 / elapsed, 3),
+        "crud_ops": sum(len(samples) for action, samples in stats.latency.items() if action.startswith("crud_")),
+        "errors": stats.errors,
+        "peak_rss_mb": peak_rss_mb(),
+    }]
+    for action in sorted(stats.latency):
+        results.append({"benchmark": "loadtest_action", "users": users, "action": action,
+                        **percentiles(stats.latency[action])})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test iwak_app.py pakai Streamlit AppTest (output JSONL)")
+    parser.add_argument("--users", type=int, nargs="+", default=list(DEFAULT_USERS), help="jumlah user simulasi (bisa beberapa, dijalankan berurutan)")
+    parser.add_argument("--duration", type=float, default=20.0, help="lama tiap level jumlah user (detik)")
+    parser.add_argument("--think", type=float, default=1.0, help="rata-rata jeda antar langkah per user (detik)")
+    parser.add_argument("--crud-rate", type=float, default=0.02, help="peluang CRUD setelah tiap alur")
+    parser.add_argument("--size", type=int, default=0, help="jumlah iwak & mutasi katalog sintetis (0 = pakai iwak_data.json)")
+    parser.add_argument("--app", default=DEFAULT_APP, help="script app yang di-load test")
+    parser.add_argument("--timeout", type=float, default=60.0, help="batas waktu satu rerun AppTest (detik)")
+    parser.add_argument("--label", default="", help="label bebas buat membedakan hasil (misal nama versi / commit)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="file JSONL output (default: stdout)")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="iwak_loadtest_")
+    out = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    try:
+        script, data_file = prepare_app(args.app, workdir, args.size, args.seed)
+        crud = load_app_crud(args.app, data_file)
+        for users in args.users:
+            for result in run_level(users, script, crud, args):
+                record = {"label": args.label, "size": args.size, **result,
+                          "python": sys.version.split()[0], "timestamp": time.time()}
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        iwak_storage.flush_storages()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# --- Optimasi Jual Iwak (Kuota Coin / Kapasitas Tas) ---
+# Dari daftar tangkapan yang sudah dihitung harganya (kayak tab "Hitung
+# Iwak"), pilih iwak mana yang dijual:
+#   - fewest_fish_for_quota     : nyampe kuota coin dengan iwak paling sedikit
+#   - least_weight_for_quota    : nyampe kuota coin dengan total berat paling kecil
+#   - best_value_for_capacity   : harga total maksimal yang muat di tas (kg)
+#   - best_value_for_slots      : harga total maksimal yang muat di N slot
+#
+# Yang pakai berat itu knapsack 0/1: DP di atas kapasitas berat yang
+# didiskretkan per WEIGHT_STEP kg (sama kayak step input berat di UI), satu
+# operasi NumPy per iwak. Biar tetap interaktif buat ribuan iwak, kalau
+# iwak x kapasitas > MAX_DP_CELLS step-nya dibikin lebih kasar. Berat
+# dibulatkan KE ATAS, jadi pilihan yang "muat" pasti beneran muat.
+#
+# Semua fungsi return dict rencana (lihat _plan), atau None kalau kuotanya
+# nggak mungkin kecapai.
+import numpy as np
+
+WEIGHT_STEP = 0.1
+MAX_DP_CELLS = 50_000_000
+
+
+def _plan(indices, weights, prices, weight_step=None):
+    indices = np.sort(np.asarray(indices, dtype=np.intp))
+    return {
+        "indices": indices.tolist(),
+        "count": len(indices),
+        "total_price": float(prices[indices].sum()),
+        "total_weight": float(weights[indices].sum()),
+        "weight_step": weight_step,
+    }
+
+
+def _as_arrays(weights, prices):
+    weights = np.asarray(weights, dtype=float)
+    prices = np.asarray(prices, dtype=float)
+    # Baris yang harganya 0 / nggak valid nggak ada gunanya dijual
+    usable = (prices > 0) & (weights > 0) & np.isfinite(prices) & np.isfinite(weights)
+    return weights, prices, usable
+
+
+# Step diskretisasi: WEIGHT_STEP, atau lebih kasar kalau tabel DP-nya kegedean
+def _weight_step(item_count, capacity):
+    step = WEIGHT_STEP
+    if item_count and capacity / step * item_count > MAX_DP_CELLS:
+        step = capacity * item_count / MAX_DP_CELLS
+    return step
+
+
+# --- Knapsack 0/1 (Vectorized per Iwak) ---
+# dp[c] = harga maksimal dengan total berat <= c unit. keep[i, c] = iwak ke-i
+# diambil waktu kapasitasnya c (buat nyusun ulang pilihannya).
+def _knapsack(units, prices, capacity):
+    dp = np.zeros(capacity + 1)
+    keep = np.zeros((len(units), capacity + 1), dtype=bool)
+    for i, (unit, price) in enumerate(zip(units.tolist(), prices.tolist())):
+        if unit > capacity:
+            continue
+        candidate = dp[:capacity + 1 - unit] + price
+        take = candidate > dp[unit:]
+        dp[unit:][take] = candidate[take]
+        keep[i, unit:] = take
+    return dp, keep
+
+def _pick(keep, units, capacity):
+    chosen = []
+    for i in range(len(units) - 1, -1, -1):
+        if keep[i, capacity]:
+            chosen.append(i)
+            capacity -= units[i]
+    return chosen
+
+def _units(weights, step):
+    # Dibulatkan ke atas (dengan toleransi float, biar 0.3 / 0.1 tetap 3)
+    return np.maximum(np.ceil(weights / step - 1e-9), 1).astype(np.intp)
+
+
+# --- Kuota Coin: Iwak Paling Sedikit ---
+# Cukup ambil yang harganya paling mahal duluan (greedy ini sudah optimal).
+def fewest_fish_for_quota(weights, prices, quota):
+    weights, prices, usable = _as_arrays(weights, prices)
+    candidates = np.flatnonzero(usable)
+    if prices[candidates].sum() < quota:
+        return None
+    order = candidates[np.argsort(-prices[candidates], kind="stable")]
+    needed = int(np.searchsorted(np.cumsum(prices[order]), quota)) + 1 if quota > 0 else 0
+    return _plan(order[:needed], weights, prices)
+
+
+# --- Kuota Coin: Total Berat Paling Kecil ---
+def least_weight_for_quota(weights, prices, quota):
+    weights, prices, usable = _as_arrays(weights, prices)
+    candidates = np.flatnonzero(usable)
+    if prices[candidates].sum() < quota:
+        return None
+    if quota <= 0:
+        return _plan([], weights, prices)
+
+    # Batas atas berat: greedy harga-per-kg sampai kuota kecapai. Jawaban
+    # optimalnya pasti nggak lebih berat dari ini, jadi DP cukup sampai sini.
+    by_ratio = candidates[np.argsort(-(prices[candidates] / weights[candidates]), kind="stable")]
+    greedy = by_ratio[:int(np.searchsorted(np.cumsum(prices[by_ratio]), quota)) + 1]
+    upper_bound = float(weights[greedy].sum())
+
+    # Iwak yang sendirian sudah lebih berat dari batas atas nggak mungkin kepilih
+    candidates = candidates[weights[candidates] <= upper_bound]
+    step = _weight_step(len(candidates), upper_bound)
+    units = _units(weights[candidates], step)
+    capacity = int(units[np.isin(candidates, greedy)].sum())
+
+    dp, keep = _knapsack(units, prices[candidates], capacity)
+    # dp[capacity] >= kuota (pilihan greedy muat), jadi pasti ada yang kecapai
+    chosen = candidates[_pick(keep, units, int(np.argmax(dp >= quota)))]
+    # Karena pembulatan step, pastikan nggak lebih jelek dari greedy
+    if weights[chosen].sum() > upper_bound:
+        chosen = greedy
+    return _plan(chosen, weights, prices, step)
+
+
+# --- Kapasitas Tas (kg): Harga Total Maksimal ---
+def best_value_for_capacity(weights, prices, capacity_kg):
+    weights, prices, usable = _as_arrays(weights, prices)
+    candidates = np.flatnonzero(usable & (weights <= capacity_kg))
+    if not len(candidates) or not capacity_kg > 0:
+        return _plan([], weights, prices)
+    if weights[candidates].sum() <= capacity_kg:
+        return _plan(candidates, weights, prices) # Semuanya muat
+
+    step = _weight_step(len(candidates), capacity_kg)
+    units = _units(weights[candidates], step)
+    capacity = int(np.floor(capacity_kg / step + 1e-9))
+    dp, keep = _knapsack(units, prices[candidates], capacity)
+    return _plan(candidates[_pick(keep, units, capacity)], weights, prices, step)
+
+
+# --- Kapasitas Slot: Harga Total Maksimal ---
+# Tiap iwak makan satu slot, jadi tinggal ambil N yang paling mahal.
+def best_value_for_slots(weights, prices, slots):
+    weights, prices, usable = _as_arrays(weights, prices)
+    candidates = np.flatnonzero(usable)
+    slots = max(int(slots), 0)
+    if slots < len(candidates):
+        candidates = candidates[np.argpartition(-prices[candidates], slots)[:slots]] if slots else candidates[:0]
+    return _plan(candidates, weights, prices)
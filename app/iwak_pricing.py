@@ -0,0 +1,56 @@
+# --- Mesin Harga Iwak (Tanpa Streamlit) ---
+# Rumus harganya sama persis kayak tab "Hitung Iwak":
+#     harga = shiny x sparkling x mutasi x leverage ikan x berat
+# Bedanya, semua fungsi di sini nerima array (atau angka biasa), jadi
+# puluhan ribu tangkapan bisa dihitung sekali jalan pakai NumPy.
+import numpy as np
+
+LEVERAGE_SHINY_FIXED = 1.85
+LEVERAGE_SPARKLING_FIXED = 1.85
+
+
+# --- Helper: ubah input jadi array float, None/NaN dianggap 1.0 ---
+def _leverage_array(values):
+    arr = np.asarray(values, dtype=float)
+    return np.where(np.isnan(arr), 1.0, arr)
+
+
+def _flag_leverage(flags, fixed_leverage):
+    return np.where(np.asarray(flags, dtype=bool), fixed_leverage, 1.0)
+
+
+# --- Total Leverage (Semua Faktor Kecuali Berat) ---
+def combined_leverage(fish_leverage=1.0, mutation_leverage=1.0, is_shiny=False, is_sparkling=False):
+    return (
+        _flag_leverage(is_shiny, LEVERAGE_SHINY_FIXED) *
+        _flag_leverage(is_sparkling, LEVERAGE_SPARKLING_FIXED) *
+        _leverage_array(mutation_leverage) *
+        _leverage_array(fish_leverage)
+    )
+
+
+# --- Harga Per Iwak (Vectorized) ---
+# Berat <= 0 atau kosong harganya 0, sama kayak baris yang belum diisi di UI.
+def price_catches(weights, fish_leverage=1.0, mutation_leverage=1.0, is_shiny=False, is_sparkling=False):
+    return price_with_multiplier(weights, combined_leverage(fish_leverage, mutation_leverage, is_shiny, is_sparkling))
+
+
+# --- Harga dari Pengali yang Sudah Jadi (Lihat iwak_lattice) ---
+def price_with_multiplier(weights, multiplier):
+    berat = np.asarray(weights, dtype=float)
+    berat = np.where(np.isnan(berat), 0.0, berat)
+    harga = np.asarray(multiplier, dtype=float) * berat
+    return np.where(berat > 0, harga, 0.0)
+
+
+# --- Berat Ideal Buat Harga Target (Kebalikan dari price_catches) ---
+# Kalau total leverage <= 0 hasilnya NaN, biar pemanggil bisa kasih warning.
+def ideal_weight(target_price, fish_leverage=1.0, mutation_leverage=1.0, is_shiny=False, is_sparkling=False):
+    return ideal_weight_with_multiplier(target_price, combined_leverage(fish_leverage, mutation_leverage, is_shiny, is_sparkling))
+
+
+def ideal_weight_with_multiplier(target_price, multiplier):
+    total_leverage = np.asarray(multiplier, dtype=float)
+    target = np.asarray(target_price, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(total_leverage > 0, target / total_leverage, np.nan)
@@ -0,0 +1,136 @@
+# --- Profiler Per Rerun (Opsional) ---
+# Streamlit ngejalanin ulang seluruh iwak_app.py tiap ada widget berubah.
+# Modul ini ngukur berapa lama tiap bagian (section) makan waktu per rerun,
+# nyimpen p50/p95 bergulir (ROLLING_WINDOW rerun terakhir) per session dan
+# per proses, dan bisa nge-dump tiap rerun ke file JSONL.
+#
+# Cara nyalain (default mati, overhead-nya cuma satu if per checkpoint):
+#   - env IWAK_PROFILE=1, atau buka app dengan ?debug=1 di URL
+#   - env IWAK_PROFILE_LOG=path/ke/profil.jsonl buat dump per rerun
+#
+# Pemakaian di script:
+#   profiler = start_rerun(st.session_state, enabled)
+#   ...kode...
+#   profiler.checkpoint("nama_bagian")   # waktu sejak checkpoint sebelumnya
+#   with profiler.section("nama"): ...   # atau ukur satu blok
+#   profiler.finish()
+#
+# Fragment (st.fragment) yang rerun sendirian nggak ngejalanin bagian atas
+# script, jadi profiler-nya masih yang lama (sudah finished). Di situ bikin
+# profiler baru pakai total_name sendiri, misal "fragment_total", biar
+# waktunya kecatat terpisah dari "total" rerun penuh.
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+ROLLING_WINDOW = 200
+PROFILE_ENABLED = os.environ.get("IWAK_PROFILE", "") not in ("", "0")
+PROFILE_LOG = os.environ.get("IWAK_PROFILE_LOG")
+SESSION_STATS_KEY = "_profiler_stats"
+SESSION_ID_KEY = "_profiler_session_id"
+
+
+# --- Statistik Bergulir (p50/p95 dari N sampel terakhir) ---
+class RollingStats:
+    def __init__(self, window=ROLLING_WINDOW):
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def add(self, durations):
+        with self._lock:
+            for name, seconds in durations.items():
+                self._samples[name].append(seconds)
+
+    # List dict {section, count, p50_ms, p95_ms, max_ms}, urut dari p95 terbesar
+    def summary(self):
+        with self._lock:
+            snapshot = {name: list(samples) for name, samples in self._samples.items()}
+        rows = []
+        for name, samples in snapshot.items():
+            ms = np.array(samples) * 1000
+            rows.append({
+                "section": name,
+                "count": len(samples),
+                "p50_ms": round(float(np.percentile(ms, 50)), 3),
+                "p95_ms": round(float(np.percentile(ms, 95)), 3),
+                "max_ms": round(float(ms.max()), 3),
+            })
+        rows.sort(key=lambda row: row["p95_ms"], reverse=True)
+        return rows
+
+
+# Statistik satu proses server (gabungan semua session)
+process_stats = RollingStats()
+_log_lock = threading.Lock()
+
+
+class RerunProfiler:
+    def __init__(self, session_state=None, enabled=True, log_path=PROFILE_LOG, total_name="total"):
+        self.enabled = enabled
+        self.log_path = log_path
+        self.total_name = total_name
+        self.finished = False
+        self.durations = {}
+        if not enabled:
+            return
+        self.session_stats = None
+        self.session_id = None
+        if session_state is not None:
+            self.session_stats = session_state.setdefault(SESSION_STATS_KEY, RollingStats())
+            self.session_id = session_state.setdefault(SESSION_ID_KEY, uuid.uuid4().hex[:12])
+        self._started = self._last = time.perf_counter()
+
+    def _record(self, name, seconds):
+        # Nama yang sama dipanggil berkali-kali dalam satu rerun -> dijumlah
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def checkpoint(self, name):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._record(name, now - self._last)
+        self._last = now
+
+    @contextmanager
+    def section(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self._record(name, now - start)
+            self._last = now
+
+    def finish(self):
+        self.finished = True
+        if not self.enabled:
+            return
+        self.durations[self.total_name] = time.perf_counter() - self._started
+        process_stats.add(self.durations)
+        if self.session_stats is not None:
+            self.session_stats.add(self.durations)
+        if self.log_path:
+            record = {
+                "ts": time.time(),
+                "session": self.session_id,
+                "pid": os.getpid(),
+                "sections_ms": {name: round(seconds * 1000, 3) for name, seconds in self.durations.items()},
+            }
+            with _log_lock, open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+
+def start_rerun(session_state=None, enabled=None, total_name="total"):
+    if enabled is None:
+        enabled = PROFILE_ENABLED
+    return RerunProfiler(session_state, enabled, total_name=total_name)
@@ -0,0 +1,205 @@
+# --- Cari Nama Iwak / Mutasi (Typeahead) ---
+# Katalog ribuan iwak bikin selectbox berat: semua nama dikirim ke browser
+# tiap rerun. Di sini pencariannya di server, yang dikirim cuma top-k hasil.
+#
+# Urutan hasil:
+#   1. nama yang DIAWALI query (urut A-Z, pakai binary search ke urutan A-Z
+#      katalog, lihat CatalogSection.prefixed_names)
+#   2. ada kata yang diawali query ("sin" -> "Iwak Sintetis")
+#   3. query ada di tengah nama
+#   4. mirip (salah ketik dikit): trigram yang sama >= MIN_SIMILARITY
+#
+# Index trigram-nya (trigram -> nama) ikut snapshot katalog kayak lattice:
+# edit lewat edit_shared_catalog cukup update nama yang berubah
+# (apply_changes), nggak dibangun ulang dari nol.
+import heapq
+import math
+import threading
+
+import numpy as np
+
+DEFAULT_LIMIT = 20
+MIN_SIMILARITY = 0.5
+BUILD_CHUNK = 16_384
+
+
+def _normalize(text):
+    return " ".join(text.split()).casefold()
+
+def _trigrams(key):
+    # Spasi di depan biar awal nama / awal kata juga punya trigram sendiri
+    padded = "  " + key + " "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+# Satu trigram jadi satu angka (tiga code point x 21 bit)
+def _gram_code(gram):
+    return (ord(gram[0]) << 42) | (ord(gram[1]) << 21) | ord(gram[2])
+
+
+# --- Posting List Trigram (Format CSR, Dibangun Pakai NumPy) ---
+# grams: kode trigram unik (urut), ids[offsets[i]:offsets[i+1]] = nomor
+# nama yang punya trigram grams[i]. Jauh lebih hemat dan cepat dibangun
+# daripada dict trigram -> set nama buat ratusan ribu nama.
+def _build_postings(keys):
+    all_grams = []
+    all_ids = []
+    for first in range(0, len(keys), BUILD_CHUNK):
+        chunk = keys[first:first + BUILD_CHUNK]
+        lengths = np.fromiter(map(len, chunk), dtype=np.intp, count=len(chunk))
+        width = int(lengths.max())
+        codes = np.array(chunk, dtype=f"<U{width}").view(np.uint32).reshape(len(chunk), width)
+        padded = np.full((len(chunk), width + 3), ord(" "), dtype=np.uint64)
+        padded[:, 2:width + 2] = codes
+        padded[np.arange(len(chunk)), lengths + 2] = ord(" ")
+        grams = (padded[:, :-2] << np.uint64(42)) | (padded[:, 1:-1] << np.uint64(21)) | padded[:, 2:]
+        # Trigram ke-i cuma valid kalau i <= panjang nama (sisanya padding)
+        valid = np.arange(width + 1) < (lengths + 1)[:, None]
+        all_grams.append(grams[valid])
+        all_ids.append(np.repeat(np.arange(first, first + len(chunk), dtype=np.int32), lengths + 1))
+    if not all_grams:
+        return np.empty(0, dtype=np.uint64), np.zeros(1, dtype=np.intp), np.empty(0, dtype=np.int32)
+    grams = np.concatenate(all_grams)
+    order = np.argsort(grams, kind="stable")
+    grams = grams[order]
+    unique, starts = np.unique(grams, return_index=True)
+    return unique, np.append(starts, len(grams)), np.concatenate(all_ids)[order]
+
+
+class NameSearch:
+    # Satu section katalog (iwak atau mutasi). Index-nya baru dibangun waktu
+    # pertama kali dicari (section kecil yang nggak pernah dicari gratis).
+    # Edit setelahnya masuk "overlay" kecil (nama tambahan + nama yang
+    # dihapus) di atas posting list dasarnya.
+    def __init__(self, section):
+        self.section = section
+        self._built = False
+
+    def _build(self):
+        names = self.section.names()
+        keys = [_normalize(name) for name in names]
+        self.names = dict(zip(keys, names)) # casefold -> nama asli
+        self._keys = np.array(keys, dtype=object)
+        self._grams, self._offsets, self._ids = _build_postings(keys)
+        self._added = {}        # kode trigram -> set key (nama yang ditambah setelah build)
+        self._added_keys = set()
+        self._removed = set()   # key dari posting dasar yang sudah dihapus
+        self._built = True
+
+    def _insert(self, name):
+        key = _normalize(name)
+        self.names[key] = name
+        if key in self._removed:
+            self._removed.discard(key) # Masih ada di posting dasar
+            return
+        self._added_keys.add(key)
+        for gram in _trigrams(key):
+            self._added.setdefault(_gram_code(gram), set()).add(key)
+
+    def _discard(self, name):
+        key = _normalize(name)
+        if self.names.pop(key, None) is None:
+            return
+        if key not in self._added_keys:
+            self._removed.add(key)
+            return
+        self._added_keys.discard(key)
+        for gram in _trigrams(key):
+            keys = self._added.get(_gram_code(gram))
+            if keys is not None:
+                keys.discard(key)
+
+    def apply_change(self, change):
+        if not self._built:
+            return # Nanti dibangun dari section terbaru
+        if change['op'] == "add":
+            self._insert(change['name'])
+        elif change['op'] == "update":
+            self._discard(change['old_name'])
+            self._insert(change['name'])
+        elif change['op'] == "delete":
+            self._discard(change['name'])
+        if len(self._added_keys) + len(self._removed) > max(1_000, len(self._keys) // 4):
+            self._built = False # Overlay-nya sudah gede: bangun ulang waktu dicari lagi
+
+    def _posting(self, gram):
+        code = _gram_code(gram)
+        i = int(np.searchsorted(self._grams, code))
+        base = self._ids[self._offsets[i]:self._offsets[i + 1]] if i < len(self._grams) and self._grams[i] == code else self._ids[:0]
+        return base, self._added.get(code, ())
+
+    def _posting_keys(self, posting):
+        base, added = posting
+        keys = set(self._keys[np.unique(base)].tolist())
+        keys.update(added)
+        return keys - self._removed
+
+    @staticmethod
+    def _rank(query, grams, candidates, fuzzy):
+        ranked = []
+        for key in candidates:
+            position = key.find(query)
+            if position >= 0:
+                rank = 1 if position == 0 or key[position - 1] == " " else 2
+                ranked.append((rank, 0.0, len(key), key))
+            elif fuzzy:
+                score = len(grams & _trigrams(key)) / len(grams)
+                if score >= MIN_SIMILARITY:
+                    ranked.append((3, -score, len(key), key))
+        return ranked
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        query = _normalize(query)
+        results = self.section.prefixed_names(query, limit)
+        if len(results) >= limit or len(query) < 2:
+            return results
+        if not self._built:
+            self._build()
+        seen = {_normalize(name) for name in results}
+        remaining = limit - len(results)
+        grams = _trigrams(query)
+
+        ranked = []
+        if len(query) >= 3:
+            # Nama yang memuat query pasti punya SEMUA trigram query, jadi
+            # cukup saring posting list trigram yang paling jarang
+            rarest = min((self._posting(query[i:i + 3]) for i in range(len(query) - 2)),
+                         key=lambda posting: len(posting[0]) + len(posting[1]))
+            ranked = self._rank(query, grams, self._posting_keys(rarest) - seen, fuzzy=False)
+        if len(ranked) < remaining:
+            # Yang persis ada belum cukup: tambah yang mirip (salah ketik).
+            # Kandidatnya nama yang punya minimal satu trigram dari yang
+            # paling jarang; yang nggak punya satu pun nggak mungkin lolos
+            # MIN_SIMILARITY, jadi posting list yang gede nggak perlu disapu.
+            needed = max(1, math.ceil(len(grams) * MIN_SIMILARITY))
+            postings = sorted((self._posting(gram) for gram in grams), key=lambda posting: len(posting[0]) + len(posting[1]))
+            candidates = set()
+            for posting in postings[:len(grams) - needed + 1]:
+                candidates |= self._posting_keys(posting)
+            ranked = self._rank(query, grams, candidates - seen, fuzzy=True)
+        return results + [self.names[key] for *_, key in heapq.nsmallest(remaining, ranked)]
+
+
+class CatalogSearch:
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.lock = threading.RLock()
+        self.fish = NameSearch(catalog.fish)
+        self.mutations = NameSearch(catalog.mutations)
+
+    # Pindahin index ini ke snapshot katalog baru, cukup replay catalog.changes-nya
+    def apply_changes(self, changes, catalog):
+        with self.lock:
+            for change in changes:
+                (self.fish if change['section'] == "fish_types" else self.mutations).apply_change(change)
+            self.fish.section = catalog.fish
+            self.mutations.section = catalog.mutations
+            self.catalog = catalog
+        return self
+
+    def search_fish(self, query, limit=DEFAULT_LIMIT):
+        with self.lock:
+            return self.fish.search(query, limit)
+
+    def search_mutations(self, query, limit=DEFAULT_LIMIT):
+        with self.lock:
+            return self.mutations.search(query, limit)
@@ -0,0 +1,135 @@
+# --- Cari Semua Kombinasi Buat Harga Target (Reverse Solver) ---
+# Tab "Target Harga" biasanya cuma jawab: kombinasi INI butuh berat berapa.
+# Di sini kebalikannya: dari harga target + rentang berat yang masuk akal,
+# cari SEMUA kombinasi iwak x mutasi x shiny x sparkling yang nyampe target,
+# urut dari berat paling ringan.
+#
+# Berat butuh = target / pengali, jadi rentang berat [min, max] sama aja
+# rentang pengali [target/max, target/min]. Pengali = (flag x mutasi) x iwak
+# (lihat iwak_lattice), jadi leverage iwak cukup diurutkan sekali
+# (ReverseIndex). Tiap grup (mutasi, shiny, sparkling) tinggal binary search
+# rentang iwak yang cocok: O(grup x log iwak) per query, tanpa enumerasi
+# iwak x mutasi.
+import threading
+import weakref
+
+import numpy as np
+
+from iwak_pricing import ideal_weight_with_multiplier
+
+DEFAULT_LIMIT = 200
+THRESHOLD_STEPS = 60
+
+
+class ReverseIndex:
+    def __init__(self, lattice):
+        with lattice.lock:
+            self.revision = lattice.revision
+            fish_names, fish_values, mutation_names, flag_mutation = lattice.factors()
+        order = np.argsort(fish_values, kind="stable")
+        self.fish_leverage = fish_values[order]
+        self.fish_names = np.array(fish_names, dtype=object)[order]
+        self.mutation_names = mutation_names
+        # Grup = (kolom mutasi, shiny, sparkling) diratakan: grup g ->
+        # kolom g // 4, shiny (g // 2) % 2, sparkling g % 2
+        self.group_factor = flag_mutation.reshape(-1)
+
+    # Rentang posisi iwak [start, end) buat grup-grup `groups` yang
+    # pengalinya di [lo, hi]
+    def _ranges(self, groups, lo, hi, margin=0):
+        factor = self.group_factor[groups]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            start = np.searchsorted(self.fish_leverage, lo / factor, side="left") - margin
+            end = np.searchsorted(self.fish_leverage, hi / factor, side="right") + margin
+        start = np.clip(start, 0, len(self.fish_leverage))
+        end = np.clip(end, 0, len(self.fish_leverage))
+        # Faktor <= 0 nggak mungkin nyampe target positif
+        end = np.where(factor > 0, np.maximum(end, start), start)
+        return start, end
+
+    # Batas bawah pengali (= batas atas berat) yang nyisain antara limit dan
+    # 2 x limit kombinasi teratas, dicari pakai binary search juga. Grup yang
+    # sudah kosong dibuang tiap langkah, jadi makin lama makin murah.
+    def _threshold(self, groups, end, lo, hi, limit):
+        high = hi if np.isfinite(hi) else float(self.group_factor[groups].max() * self.fish_leverage[-1])
+        low = lo
+        for _ in range(THRESHOLD_STEPS):
+            mid = float(np.sqrt(low * high))
+            if not low < mid < high:
+                break
+            with np.errstate(divide='ignore'):
+                start = np.searchsorted(self.fish_leverage, mid / self.group_factor[groups], side="left")
+            count = int(np.maximum(end - start, 0).sum())
+            if count < limit:
+                high = mid
+                continue
+            low = mid
+            alive = end > start
+            groups, end = groups[alive], end[alive]
+            if count <= 2 * limit:
+                break
+        return low
+
+    def solve(self, target_price, min_weight=0.0, max_weight=np.inf, limit=DEFAULT_LIMIT):
+        if not target_price > 0 or not max_weight > 0 or min_weight > max_weight or not len(self.fish_leverage):
+            return []
+        lo = target_price / max_weight
+        hi = target_price / min_weight if min_weight > 0 else np.inf
+
+        groups = np.flatnonzero(self.group_factor > 0)
+        start, end = self._ranges(groups, lo, hi)
+        alive = end > start
+        groups, end = groups[alive], end[alive]
+        threshold = lo
+        if limit and int((end - start[alive]).sum()) > limit:
+            threshold = self._threshold(groups, end, lo, hi, limit)
+        results = self._collect(groups, target_price, min_weight, max_weight, threshold, hi, limit)
+        if limit and threshold > lo and len(results) < limit:
+            # Hitungan pakai pembagian float bisa meleset tipis di batas
+            results = self._collect(np.arange(len(self.group_factor)), target_price, min_weight, max_weight, lo, hi, limit)
+        return results
+
+    def _collect(self, groups, target_price, min_weight, max_weight, lo, hi, limit):
+        # margin 1: pembagian float bisa meleset satu posisi di batas rentang,
+        # makanya kandidatnya dicek ulang pakai perkalian yang sama kayak lattice
+        start, end = self._ranges(groups, lo, hi, margin=1)
+        counts = end - start
+        owner = np.repeat(np.arange(len(counts)), counts)
+        offsets = np.cumsum(counts) - counts
+        positions = start[owner] + (np.arange(int(counts.sum())) - offsets[owner])
+        groups = groups[owner]
+
+        multipliers = self.group_factor[groups] * self.fish_leverage[positions]
+        weights = ideal_weight_with_multiplier(target_price, multipliers)
+        keep = np.flatnonzero((weights >= min_weight) & (weights <= max_weight))
+        keep = keep[np.argsort(weights[keep], kind="stable")]
+        if limit:
+            keep = keep[:limit]
+
+        return [
+            {
+                "fish": self.fish_names[positions[i]],
+                "mutation": self.mutation_names[groups[i] // 4],
+                "shiny": bool(groups[i] // 2 % 2),
+                "sparkling": bool(groups[i] % 2),
+                "multiplier": float(multipliers[i]),
+                "weight": float(weights[i]),
+            }
+            for i in keep.tolist()
+        ]
+
+
+# --- Cache Index per Lattice (Dibangun Ulang Kalau Katalog Berubah) ---
+_indexes = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+def reverse_index(lattice):
+    with _indexes_lock:
+        index = _indexes.get(lattice)
+        if index is None or index.revision != lattice.revision:
+            index = ReverseIndex(lattice)
+            _indexes[lattice] = index
+        return index
+
+def solve_target(lattice, target_price, min_weight=0.0, max_weight=np.inf, limit=DEFAULT_LIMIT):
+    return reverse_index(lattice).solve(target_price, min_weight, max_weight, limit)
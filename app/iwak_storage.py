@@ -0,0 +1,759 @@
+# --- Penyimpanan Katalog (iwak_data.json) ---
+# load_data/save_data pindahan dari iwak_app.py, plus cache katalog yang
+# dipakai bareng satu proses server. Dulu tiap session browser nge-parse
+# dan nyimpen salinan iwak_data.json sendiri-sendiri; sekarang cukup
+# sekali per proses, dan baru di-load ulang kalau signature storage-nya
+# berubah. Tiap simpan juga naikin counter "version" katalog, jadi cache
+# turunan (tabel, index, dll) cukup ngecek catalog.version buat tahu basi.
+#
+# Backend penyimpanan (env IWAK_STORAGE), semuanya punya method yang sama:
+#   "json"    -> JsonStorage: tiap edit nulis ulang seluruh iwak_data.json
+#                (default, kayak dulu)
+#   "journal" -> JournalStorage: tiap edit cuma nambah SATU baris di
+#                iwak_data.json.journal. Dipadatkan (compact) jadi snapshot
+#                di background tiap COMPACT_EVERY baris, di-replay waktu load.
+#   "sqlite"  -> SqliteStorage: iwak_data.sqlite3 (mode WAL), nama unik
+#                case-insensitive dijaga index database waktu nulis. Aman
+#                dipakai beberapa proses worker sekaligus.
+#
+# Edit dari beberapa proses sekaligus nggak saling nimpa: tiap commit
+# ngecek apakah storage-nya sudah diubah proses lain sejak di-load. Kalau
+# iya, edit kita di-replay di atas isi terbaru (merge per record, cek
+# revisi per record, lihat iwak_catalog); kalau record yang sama sudah
+# diubah duluan, commit-nya ditolak. JSON/journal dikunci pakai file
+# iwak_data.json.lock (flock, di Windows msvcrt.locking): commit & compact
+# kunci eksklusif, load kunci bareng (shared); SQLite pakai transaksinya
+# sendiri. Antar-thread satu proses dijaga _shared_lock.
+#
+# Opsional: write-behind (env IWAK_WRITE_BEHIND=detik, buat json/journal).
+# Edit langsung kepasang di snapshot memori, nulis ke disk-nya dikumpulin
+# di background dan di-flush sekali (lihat WriteBehindStorage). Cuma aktif
+# selama proses ini satu-satunya yang nulis file katalognya; begitu ada
+# proses lain yang ikut nulis, commit-nya balik langsung ke disk.
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from iwak_catalog import Catalog, RevisionConflict
+from iwak_lattice import MultiplierLattice
+from iwak_search import CatalogSearch
+
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError: # Selain Windows
+    msvcrt = None
+
+logger = logging.getLogger(__name__)
+
+STORAGE_MODE = os.environ.get("IWAK_STORAGE", "json")
+COMPACT_EVERY = 500
+# Jeda (detik) setelah edit terakhir sebelum di-flush; 0 = write-behind mati
+WRITE_BEHIND_DELAY = float(os.environ.get("IWAK_WRITE_BEHIND", "0") or 0)
+# Batas atas umur edit yang belum ketulis (walau edit-nya terus berdatangan)
+WRITE_BEHIND_MAX_DELAY = 5.0
+
+
+# --- Fungsi untuk Memuat dan Menyimpan Data ---
+def load_data(path):
+    if not os.path.exists(path):
+        return {
+            "fish_types": [],
+            "mutation_types": []
+        }
+    with open(path, "r") as f:
+        return json.load(f)
+
+def save_data(path, data):
+    # Buat direktori jika belum ada (untuk memastikan path-nya aman)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Tulis ke file sementara dulu, baru di-rename: kalau crash di tengah
+    # jalan, file lama tetap utuh (nggak ada file setengah jadi)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+# Kunci antar-proses buat satu file katalog. Eksklusif (default) dipegang
+# selama cek + tulis; shared=True buat baca: banyak pembaca boleh barengan,
+# cuma nunggu kalau ada yang lagi nulis. Baca nggak bikin folder apa pun:
+# kalau folder / file kuncinya nggak bisa dibuat, baca jalan tanpa kunci
+# (file katalognya juga pasti belum ada).
+@contextmanager
+def _file_lock(path, shared=False):
+    lock_path = path + ".lock"
+    if shared and not os.path.isdir(os.path.dirname(path) or "."):
+        yield
+        return
+    if not shared:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    try:
+        f = open(lock_path, "a+")
+    except OSError:
+        if not shared:
+            raise
+        yield # Folder read-only: nggak ada yang bisa nulis juga
+        return
+    with f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        elif msvcrt is not None:
+            # msvcrt cuma punya kunci eksklusif (baca juga eksklusif). Kunci
+            # byte pertama; LK_NBLCK langsung gagal kalau dipegang proses
+            # lain, jadi dicoba ulang sampai dapet.
+            while True:
+                try:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.01)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            yield
+
+# Replay edit kita (catalog.changes) di atas katalog terbaru dari storage.
+# Record yang beda tetap kegabung; kalau ada yang bentrok (revisi sudah
+# beda, nama sudah dipakai, record sudah dihapus) return None.
+def _rebase(fresh, changes):
+    try:
+        for change in changes:
+            if not fresh.apply_change(change):
+                return None
+    except (RevisionConflict, ValueError):
+        return None
+    return fresh
+
+def _stat_signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    # st_ino ikut: save_data selalu bikin file baru (tmp + rename), jadi dua
+    # tulisan dalam satu tick jam mtime dengan ukuran sama tetap ketahuan
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+# --- Backend: JSON (Tulis Ulang Seluruh File) ---
+# Interface tiap backend:
+#   signature()     -> nilai murah yang berubah kalau isi storage berubah
+#   load()          -> Catalog baru (belum di-freeze)
+#   commit(catalog) -> simpan catalog.changes; return katalog yang harus
+#                      dipasang jadi snapshot, atau None kalau ditolak
+class JsonStorage:
+    def __init__(self, path):
+        self.path = path
+        # Signature waktu terakhir load/commit: kalau pas commit sudah beda,
+        # berarti ada proses lain yang nulis duluan
+        self._base_signature = None
+        # File iwak_data.json.writers: tiap proses yang pernah commit pegang
+        # kunci shared di situ sampai keluar (lihat hold_writer_lock)
+        self._writers = None
+        self._writers_mode = None
+
+    def signature(self):
+        return _stat_signature(self.path)
+
+    def _read(self):
+        return Catalog(load_data(self.path))
+
+    def _write(self, catalog):
+        save_data(self.path, catalog.to_dict())
+
+    def load(self):
+        with _file_lock(self.path, shared=True):
+            self._base_signature = self.signature()
+            return self._read()
+
+    # --- Daftar Proses Penulis ---
+    # Proses yang commit langsung pegang kunci shared di .writers. Write-behind
+    # cuma boleh nunda tulisan kalau dapet kunci eksklusifnya (nggak ada
+    # proses penulis lain), dan memegangnya selama masih ada edit yang belum
+    # ketulis: proses lain yang mau commit nunggu sampai flush selesai, jadi
+    # commit-nya dibandingin (CAS) sama isi disk yang sudah ada edit kita.
+    def _open_writers(self):
+        if self._writers is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._writers = open(self.path + ".writers", "a+")
+        return self._writers
+
+    def hold_writer_lock(self):
+        if fcntl is None or self._writers_mode is not None:
+            return
+        fcntl.flock(self._open_writers(), fcntl.LOCK_SH)
+        self._writers_mode = "shared"
+
+    # True kalau dapet kunci eksklusif (proses ini satu-satunya penulis).
+    # Tanpa fcntl (Windows) nggak bisa tahu ada proses lain: anggap ada.
+    def try_exclusive_writer(self):
+        if self._writers_mode == "exclusive":
+            return True
+        if fcntl is None:
+            return False
+        try:
+            fcntl.flock(self._open_writers(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            # Ganti shared -> eksklusif itu lepas dulu baru kunci (man flock):
+            # kalau gagal, kunci shared-nya juga sudah lepas
+            self._writers_mode = None
+            return False
+        self._writers_mode = "exclusive"
+        return True
+
+    def share_writer_lock(self):
+        if self._writers_mode == "exclusive":
+            fcntl.flock(self._writers, fcntl.LOCK_SH)
+            self._writers_mode = "shared"
+
+    def commit(self, catalog):
+        self.hold_writer_lock()
+        with _file_lock(self.path):
+            rebased = self.signature() != self._base_signature
+            if rebased:
+                catalog = _rebase(self._read(), catalog.changes)
+                if catalog is None:
+                    return None
+            catalog.version += 1
+            self._write(catalog)
+            self._base_signature = self.signature()
+        if rebased:
+            # Basisnya bukan snapshot lama lagi: turunan (lattice) dibangun ulang
+            catalog.changes.clear()
+        return catalog
+
+
+# --- Backend: Journal (Append-Only Change Log) ---
+# Satu baris JSON per edit: {"version": n, "changes": [...]}. Satu edit =
+# satu baris, jadi kalau crash pas nulis, yang rusak cuma baris terakhir
+# (dan itu di-skip waktu replay).
+class JournalStorage(JsonStorage):
+    def __init__(self, path):
+        super().__init__(path)
+        self.journal_path = path + ".journal"
+        self.journal_length = 0
+        self._compacting = False
+
+    def signature(self):
+        return (_stat_signature(self.path), _stat_signature(self.journal_path))
+
+    def read_journal(self):
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    return # Baris terakhir kepotong (crash pas append), stop di sini
+                yield entry
+
+    def append_journal(self, entry):
+        with open(self.journal_path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_length += 1
+
+    def _read(self):
+        return self._apply_journal(super()._read())
+
+    # Replay entry journal di atas snapshot iwak_data.json yang sudah dibaca
+    def _apply_journal(self, catalog):
+        self.journal_length = 0
+        # Entry yang versinya <= snapshot sudah masuk ke snapshot (hasil compact)
+        for entry in self.read_journal():
+            self.journal_length += 1
+            if entry['version'] <= catalog.version:
+                continue
+            for change in entry['changes']:
+                catalog.apply_change(change)
+            catalog.version = entry['version']
+        catalog.changes.clear()
+        return catalog
+
+    def _write(self, catalog):
+        self.append_journal({"version": catalog.version, "changes": catalog.changes})
+        if self.journal_length >= COMPACT_EVERY and not self._compacting:
+            self._compacting = True
+            threading.Thread(target=self.compact, args=(catalog.copy(),), daemon=True).start()
+
+    # Padatkan journal: tulis snapshot (atomic), terus buang entry yang sudah
+    # masuk snapshot. Jalan di thread lain. Selama baca -> tulis ulang ->
+    # os.replace journal, nggak boleh ada yang append (bakal ketimpa journal
+    # baru): thread lain dijaga _shared_lock, proses lain dijaga kunci file.
+    # Urutannya sama kayak edit_shared_catalog (_shared_lock dulu, baru kunci
+    # file), jadi nggak bisa deadlock.
+    #
+    # `snapshot` cuma pemicu (versi waktu COMPACT_EVERY kelewat). Isinya
+    # dibangun ulang dari disk di dalam kunci: proses lain bisa saja sudah
+    # compact duluan ke versi yang lebih baru, dan snapshot lama kita bakal
+    # nimpa edit di antaranya (journal-nya sudah dibuang proses itu).
+    def compact(self, snapshot):
+        try:
+            with _shared_lock, _file_lock(self.path):
+                on_disk = Catalog(load_data(self.path))
+                if on_disk.version >= snapshot.version:
+                    return # Sudah dipadatkan (proses lain) sampai versi ini atau lebih
+                snapshot = self._apply_journal(on_disk)
+                before = self.signature()
+                save_data(self.path, snapshot.to_dict())
+                remaining = [entry for entry in self.read_journal() if entry['version'] > snapshot.version]
+                tmp_path = self.journal_path + ".tmp"
+                with open(tmp_path, "w") as f:
+                    for entry in remaining:
+                        f.write(json.dumps(entry) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.journal_path)
+                self.journal_length = len(remaining)
+                after = self.signature()
+                if self._base_signature == before:
+                    self._base_signature = after
+                # Isinya sama, cuma bentuk file-nya yang berubah: nggak usah parse ulang
+                cached = _shared_catalogs.get(self.path)
+                if cached is not None and cached[0] == before:
+                    _shared_catalogs[self.path] = (after, cached[1])
+        finally:
+            self._compacting = False
+
+
+# --- Backend: SQLite (WAL) ---
+# Nama iwak/mutasi pakai COLLATE NOCASE + UNIQUE: lookup & cek duplikat di
+# UI tetap lewat snapshot Catalog di memori (sama kayak backend lain), index
+# database-nya yang jadi penjaga terakhir waktu nulis (nama bentrok dari
+# proses lain = IntegrityError = commit ditolak). Counter versi disimpan di
+# tabel meta, jadi signature() cukup satu SELECT kecil per rerun.
+SQLITE_SECTIONS = ("fish_types", "mutation_types")
+
+class SqliteStorage:
+    def __init__(self, path, json_path=None):
+        self.path = path
+        self._local = threading.local()
+        self._init_schema(json_path)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: transaksi diatur manual pakai BEGIN IMMEDIATE
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self, json_path):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            for table in SQLITE_SECTIONS:
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    "name TEXT NOT NULL COLLATE NOCASE UNIQUE, "
+                    "leverage REAL NOT NULL, "
+                    "revision INTEGER NOT NULL DEFAULT 1)"
+                )
+                columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+                if "revision" not in columns: # Database lama (sebelum ada revisi per record)
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN revision INTEGER NOT NULL DEFAULT 1")
+            is_new = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone() is None
+            if is_new:
+                # Database baru: isi dari iwak_data.json kalau ada (migrasi sekali jalan)
+                data = load_data(json_path) if json_path else {}
+                for table in SQLITE_SECTIONS:
+                    conn.executemany(
+                        f"INSERT OR IGNORE INTO {table} (name, leverage, revision) VALUES (?, ?, ?)",
+                        [(r['name'], r['leverage'], r.get('revision') or 1) for r in data.get(table, [])]
+                    )
+                conn.execute("INSERT INTO meta (key, value) VALUES ('version', ?)", (data.get('version', 0),))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def signature(self):
+        return self._connect().execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+    def load(self):
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            data = {"version": conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]}
+            for table in SQLITE_SECTIONS:
+                data[table] = [
+                    {"name": name, "leverage": leverage, "revision": revision}
+                    for name, leverage, revision in conn.execute(f"SELECT name, leverage, revision FROM {table} ORDER BY rowid")
+                ]
+        finally:
+            conn.execute("COMMIT")
+        return Catalog(data)
+
+    def commit(self, catalog):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for change in catalog.changes:
+                table = change['section']
+                if change['op'] == "add":
+                    conn.execute(f"INSERT INTO {table} (name, leverage) VALUES (?, ?)", (change['name'], change['leverage']))
+                elif change['op'] == "update":
+                    # Compare-and-swap: cuma kena kalau revisinya masih sama kayak waktu diedit
+                    cursor = conn.execute(
+                        f"UPDATE {table} SET name = ?, leverage = ?, revision = revision + 1 "
+                        "WHERE name = ? AND (? IS NULL OR revision = ?)",
+                        (change['name'], change['leverage'], change['old_name'],
+                         change.get('base_revision'), change.get('base_revision'))
+                    )
+                    if cursor.rowcount == 0:
+                        raise LookupError(change['old_name'])
+                elif change['op'] == "delete":
+                    cursor = conn.execute(
+                        f"DELETE FROM {table} WHERE name = ? AND (? IS NULL OR revision = ?)",
+                        (change['name'], change.get('base_revision'), change.get('base_revision'))
+                    )
+                    if cursor.rowcount == 0 and change.get('base_revision') is not None:
+                        raise LookupError(change['name'])
+                elif change['op'] == "scale":
+                    conn.execute(f"UPDATE {table} SET leverage = leverage * ?, revision = revision + 1", (change['factor'],))
+            conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+            version = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+            conn.execute("COMMIT")
+        except (sqlite3.IntegrityError, LookupError):
+            # Bentrok sama proses lain (nama sudah dipakai / record sudah hilang)
+            conn.execute("ROLLBACK")
+            return None
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if version != catalog.version + 1:
+            # Ada proses lain yang commit duluan: ambil isi terbaru dari database
+            return self.load()
+        catalog.version = version
+        return catalog
+
+
+# --- Write-Behind (Flush di Background, Digabung) ---
+# Bungkus JsonStorage / JournalStorage. commit() cuma nyatet perubahannya
+# dan langsung return (snapshot baru langsung kepasang), thread background
+# yang nulis ke disk: nunggu `delay` detik sejak edit terakhir, tapi paling
+# lama `max_delay` detik sejak edit pertama yang belum ketulis. Semua edit
+# di antaranya jadi SATU kali tulis (json: satu file atomic tmp+rename,
+# journal: satu baris). Waktu proses keluar juga di-flush (atexit).
+#
+# Edit yang sudah dibilang sukses nggak boleh dibuang waktu flush, jadi
+# commit cuma ditunda kalau proses ini satu-satunya penulis (kunci
+# eksklusif .writers, lihat JsonStorage.try_exclusive_writer), dan kunci itu
+# dipegang sampai antreannya kosong lagi. Kalau ada proses lain yang ikut
+# nulis, commit() langsung ke disk (compare-and-swap biasa, bentrok = None,
+# UI-nya bilang gagal). Tanpa fcntl (Windows) selalu langsung ke disk.
+#
+# Kalau file-nya tetap berubah di bawah kita (misal diedit tangan), flush
+# nge-merge per record kayak commit biasa; yang bentrok dicatat di
+# storage.rejected dan di-log. SQLite nggak dibungkus karena commit-nya
+# sudah murah dan dipakai bareng banyak proses.
+class WriteBehindStorage:
+    # Signature selama masih ada edit yang belum ketulis: file di disk
+    # ketinggalan, jadi jangan sampai snapshot memori di-load ulang dari situ
+    PENDING = ("write-behind", "pending")
+
+    def __init__(self, inner, delay=None, max_delay=None):
+        self.inner = inner
+        self.path = inner.path
+        self.delay = WRITE_BEHIND_DELAY if delay is None else delay
+        self.max_delay = WRITE_BEHIND_MAX_DELAY if max_delay is None else max_delay
+        self.flush_count = 0
+        self.rejected = []      # Edit yang dibuang waktu flush (bentrok sama proses lain)
+        self._latest = None     # Katalog terakhir yang di-commit (jadi snapshot)
+        self._changes = []      # Gabungan catalog.changes sejak flush terakhir
+        self._first_edit = None
+        self._last_edit = None
+        self._flushing = False
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock() # Satu flush dalam satu waktu
+        self._wakeup = threading.Condition(self._lock)
+        threading.Thread(target=self._run, daemon=True).start()
+        atexit.register(self.flush)
+
+    @property
+    def pending(self):
+        return self._latest is not None
+
+    def signature(self):
+        with self._lock:
+            if self._latest is not None or self._flushing:
+                return self.PENDING
+        return self.inner.signature()
+
+    def load(self):
+        return self.inner.load()
+
+    def commit(self, catalog):
+        with self._lock:
+            if self.inner.try_exclusive_writer():
+                catalog.version += 1
+                now = time.monotonic()
+                if self._latest is None:
+                    self._first_edit = now
+                self._last_edit = now
+                self._latest = catalog
+                self._changes.extend(catalog.changes) # catalog.changes dikosongin habis ini
+                self._wakeup.notify()
+                return catalog
+        return self.inner.commit(catalog) # Ada penulis lain: langsung ke disk
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while self._latest is None:
+                    self._wakeup.wait()
+                now = time.monotonic()
+                due = min(self._last_edit + self.delay, self._first_edit + self.max_delay)
+                if now < due:
+                    self._wakeup.wait(due - now)
+                    continue
+            try:
+                self.flush()
+            except Exception:
+                # Disk penuh / nggak bisa ditulis: coba lagi nanti, edit-nya tetap di antrean
+                time.sleep(max(self.delay, 0.1))
+
+    # Tulis semua edit yang masih ngantre SEKARANG (blocking). Return True
+    # kalau ada yang ditulis. Dipanggil thread background, atexit, atau test.
+    def flush(self):
+        with self._flush_lock:
+            with _shared_lock:
+                with self._lock:
+                    latest, changes = self._latest, self._changes
+                    if latest is None:
+                        return False
+                    self._latest, self._changes = None, []
+                    self._flushing = True
+                # Salinan diambil di bawah _shared_lock: snapshot-nya pasti
+                # sudah selesai di-freeze (lihat edit_shared_catalog)
+                pending = latest.copy()
+            # Disk I/O di luar lock: edit baru tetap bisa masuk selama nulis
+            pending.changes[:] = changes
+            pending.version = latest.version - 1 # commit() backend-nya naikin lagi +1
+            try:
+                committed = self.inner.commit(pending)
+            except BaseException:
+                with self._lock:
+                    # Gagal: balikin ke antrean (edit yang lebih baru tetap di belakang)
+                    self._changes[:0] = changes
+                    if self._latest is None:
+                        self._latest = latest
+                        self._first_edit = self._last_edit = time.monotonic()
+                    self._flushing = False
+                raise
+            self.flush_count += 1
+            with _shared_lock:
+                if committed is not pending:
+                    # Ada proses lain yang nulis file-nya duluan
+                    self._install_merged(committed, changes)
+                    return True
+                with self._lock:
+                    self._flushing = False
+                    idle = self._latest is None
+                    self._release_if_idle()
+                cached = _shared_catalogs.get(self.path)
+                if idle and cached is not None and cached[1].version == latest.version:
+                    # Disk sekarang sama persis sama snapshot: nggak usah parse ulang
+                    _shared_catalogs[self.path] = (self.inner.signature(), cached[1])
+            return True
+
+    # Dipanggil di bawah self._lock: antrean kosong = proses lain boleh commit lagi
+    def _release_if_idle(self):
+        if self._latest is None and not self._flushing:
+            self.inner.share_writer_lock()
+
+    def _reject(self, rejected, reason):
+        if rejected:
+            self.rejected.extend(rejected)
+            for change in rejected:
+                logger.warning("write-behind %s: edit %s %s '%s' dibuang (%s)", self.path, change['section'],
+                               change['op'], change.get('old_name', change.get('name')), reason)
+
+    # Replay changes satu-satu di atas `catalog` (boleh yang beku, disalin
+    # dulu); yang bentrok dilewati. Return (katalog baru, edit yang bentrok).
+    @staticmethod
+    def _replay(catalog, changes):
+        merged = catalog.copy() if catalog.frozen else catalog
+        rejected = []
+        for change in changes:
+            try:
+                if not merged.apply_change(change):
+                    rejected.append(change)
+            except (RevisionConflict, ValueError):
+                rejected.append(change)
+        return merged, rejected
+
+    # inner.commit() nolak SEMUA edit kalau satu saja bentrok: ulang dari
+    # isi disk terbaru, cuma pakai edit yang nggak bentrok
+    def _commit_each(self, changes):
+        for _ in range(5):
+            fresh, rejected = self._replay(self.inner.load(), changes)
+            if not fresh.changes:
+                return fresh, rejected
+            committed = self.inner.commit(fresh)
+            if committed is not None:
+                return committed, rejected
+        return None, changes # Disk terus-terusan berubah: nyerah
+
+    # Dipanggil di bawah _shared_lock (nggak ada edit baru yang bisa masuk).
+    # Isi disk sekarang = edit proses lain + edit kita: jadikan snapshot
+    # baru, plus edit yang masuk antrean selama flush tadi.
+    def _install_merged(self, committed, changes):
+        rejected = []
+        if committed is None:
+            committed, rejected = self._commit_each(changes)
+        self._reject(rejected, "bentrok sama edit proses lain")
+        if committed is None:
+            _shared_catalogs.pop(self.path, None)
+            with self._lock:
+                self._flushing = False
+                self._release_if_idle()
+            return
+        committed.changes.clear()
+        with self._lock:
+            self._flushing = False
+            if self._latest is not None:
+                snapshot, rejected = self._replay(committed, self._changes)
+                self._changes = list(snapshot.changes)
+                snapshot.changes.clear()
+                if self._changes:
+                    snapshot.version = committed.version + 1 # Versi memori: satu di depan disk
+                    self._latest = snapshot
+                else:
+                    self._latest = None
+            else:
+                snapshot, rejected = committed, []
+            self._release_if_idle()
+        self._reject(rejected, "bentrok sama edit proses lain")
+        _shared_catalogs[self.path] = (self.signature(), snapshot.freeze())
+
+
+STORAGE_BACKENDS = {
+    "json": JsonStorage,
+    "journal": JournalStorage,
+    "sqlite": SqliteStorage,
+}
+
+# path iwak_data.json -> objek storage (satu per path per proses)
+_storages = {}
+
+def get_storage(path):
+    with _shared_lock:
+        storage = _storages.get(path)
+        if storage is None:
+            if STORAGE_MODE == "sqlite":
+                storage = SqliteStorage(os.path.splitext(path)[0] + ".sqlite3", json_path=path)
+            else:
+                storage = STORAGE_BACKENDS[STORAGE_MODE](path)
+                if WRITE_BEHIND_DELAY > 0:
+                    storage = WriteBehindStorage(storage)
+            _storages[path] = storage
+        return storage
+
+# Paksa tulis semua edit write-behind yang masih ngantre (buat test / sebelum
+# baca file katalognya langsung). Backend lain nggak ada yang ditunda.
+def flush_storages():
+    with _shared_lock:
+        storages = list(_storages.values())
+    for storage in storages:
+        if isinstance(storage, WriteBehindStorage):
+            storage.flush()
+
+
+# --- Cache Katalog Bersama (Satu per Proses) ---
+# path -> (signature storage, snapshot Catalog yang sudah di-freeze)
+_shared_catalogs = {}
+_shared_lock = threading.RLock()
+
+def load_shared_catalog(path):
+    storage = get_storage(path)
+    signature = storage.signature()
+    with _shared_lock:
+        cached = _shared_catalogs.get(path)
+        if cached is not None and cached[0] != signature:
+            # Bisa jadi ada commit/flush di antara baca signature & ambil lock
+            signature = storage.signature()
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        catalog = storage.load().freeze()
+        _shared_catalogs[path] = (signature, catalog)
+        return catalog
+
+# Edit katalog bersama: edit(catalog) dapet salinan yang bisa diubah, return
+# True kalau ada perubahan. Kalau berubah, disimpan lewat backend storage
+# dan langsung dipasang jadi snapshot baru (tanpa load ulang).
+def edit_shared_catalog(path, edit):
+    storage = get_storage(path)
+    with _shared_lock:
+        snapshot = load_shared_catalog(path)
+        catalog = snapshot.copy()
+        changed = edit(catalog)
+        if changed:
+            catalog = storage.commit(catalog)
+            if catalog is None:
+                return False
+            lattice = _shared_lattices.get(path)
+            if lattice is not None and lattice.catalog is snapshot and catalog.changes:
+                # Snapshot baru = snapshot lama + catalog.changes: tabel
+                # pengalinya cukup diupdate baris/kolom yang berubah
+                lattice.apply_changes(catalog.changes, catalog)
+            search = _shared_searches.get(path)
+            if search is not None and search.catalog is snapshot and catalog.changes:
+                search.apply_changes(catalog.changes, catalog) # Cuma nama yang berubah
+            catalog.changes.clear()
+            _shared_catalogs[path] = (storage.signature(), catalog.freeze())
+        return changed
+
+
+# --- Tabel Pengali Bersama (Ikut Snapshot Katalog) ---
+# path -> MultiplierLattice. Dibangun ulang penuh cuma kalau snapshot-nya
+# di-load ulang dari storage; edit lewat edit_shared_catalog cukup update
+# inkremental (lihat di atas).
+_shared_lattices = {}
+
+def load_shared_lattice(path):
+    catalog = load_shared_catalog(path)
+    with _shared_lock:
+        lattice = _shared_lattices.get(path)
+        if lattice is None or lattice.catalog is not catalog:
+            lattice = MultiplierLattice(catalog)
+            _shared_lattices[path] = lattice
+        return lattice
+
+
+# --- Index Pencarian Nama Bersama (Ikut Snapshot Katalog) ---
+# Sama kayak lattice: dibangun ulang penuh cuma kalau snapshot-nya di-load
+# ulang dari storage, edit biasa cukup update inkremental.
+_shared_searches = {}
+
+def load_shared_search(path):
+    catalog = load_shared_catalog(path)
+    with _shared_lock:
+        search = _shared_searches.get(path)
+        if search is None or search.catalog is not catalog:
+            search = CatalogSearch(catalog)
+            _shared_searches[path] = search
+        return search
@@ -0,0 +1,94 @@
+# --- Tabel Katalog Per Halaman (Tab Nama Iwak & Mutasi) ---
+# Dulu st.dataframe dikasih SELURUH katalog tiap rerun: 100k baris diubah
+# jadi tabel + dikirim ke browser tiap kali ada klik. Sekarang tabel Arrow
+# (kolom name, leverage) dibangun SEKALI per snapshot katalog (snapshot
+# baru = versi baru), dan yang dikirim ke browser cuma satu halaman.
+#
+# Cari nama, urutan, dan halaman semuanya dihitung di server:
+#   - urutan: array posisi baris, dihitung sekali per jenis urutan
+#   - cari: pyarrow.compute (vectorized), hasilnya di-cache per query
+#   - halaman: table.take(posisi baris di halaman itu), cuma page_size baris
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+PAGE_SIZES = (25, 50, 100, 250)
+SORTS = ("name_asc", "name_desc", "leverage_asc", "leverage_desc")
+MAX_CACHED_QUERIES = 16
+
+
+class CatalogTable:
+    def __init__(self, section):
+        columns = section.columns()
+        leverages = np.asarray(columns["leverage"], dtype=float)
+        # from_pandas=True: leverage NaN (kosong) jadi null di tabel
+        self.table = pa.table({
+            "name": pa.array(columns["name"], type=pa.string()),
+            "leverage": pa.array(leverages, from_pandas=True),
+        })
+        self._leverages = leverages
+        self._name_order = section.sorted_positions()
+        self._orders = {}
+        self._rows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def _order(self, sort):
+        order = self._orders.get(sort)
+        if order is None:
+            if sort == "name_asc":
+                order = self._name_order
+            elif sort == "name_desc":
+                order = self._name_order[::-1]
+            elif sort == "leverage_asc":
+                order = np.argsort(self._leverages, kind="stable")
+            elif sort == "leverage_desc":
+                order = np.argsort(-self._leverages, kind="stable") # NaN tetap paling bawah
+            else:
+                raise ValueError(f"unknown sort: {sort}")
+            self._orders[sort] = order
+        return order
+
+    # Posisi baris yang lolos filter, dalam urutan `sort` (di-cache per query)
+    def rows(self, query="", sort="name_asc"):
+        query = (query or "").strip()
+        with self._lock:
+            cached = self._rows.get((query, sort))
+            if cached is not None:
+                self._rows.move_to_end((query, sort))
+                return cached
+            order = self._order(sort)
+            if query:
+                mask = pc.match_substring(self.table["name"], query, ignore_case=True)
+                order = order[mask.to_numpy(zero_copy_only=False)[order]]
+            self._rows[(query, sort)] = order
+            if len(self._rows) > MAX_CACHED_QUERIES:
+                self._rows.popitem(last=False)
+            return order
+
+    # Satu halaman (page mulai dari 1): (tabel Arrow page_size baris, total baris lolos filter)
+    def page(self, query="", sort="name_asc", page=1, page_size=PAGE_SIZES[0]):
+        rows = self.rows(query, sort)
+        start = (max(page, 1) - 1) * page_size
+        return self.table.take(rows[start:start + page_size]), len(rows)
+
+
+# --- Cache Tabel per Snapshot Section ---
+# Snapshot katalog nggak pernah berubah (di-freeze), jadi tabelnya aman
+# dipakai bareng semua session; snapshot lama dibuang, tabelnya ikut hilang.
+_tables = weakref.WeakKeyDictionary()
+_tables_lock = threading.Lock()
+
+def catalog_table(section):
+    with _tables_lock:
+        table = _tables.get(section)
+        if table is None:
+            table = CatalogTable(section)
+            _tables[section] = table
+        return table
@@ -0,0 +1,82 @@
+# --- Test Katalog Per Kolom (iwak_catalog.py) ---
+# Isi section disimpan per kolom (nama, leverage, revisi) dengan slot yang
+# dikosongkan waktu hapus; yang dicek di sini: index nama, view record,
+# kolom leverage, revisi, dan freeze/copy tetap konsisten setelah edit.
+import os
+import sys
+
+import numpy as np
+import pytest
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+sys.path.insert(0, APP_DIR)
+
+from iwak_catalog import Catalog, RevisionConflict  # noqa: E402
+
+
+@pytest.fixture
+def catalog():
+    return Catalog({
+        "fish_types": [{"name": "Beluga", "leverage": 2.0}, {"name": "narwhal", "leverage": 3.0},
+                       {"name": "Orca", "leverage": None}],
+        "mutation_types": [{"name": "Astral", "leverage": 5.0}],
+    })
+
+
+def test_records_are_views_over_the_columns(catalog):
+    record = catalog.fish.get("BELUGA")
+    assert (record.name, record["leverage"], record.revision) == ("Beluga", 2.0, 1)
+    assert catalog.fish.get("Orca").leverage is None # NaN di kolom, None di record
+    assert catalog.fish.leverages.dtype == np.float64
+    assert not catalog.fish.leverages.flags.writeable
+    assert np.isnan(catalog.fish.leverages[2])
+    assert catalog.fish.sorted_names() == ["Beluga", "narwhal", "Orca"]
+
+def test_edits_keep_index_columns_and_order_in_sync(catalog):
+    fish = catalog.fish
+    assert fish.add("Hiu", 1.5)
+    assert not fish.add("hiu", 9.0) # Duplikat (case-insensitive)
+    assert fish.update("Beluga", "Beluga Putih", 4.0)
+    assert fish.delete("narwhal")
+    assert "narwhal" not in fish and "beluga putih" in fish
+    assert fish.sorted_names() == ["Beluga Putih", "Hiu", "Orca"]
+    assert [record.name for record in fish] == ["Orca", "Hiu", "Beluga Putih"] # Urutan insert
+    assert fish.get("Beluga Putih").revision == 2
+    positions = fish.positions(["Hiu", "Beluga Putih", "nggak ada"])
+    assert positions[-1] == -1
+    assert fish.leverages[positions[:2]].tolist() == [1.5, 4.0]
+    with pytest.raises(ValueError):
+        fish.update("Hiu", "ORCA", 1.0)
+
+    snapshot = catalog.freeze()
+    assert snapshot.fish.names() == ["Orca", "Hiu", "Beluga Putih"] # Slot kosong dibuang
+    assert snapshot.fish.columns()["leverage"][1:].tolist() == [1.5, 4.0]
+    with pytest.raises(TypeError):
+        snapshot.fish.add("Paus", 1.0)
+
+def test_revision_check_and_change_log(catalog):
+    fish = catalog.fish
+    with pytest.raises(RevisionConflict):
+        fish.update("Beluga", "Beluga", 9.0, expected_revision=2)
+    assert fish.update("Beluga", "Beluga", 9.0, expected_revision=1)
+    with pytest.raises(RevisionConflict):
+        fish.delete("Beluga", expected_revision=1)
+    assert catalog.changes == [{"section": "fish_types", "op": "update", "old_name": "Beluga", "name": "Beluga",
+                                "leverage": 9.0, "base_revision": 1}]
+
+    # Replay di katalog lain = hasil yang sama
+    replica = Catalog({"fish_types": [{"name": "Beluga", "leverage": 2.0}]})
+    for change in catalog.changes:
+        assert replica.apply_change(change)
+    assert replica.fish.get("Beluga").to_dict() == {"name": "Beluga", "leverage": 9.0, "revision": 2}
+
+def test_copy_of_snapshot_does_not_touch_the_snapshot(catalog):
+    snapshot = catalog.freeze()
+    copied = snapshot.copy()
+    copied.fish.update("Beluga", "Beluga", 7.0)
+    copied.fish.scale_leverages(2.0)
+    copied.mutations.delete("Astral")
+    assert snapshot.fish.get("Beluga").leverage == 2.0
+    assert "Astral" in snapshot.mutations
+    assert copied.fish.get("Beluga").leverage == 14.0
+    assert snapshot.to_dict()["fish_types"][0] == {"name": "Beluga", "leverage": 2.0, "revision": 1}
@@ -0,0 +1,125 @@
+# --- Test Pesan Flash di Form CRUD (iwak_app-v3.py) ---
+# Dulu tiap submit form nunggu time.sleep(2) sebelum st.rerun(). Sekarang
+# pesannya disimpan (push_flash), tampil di run berikutnya, dan hilang
+# sendiri setelah FLASH_TTL_SECONDS. Test ini mastiin submit + rerun nggak
+# lagi kena jeda 2 detik, dan pesannya muncul lalu kadaluarsa.
+import json
+import os
+import re
+import sys
+import time
+
+import pytest
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+sys.path.insert(0, APP_DIR)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from iwak_flash import FLASH_STATE_KEY, FLASH_TTL_SECONDS, peek_flash, push_flash  # noqa: E402
+
+# Jeda lama-nya 2 detik; submit + rerun harus jauh di bawah itu
+MAX_SUBMIT_SECONDS = 1.0
+
+
+@pytest.fixture
+def app(tmp_path):
+    data_file = tmp_path / "iwak_data.json"
+    data_file.write_text(json.dumps({
+        "fish_types": [{"name": "Beluga", "leverage": 2.0}, {"name": "Narwhal", "leverage": 3.0}],
+        "mutation_types": [{"name": "Astral", "leverage": 5.0}],
+    }))
+    with open(os.path.join(APP_DIR, "iwak_app-v3.py"), encoding="utf-8") as f:
+        source = f.read()
+    # DATA_FILE di script di-hardcode: arahkan ke salinan data di tmp_path
+    source = re.sub(r'^DATA_FILE = .*$', lambda _: f"DATA_FILE = {str(data_file)!r}", source, count=1, flags=re.M)
+    script = tmp_path / "iwak_app_v3.py"
+    script.write_text(source, encoding="utf-8")
+    at = AppTest.from_file(str(script), default_timeout=30)
+    at.run()
+    assert not at.exception
+    return at
+
+
+def _texts(at):
+    return [element.value for element in list(at.markdown) + list(at.success) + list(at.warning) + list(at.error)]
+
+def _flash_shown(at, content):
+    return any(content in text for text in _texts(at))
+
+def _submit(at, label):
+    button = next(button for button in at.button if button.label == label)
+    start = time.perf_counter()
+    button.click().run()
+    elapsed = time.perf_counter() - start
+    assert not at.exception
+    return elapsed
+
+def _unlabeled_input(elements, label):
+    return next(element for element in elements if element.label == label and element.key is None)
+
+
+# --- Submit Form Nggak Ketahan Jeda ---
+def test_add_fish_submit_is_fast_and_flashes_on_next_run(app):
+    _unlabeled_input(app.text_input, "Nama Ikan Baru").input("Orca")
+    assert _submit(app, "Tambah Ikan") < MAX_SUBMIT_SECONDS
+    assert _flash_shown(app, "Orca</span> berhasil ditambahkan")
+    assert any(record["name"] == "Orca" for record in app.session_state.data["fish_types"])
+
+
+def test_update_fish_submit_is_fast_and_flashes_on_next_run(app):
+    app.selectbox(key="update_fish_select").set_value("Narwhal")
+    app.run()
+    # Input nama pakai key, jadi isinya nggak ikut ganti waktu pilihan berubah
+    app.text_input(key="updated_fish_name_input").input("Narwhal Kecil")
+    app.number_input(key="updated_fish_leverage_input").set_value(4.5)
+    assert _submit(app, "Ubah Ikan") < MAX_SUBMIT_SECONDS
+    assert _flash_shown(app, "Narwhal Kecil</span> berhasil diupdate")
+
+
+def test_delete_fish_submit_is_fast_and_flashes_on_next_run(app):
+    app.selectbox(key="delete_fish_select").set_value("Beluga")
+    assert _submit(app, "Hapus") < MAX_SUBMIT_SECONDS
+    assert _flash_shown(app, "Beluga</span> berhasil dihapus")
+    assert all(record["name"] != "Beluga" for record in app.session_state.data["fish_types"])
+
+
+def test_mutation_forms_submit_fast(app):
+    _unlabeled_input(app.text_input, "Nama Mutasi Baru").input("Glossy")
+    assert _submit(app, "Tambah Mutasi") < MAX_SUBMIT_SECONDS
+    assert _flash_shown(app, "Jenis mutasi **Glossy** berhasil ditambahkan!")
+
+    app.selectbox(key="delete_mutation_select").set_value("Astral")
+    assert _submit(app, "Hapus Mutasi") < MAX_SUBMIT_SECONDS
+    assert _flash_shown(app, "Mutasi **Astral** berhasil dihapus!")
+
+
+# --- Pesan Kadaluarsa Setelah FLASH_TTL_SECONDS ---
+def test_flash_disappears_from_app_after_ttl(app):
+    _unlabeled_input(app.text_input, "Nama Ikan Baru").input("Orca")
+    _submit(app, "Tambah Ikan")
+    assert _flash_shown(app, "Orca</span> berhasil ditambahkan")
+
+    # Majukan "jam" pesannya: kadaluarsa = sudah lewat sekarang
+    for message in app.session_state[FLASH_STATE_KEY]:
+        message["expires_at"] = time.monotonic() - 1
+    app.run()
+    assert not _flash_shown(app, "Orca</span> berhasil ditambahkan")
+
+
+def test_peek_flash_expires_after_ttl():
+    state = {}
+    push_flash(state, "add_fish", {"type": "success", "content": "ok"}, now=100.0)
+    assert peek_flash(state, "add_fish", now=100.0)["content"] == "ok"
+    assert peek_flash(state, "add_fish", now=100.0 + FLASH_TTL_SECONDS - 0.01)["content"] == "ok"
+    assert peek_flash(state, "add_fish", now=100.0 + FLASH_TTL_SECONDS) is None
+    assert state[FLASH_STATE_KEY] == [] # Yang kadaluarsa dibuang dari antrian
+
+
+def test_peek_flash_returns_latest_message_per_slot():
+    state = {}
+    push_flash(state, "add_fish", {"type": "warning", "content": "lama"}, now=0.0)
+    push_flash(state, "add_fish", {"type": "success", "content": "baru"}, now=1.0)
+    push_flash(state, "delete_fish", {"type": "error", "content": "lain"}, now=1.0)
+    assert peek_flash(state, "add_fish", now=2.0)["content"] == "baru"
+    assert peek_flash(state, "update_fish", now=2.0) is None
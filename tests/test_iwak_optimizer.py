@@ -0,0 +1,81 @@
+# --- Test Optimasi Jual Iwak (iwak_optimizer.py) ---
+# Dibandingin sama brute force (semua kombinasi) di daftar kecil. Beratnya
+# kelipatan WEIGHT_STEP, jadi DP-nya nggak kena pembulatan.
+import itertools
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+sys.path.insert(0, APP_DIR)
+
+from iwak_optimizer import (  # noqa: E402
+    best_value_for_capacity, best_value_for_slots, fewest_fish_for_quota, least_weight_for_quota,
+)
+
+
+def _catch(seed, count=10):
+    rng = random.Random(seed)
+    weights = np.array([round(rng.uniform(0.1, 20), 1) for _ in range(count)])
+    prices = np.array([float(rng.randrange(1, 500)) for _ in range(count)])
+    return weights, prices
+
+def _subsets(count):
+    for size in range(count + 1):
+        yield from itertools.combinations(range(count), size)
+
+def _check_plan(plan, weights, prices):
+    indices = plan["indices"]
+    assert indices == sorted(set(indices))
+    assert plan["count"] == len(indices)
+    assert plan["total_price"] == pytest.approx(prices[indices].sum())
+    assert plan["total_weight"] == pytest.approx(weights[indices].sum())
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_quota_plans_match_brute_force(seed):
+    weights, prices = _catch(seed)
+    quota = prices.sum() * 0.6
+    reachable = [s for s in _subsets(len(prices)) if prices[list(s)].sum() >= quota]
+
+    fewest = fewest_fish_for_quota(weights, prices, quota)
+    _check_plan(fewest, weights, prices)
+    assert fewest["total_price"] >= quota
+    assert fewest["count"] == min(len(s) for s in reachable)
+
+    lightest = least_weight_for_quota(weights, prices, quota)
+    _check_plan(lightest, weights, prices)
+    assert lightest["total_price"] >= quota
+    assert lightest["total_weight"] == pytest.approx(min(weights[list(s)].sum() for s in reachable))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_capacity_and_slot_plans_match_brute_force(seed):
+    weights, prices = _catch(seed)
+    capacity = round(weights.sum() * 0.4, 1)
+
+    best = best_value_for_capacity(weights, prices, capacity)
+    _check_plan(best, weights, prices)
+    assert best["total_weight"] <= capacity + 1e-9
+    assert best["total_price"] == pytest.approx(
+        max(prices[list(s)].sum() for s in _subsets(len(prices)) if weights[list(s)].sum() <= capacity + 1e-9)
+    )
+
+    slots = best_value_for_slots(weights, prices, 3)
+    _check_plan(slots, weights, prices)
+    assert slots["total_price"] == pytest.approx(np.sort(prices)[-3:].sum())
+
+
+def test_unreachable_quota_and_unusable_rows():
+    weights = np.array([1.0, 2.0, np.nan, 3.0])
+    prices = np.array([10.0, 0.0, 50.0, np.inf])
+    # Cuma baris pertama yang bisa dijual (harga 0 / berat NaN / harga inf dibuang)
+    assert fewest_fish_for_quota(weights, prices, 11) is None
+    assert least_weight_for_quota(weights, prices, 11) is None
+    assert fewest_fish_for_quota(weights, prices, 10)["indices"] == [0]
+    assert best_value_for_capacity(weights, prices, 100)["indices"] == [0]
+    assert best_value_for_slots(weights, prices, 5)["indices"] == [0]
+    assert best_value_for_capacity(weights, prices, 0)["indices"] == []
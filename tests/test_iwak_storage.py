@@ -0,0 +1,150 @@
+# --- Test Backend Penyimpanan Katalog (iwak_storage.py) ---
+# Edit yang sudah dibilang sukses ke admin nggak boleh hilang: compaction
+# journal, compare-and-swap revisi, dan flush write-behind.
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+sys.path.insert(0, APP_DIR)
+
+import iwak_storage  # noqa: E402
+from iwak_catalog import RevisionConflict  # noqa: E402
+from iwak_storage import JournalStorage, JsonStorage, WriteBehindStorage, edit_shared_catalog  # noqa: E402
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "iwak_data.json"
+    path.write_text(json.dumps({"fish_types": [{"name": "Beluga", "leverage": 1.0}], "mutation_types": []}))
+    return str(path)
+
+@pytest.fixture(autouse=True)
+def no_background_compaction(monkeypatch):
+    # Compaction dipanggil manual di test, bukan dari thread background
+    monkeypatch.setattr(iwak_storage, "COMPACT_EVERY", 10**9)
+    yield
+    iwak_storage._storages.clear()
+    iwak_storage._shared_catalogs.clear()
+
+def _add_fish(storage, name, leverage=1.0):
+    catalog = storage.load()
+    catalog.fish.add(name, leverage)
+    return storage.commit(catalog)
+
+def _fish_names(storage):
+    return storage.load().fish.sorted_names()
+
+
+# --- Journal Compaction ---
+def test_concurrent_compaction_keeps_every_edit(data_file):
+    a, b = JournalStorage(data_file), JournalStorage(data_file)
+    snapshot_a = _add_fish(a, "A").copy()
+    _add_fish(b, "X")
+    snapshot_b = _add_fish(b, "Y").copy()
+    assert snapshot_b.version > snapshot_a.version
+
+    # Yang lebih baru selesai duluan, yang basi nyusul
+    b.compact(snapshot_b)
+    a.compact(snapshot_a)
+    assert _fish_names(JournalStorage(data_file)) == ["A", "Beluga", "X", "Y"]
+
+def test_compaction_rebuilds_from_disk_not_from_stale_snapshot(data_file):
+    a, b = JournalStorage(data_file), JournalStorage(data_file)
+    stale = _add_fish(a, "A").copy()
+    _add_fish(b, "X")
+    a.compact(stale)
+    assert _fish_names(JournalStorage(data_file)) == ["A", "Beluga", "X"]
+    with open(data_file) as f:
+        assert [record["name"] for record in json.load(f)["fish_types"]] == ["Beluga", "A", "X"]
+    assert list(a.read_journal()) == []
+
+
+# --- Revisi Per Record (Compare-and-Swap) ---
+def test_stale_revision_raises_revision_conflict(data_file):
+    revision = iwak_storage.load_shared_catalog(data_file).fish.get("Beluga").revision
+    assert edit_shared_catalog(data_file, lambda c: c.fish.update("Beluga", "Beluga", 2.0, revision))
+    with pytest.raises(RevisionConflict):
+        edit_shared_catalog(data_file, lambda c: c.fish.update("Beluga", "Beluga", 3.0, revision))
+    assert iwak_storage.load_shared_catalog(data_file).fish.get("Beluga").leverage == 2.0
+
+def test_commit_from_another_process_rebases_or_rejects(data_file):
+    a, b = JsonStorage(data_file), JsonStorage(data_file)
+    mine, theirs = a.load(), b.load()
+    mine.fish.update("Beluga", "Beluga", 2.0)
+    assert a.commit(mine) is not None
+    # Record lain tetap kegabung, record yang sama ditolak
+    theirs.fish.add("Orca", 4.0)
+    assert b.commit(theirs) is not None
+    theirs = b.load()
+    stale = JsonStorage(data_file).load()
+    theirs.fish.update("Beluga", "Beluga", 7.0, theirs.fish.get("Beluga").revision)
+    assert b.commit(theirs) is not None
+    stale.fish.update("Beluga", "Beluga", 9.0, stale.fish.get("Beluga").revision)
+    assert JsonStorage(data_file).commit(stale) is None
+    final = JsonStorage(data_file).load()
+    assert final.fish.sorted_names() == ["Beluga", "Orca"]
+    assert final.fish.get("Beluga").leverage == 7.0
+
+
+# --- Write-Behind ---
+def _write_behind(path):
+    return WriteBehindStorage(JsonStorage(path), delay=60, max_delay=60)
+
+def test_write_behind_coalesces_edits_when_it_is_the_only_writer(data_file):
+    storage = _write_behind(data_file)
+    catalog = storage.load()
+    for name in ("Orca", "Narwhal", "Hiu"):
+        catalog.fish.add(name, 1.0)
+        catalog = storage.commit(catalog)
+        catalog.changes.clear()
+    assert storage.pending
+    assert _fish_names(JsonStorage(data_file)) == ["Beluga"]
+    assert storage.flush()
+    assert storage.flush_count == 1
+    assert _fish_names(JsonStorage(data_file)) == ["Beluga", "Hiu", "Narwhal", "Orca"]
+
+def test_write_behind_never_drops_an_acknowledged_edit(data_file):
+    storage, other = _write_behind(data_file), JsonStorage(data_file)
+    mine = storage.load()
+    mine.fish.update("Beluga", "Beluga", 5.0)
+    assert storage.commit(mine) is mine # Sukses (belum ketulis)
+
+    # Proses lain ngedit record yang sama dari isi disk lama: harus nunggu
+    # flush kita, terus ditolak, bukan nimpa edit yang sudah sukses
+    theirs = other.load()
+    theirs.fish.update("Beluga", "Beluga", 9.0, theirs.fish.get("Beluga").revision)
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(committed=other.commit(theirs)))
+    worker.start()
+    worker.join(0.2)
+    assert worker.is_alive()
+    storage.flush()
+    worker.join(5)
+    assert result == {"committed": None}
+    assert storage.rejected == []
+    assert JsonStorage(data_file).load().fish.get("Beluga").leverage == 5.0
+
+def test_write_behind_commits_directly_when_another_process_writes(data_file):
+    storage, other = _write_behind(data_file), JsonStorage(data_file)
+    stale = storage.load()
+    theirs = other.load()
+    theirs.fish.add("Orca", 4.0)
+    assert other.commit(theirs) is not None
+
+    # Penulis lain ada: nggak ditunda, CAS langsung ke disk
+    stale.fish.add("Narwhal", 2.0)
+    assert storage.commit(stale) is not None
+    assert not storage.pending
+    assert _fish_names(JsonStorage(data_file)) == ["Beluga", "Narwhal", "Orca"]
+
+    stale = storage.load()
+    theirs = other.load()
+    theirs.fish.update("Beluga", "Beluga", 9.0, theirs.fish.get("Beluga").revision)
+    assert other.commit(theirs) is not None
+    stale.fish.update("Beluga", "Beluga", 5.0, stale.fish.get("Beluga").revision)
+    assert storage.commit(stale) is None # Ditolak langsung, bukan dibuang belakangan
+    assert JsonStorage(data_file).load().fish.get("Beluga").leverage == 9.0